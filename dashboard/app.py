@@ -21,7 +21,9 @@ from dashboard.components.performance_dashboard import PerformanceDashboard, Tra
 from dashboard.components.trade_monitor import TradeMonitor, AlertSystem
 from dashboard.components.api_integration_hub import APIIntegrationHub, get_api_integration_hub
 from trading_agent.utils.metrics import PerformanceMetrics, RiskManagement, PortfolioAnalytics
-from data_processing.connectors.market_data import get_data_connector
+from data_processing.connectors.single_flight import get_shared_connector
+from data_processing.connectors.quotes import get_quote_service
+from data_processing.connectors.dtypes import COMPACT_DTYPES
 from ai_integration.gemini_integration_manager import gemini_manager
 
 # Initialize the Dash app
@@ -55,6 +57,9 @@ app = dash.Dash(
 )
 server = app.server
 
+# On-disk market data cache shared by all callbacks and browser tabs
+MARKET_DATA_CACHE_DIR = os.environ.get("MARKET_DATA_CACHE_DIR", "./data/market_cache")
+
 # Register service worker for PWA support
 app.clientside_callback(
     """
@@ -543,7 +548,12 @@ def load_data(n_clicks, n_intervals, symbol, current_data):
     
     # Get market data
     try:
-        data_connector = get_data_connector(source="yahoo")
+        # Shared by every callback, so concurrent refreshes of a symbol share a fetch
+        data_connector = get_shared_connector(
+            source="yahoo",
+            cache_dir=MARKET_DATA_CACHE_DIR,
+            dtype_policy=COMPACT_DTYPES
+        )
         market_data = data_connector.get_historical_data(
             symbol=symbol,
             start_date=start_date,
@@ -555,9 +565,6 @@ def load_data(n_clicks, n_intervals, symbol, current_data):
         market_data["portfolio_value"] = 10000 * (1 + market_data["close"].pct_change().cumsum())
         market_data["portfolio_value"].fillna(10000, inplace=True)
         
-        # Add symbol column
-        market_data["symbol"] = symbol
-        
         # Generate sample trades
         trades = generate_sample_trades(market_data, symbol)
         
@@ -686,8 +693,8 @@ def update_risk_metrics(portfolio_data_json, trades_json):
         portfolio_data = pd.read_json(portfolio_data_json, orient="split")
         trades_df = pd.read_json(trades_json, orient="split")
         
-        # Create trade monitor
-        trade_monitor = TradeMonitor(portfolio_data)
+        # Create trade monitor with current prices from the shared quote snapshot
+        trade_monitor = TradeMonitor(portfolio_data, quote_service=get_quote_service())
         
         # Add active trades
         active_trades = trades_df[trades_df["status"] == "open"].to_dict("records")
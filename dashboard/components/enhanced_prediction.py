@@ -37,6 +37,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../'
 
 # Import project modules
 from data_processing.connectors.market_data import get_data_connector
+from data_processing.processors.columnar import FeatureMatrix
 from data_processing.processors.feature_engineering import FeatureEngineer
 from ai_integration.gemini_integration_manager import gemini_manager
 from dashboard.components.prediction import PredictionEngine
@@ -47,6 +48,14 @@ warnings.filterwarnings('ignore')
 class EnhancedPredictionEngine(PredictionEngine):
     """Enhanced engine for making highly accurate price and time predictions using advanced ML models."""
     
+    # Technical indicators added on top of the base prediction features
+    TECHNICAL_FEATURES = [
+        'rsi_14', 'macd', 'macd_signal', 'macd_hist',
+        'bb_upper', 'bb_middle', 'bb_lower',
+        'stoch_k', 'stoch_d', 'atr', 'cci',
+        'sma_5_20_cross', 'sma_20_50_cross'
+    ]
+    
     def __init__(self):
         """Initialize the enhanced prediction engine."""
         super().__init__()
@@ -83,8 +92,9 @@ class EnhancedPredictionEngine(PredictionEngine):
             'direction': None
         }
         
-        # Feature engineer for advanced feature creation
-        self.feature_engineer = FeatureEngineer(include_indicators=True)
+        # Feature engineer for advanced feature creation; only the indicators
+        # used as features (and their inputs) are computed
+        self.feature_engineer = FeatureEngineer(cache=self.feature_cache, features=self.TECHNICAL_FEATURES)
         
         # Scalers for different approaches
         self.scaler_types = {
@@ -102,6 +112,22 @@ class EnhancedPredictionEngine(PredictionEngine):
     def prepare_enhanced_features(self, df: pd.DataFrame, for_direction: bool = False) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """Prepare enhanced features for prediction models.
         
+        Args:
+            df: DataFrame with historical data
+            for_direction: Whether to prepare features for direction prediction
+            
+        Returns:
+            Tuple of (X, y) where X is features and y is target
+        """
+        return self.feature_cache.get_or_compute(
+            df, f"{type(self).__name__}.prepare_enhanced_features",
+            lambda: self._build_enhanced_features(df, for_direction),
+            for_direction=for_direction
+        )
+    
+    def _build_enhanced_features(self, df: pd.DataFrame, for_direction: bool = False) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Compute enhanced features and targets for prediction models.
+        
         Args:
             df: DataFrame with historical data
             for_direction: Whether to prepare features for direction prediction
@@ -112,55 +138,51 @@ class EnhancedPredictionEngine(PredictionEngine):
         # Create features using the base method first
         X, y = self.prepare_features(df, for_direction)
         
-        # Add more advanced features
-        df_feat = df.copy()
-        
         # Add technical indicators using FeatureEngineer
-        enhanced_df = self.feature_engineer.process(df_feat)
+        enhanced_df = self.feature_engineer.process(df)
+        technical = [col for col in self.TECHNICAL_FEATURES if col in enhanced_df.columns]
         
-        # Select relevant columns from enhanced dataframe
-        technical_columns = [
-            'rsi_14', 'macd', 'macd_signal', 'macd_hist',
-            'bb_upper', 'bb_middle', 'bb_lower',
-            'stoch_k', 'stoch_d', 'atr', 'cci',
-            'sma_5_20_cross', 'sma_20_50_cross'
-        ]
+        # Day of week and month are only used through their one-hot encodings
+        has_dates = 'date' in df.columns
+        calendar = ['day_of_month'] + [f'day_{day}' for day in range(5)] + [f'month_{month}' for month in range(1, 13)]
         
-        # Add available technical indicators to features
-        for col in technical_columns:
-            if col in enhanced_df.columns:
-                X[col] = enhanced_df[col]
+        # Every feature is written into one preallocated array aligned with X
+        matrix = FeatureMatrix(X.index, list(X.columns) + technical + ['bull_market', 'bear_market', 'high_volatility'] +
+                               (calendar if has_dates else []))
+        for col in X.columns:
+            matrix[col] = X[col]
+        for col in technical:
+            matrix[col] = enhanced_df[col]
         
         # Add market regime features
-        X['bull_market'] = (df_feat['close'] > df_feat['close'].shift(20)).astype(int)
-        X['bear_market'] = (df_feat['close'] < df_feat['close'].shift(20)).astype(int)
+        close = df['close']
+        matrix['bull_market'] = (close > close.shift(20)).astype(int)
+        matrix['bear_market'] = (close < close.shift(20)).astype(int)
         
         # Add volatility regime
-        vol = df_feat['close'].pct_change().rolling(20).std()
-        X['high_volatility'] = (vol > vol.rolling(100).mean()).astype(int)
+        vol = close.pct_change().rolling(20).std()
+        matrix['high_volatility'] = (vol > vol.rolling(100).mean()).astype(int)
         
         # Add day of week and month features for seasonality
-        if 'date' in df_feat.columns:
-            X['day_of_week'] = pd.to_datetime(df_feat['date']).dt.dayofweek
-            X['month'] = pd.to_datetime(df_feat['date']).dt.month
-            X['day_of_month'] = pd.to_datetime(df_feat['date']).dt.day
+        if has_dates:
+            dates = pd.to_datetime(df['date']).reindex(X.index)
+            matrix['day_of_month'] = dates.dt.day
             
             # One-hot encode day of week and month
+            day_of_week = dates.dt.dayofweek.to_numpy(dtype=np.float64, na_value=np.nan)
             for day in range(5):  # Trading days (0-4)
-                X[f'day_{day}'] = (X['day_of_week'] == day).astype(int)
+                matrix[f'day_{day}'] = day_of_week == day
             
+            month_of_year = dates.dt.month.to_numpy(dtype=np.float64, na_value=np.nan)
             for month in range(1, 13):
-                X[f'month_{month}'] = (X['month'] == month).astype(int)
-        
-        # Drop original day and month columns
-        X = X.drop(['day_of_week', 'month'], errors='ignore')
+                matrix[f'month_{month}'] = month_of_year == month
         
         # Remove any NaN values
-        X.fillna(method='ffill', inplace=True)
-        X.fillna(method='bfill', inplace=True)
-        X.fillna(0, inplace=True)
+        matrix.fill_forward()
+        matrix.fill_backward()
+        matrix.fill(0)
         
-        return X, y
+        return matrix.to_frame(), y
     
     def detect_anomalies(self, X: pd.DataFrame) -> pd.Series:
         """Detect anomalies in the feature data.
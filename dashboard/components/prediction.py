@@ -8,7 +8,6 @@ import plotly.express as px
 from plotly.subplots import make_subplots
 from typing import Dict, List, Tuple, Optional, Union, Any
 import datetime
-import yfinance as yf
 from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.preprocessing import StandardScaler, MinMaxScaler
 from sklearn.linear_model import LinearRegression, LogisticRegression
@@ -29,7 +28,10 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
 
 # Import project modules
-from data_processing.connectors.market_data import get_data_connector
+from data_processing.connectors.single_flight import get_shared_connector
+from data_processing.connectors.resampling import resample_ohlcv
+from data_processing.processors.feature_cache import get_feature_cache
+from data_processing.processors.windows import lag_frame
 
 
 class PredictionEngine:
@@ -37,7 +39,8 @@ class PredictionEngine:
     
     def __init__(self):
         """Initialize the prediction engine."""
-        self.data_connector = get_data_connector(source="yahoo")
+        self.data_connector = get_shared_connector(source="yahoo")
+        self.feature_cache = get_feature_cache()
         self.models = {
             'price': {
                 'Linear Regression': LinearRegression(),
@@ -96,34 +99,34 @@ class PredictionEngine:
         end_date = datetime.datetime.now().strftime("%Y-%m-%d")
         start_date = (datetime.datetime.now() - datetime.timedelta(days=days)).strftime("%Y-%m-%d")
         
-        # Map interval to yfinance interval
-        interval_map = {
-            "daily": "1d",
-            "weekly": "1wk"
-        }
-        yf_interval = interval_map.get(interval, "1d")
-        
-        # Get data
+        # Weekly bars are built locally from the daily download, so every
+        # interval of a ticker comes from the same request and agrees with it
         df = self.data_connector.get_historical_data(
             symbol=ticker,
             start_date=start_date,
             end_date=end_date,
-            interval=yf_interval
+            interval="1d"
         )
         
+        if interval == "weekly":
+            df = resample_ohlcv(df, "1wk")
+        
         return df
     
-    def get_intraday_data(self, ticker: str, data_range: str) -> pd.DataFrame:
-        """Get intraday data for time-based predictions.
+    def get_intraday_bars(self, ticker: str, data_range: str, interval: str = "1h") -> pd.DataFrame:
+        """Get intraday bars through the shared data connector.
+        
+        Hourly bars are downloaded once; coarser intervals ("1d", "1wk") are
+        resampled from them locally instead of being downloaded separately.
         
         Args:
             ticker: The ticker symbol
             data_range: The data range (e.g., "1 year", "2 years")
+            interval: Bar interval ("1h", "1d" or "1wk")
             
         Returns:
-            DataFrame with intraday data
+            DataFrame with a 'date' column and lowercase OHLCV columns
         """
-        # For intraday data, we'll use yfinance directly as our connector might not support it fully
         # Convert data range to days
         range_map = {
             "1 year": 365,
@@ -131,20 +134,41 @@ class PredictionEngine:
         }
         days = range_map.get(data_range, 365)
         
-        # Calculate start and end dates
-        end_date = datetime.datetime.now()
-        start_date = end_date - datetime.timedelta(days=days)
+        # Calculate start and end dates (the end date is exclusive, so end
+        # tomorrow to keep today's bars)
+        now = datetime.datetime.now()
+        end_date = (now + datetime.timedelta(days=1)).strftime("%Y-%m-%d")
+        start_date = (now - datetime.timedelta(days=days)).strftime("%Y-%m-%d")
         
-        # Get data - we'll use 1h interval for intraday analysis
-        ticker_obj = yf.Ticker(ticker)
-        df = ticker_obj.history(start=start_date, end=end_date, interval="1h")
+        df = self.data_connector.get_historical_data(
+            symbol=ticker,
+            start_date=start_date,
+            end_date=end_date,
+            interval="1h"
+        )
         
-        # Reset index and rename columns
-        df.reset_index(inplace=True)
+        # Rename columns
         df.columns = [col.lower() for col in df.columns]
         if 'datetime' in df.columns:
             df.rename(columns={'datetime': 'date'}, inplace=True)
         
+        if interval != "1h":
+            df = resample_ohlcv(df, interval, date_column='date')
+        
+        return df
+    
+    def get_intraday_data(self, ticker: str, data_range: str) -> pd.DataFrame:
+        """Get intraday data for time-based predictions.
+        
+        Args:
+            ticker: The ticker symbol
+            data_range: The data range (e.g., "1 year", "2 years")
+            
+        Returns:
+            DataFrame with intraday data
+        """
+        df = self.get_intraday_bars(ticker, data_range)
+        
         # Add hour column for time prediction
         df['hour'] = df['date'].dt.hour
         df['day_of_week'] = df['date'].dt.dayofweek
@@ -154,6 +178,25 @@ class PredictionEngine:
     def prepare_features(self, df: pd.DataFrame, for_direction: bool = False) -> Tuple[pd.DataFrame, pd.Series]:
         """Prepare features for prediction models.
         
+        Results are cached by the content of df, so repeated train, predict and
+        backtest runs on the same data reuse the features.
+        
+        Args:
+            df: DataFrame with historical data
+            for_direction: Whether to prepare features for direction prediction
+            
+        Returns:
+            Tuple of (X, y) where X is features and y is target
+        """
+        return self.feature_cache.get_or_compute(
+            df, f"{type(self).__name__}.prepare_features",
+            lambda: self._build_features(df, for_direction),
+            for_direction=for_direction
+        )
+    
+    def _build_features(self, df: pd.DataFrame, for_direction: bool = False) -> Tuple[pd.DataFrame, pd.Series]:
+        """Compute features and targets for prediction models.
+        
         Args:
             df: DataFrame with historical data
             for_direction: Whether to prepare features for direction prediction
@@ -252,11 +295,8 @@ class PredictionEngine:
             'low_hour': low_times['hour']
         })
         
-        # Create features for each day based on previous days
-        time_features = pd.DataFrame()
-        for i in range(1, 6):  # Use previous 5 days as features
-            time_features[f'high_hour_lag{i}'] = time_df['high_hour'].shift(i)
-            time_features[f'low_hour_lag{i}'] = time_df['low_hour'].shift(i)
+        # Create features for each day based on previous days (previous 5 days)
+        time_features = lag_frame(time_df, 5, columns=['high_hour', 'low_hour'])
         
         # Add day of week
         time_features['day_of_week'] = pd.to_datetime(time_df['date']).dt.dayofweek
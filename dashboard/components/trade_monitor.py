@@ -15,23 +15,53 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
 from trading_agent.utils.metrics import RiskManagement
+from data_processing.connectors.quotes import QuoteSnapshotService
 
 
 class TradeMonitor:
     """Real-time trade monitoring dashboard."""
     
-    def __init__(self, portfolio_data: Optional[pd.DataFrame] = None):
+    def __init__(self, portfolio_data: Optional[pd.DataFrame] = None, quote_service: Optional[QuoteSnapshotService] = None):
         """Initialize the trade monitor.
         
         Args:
             portfolio_data: DataFrame with portfolio data (optional)
+            quote_service: Service providing current prices (if None, prices are
+                taken from the last row of each symbol in the portfolio data)
         """
-        self.portfolio_data = portfolio_data or pd.DataFrame()
+        self.portfolio_data = portfolio_data if portfolio_data is not None else pd.DataFrame()
+        self.quote_service = quote_service
         self.active_trades = []
         self.trade_history = []
         self.alerts = []
         self.risk_manager = RiskManagement()
     
+    def get_latest_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """Get the current price for each symbol.
+        
+        Args:
+            symbols: List of ticker symbols
+            
+        Returns:
+            Dictionary mapping symbols to their current price
+        """
+        symbols = [symbol for symbol in dict.fromkeys(symbols) if symbol]
+        if not symbols:
+            return {}
+        
+        if self.quote_service is not None:
+            try:
+                return self.quote_service.get_prices(symbols)
+            except Exception as e:
+                print(f"Error fetching quotes: {e}")
+        
+        # Fall back to the last close of each symbol in the portfolio data
+        if not self.portfolio_data.empty and 'symbol' in self.portfolio_data.columns and 'close' in self.portfolio_data.columns:
+            latest = self.portfolio_data.groupby('symbol', observed=True)['close'].last()
+            return {symbol: latest[symbol] for symbol in symbols if symbol in latest.index}
+        
+        return {}
+    
     def update_portfolio_data(self, new_data: pd.DataFrame) -> None:
         """Update portfolio data.
         
@@ -164,13 +194,8 @@ class TradeMonitor:
         unrealized_pnl = 0
         unrealized_pnl_pct = 0
         
-        # Get latest prices (assuming they're in the portfolio data)
-        latest_prices = {}
-        if not self.portfolio_data.empty and 'symbol' in self.portfolio_data.columns and 'close' in self.portfolio_data.columns:
-            for symbol in self.portfolio_data['symbol'].unique():
-                symbol_data = self.portfolio_data[self.portfolio_data['symbol'] == symbol]
-                if not symbol_data.empty:
-                    latest_prices[symbol] = symbol_data.iloc[-1]['close']
+        # Get latest prices
+        latest_prices = self.get_latest_prices([trade.get('symbol', '') for trade in self.active_trades])
         
         # Calculate metrics for each trade
         for trade in self.active_trades:
@@ -263,13 +288,8 @@ class TradeMonitor:
         if not self.active_trades:
             return go.Figure()
         
-        # Get latest prices (assuming they're in the portfolio data)
-        latest_prices = {}
-        if not self.portfolio_data.empty and 'symbol' in self.portfolio_data.columns and 'close' in self.portfolio_data.columns:
-            for symbol in self.portfolio_data['symbol'].unique():
-                symbol_data = self.portfolio_data[self.portfolio_data['symbol'] == symbol]
-                if not symbol_data.empty:
-                    latest_prices[symbol] = symbol_data.iloc[-1]['close']
+        # Get latest prices
+        latest_prices = self.get_latest_prices([trade.get('symbol', '') for trade in self.active_trades])
         
         # Prepare data for plotting
         symbols = []
@@ -465,10 +485,12 @@ class TradeMonitor:
         exposure = {}
         total_exposure = 0
         
+        latest_prices = self.get_latest_prices([trade.get('symbol', '') for trade in self.active_trades])
+        
         for trade in self.active_trades:
             symbol = trade.get('symbol', 'Unknown')
             shares = trade.get('shares', 0)
-            price = trade.get('price', 0)
+            price = latest_prices.get(symbol, trade.get('price', 0))
             value = shares * price
             
             if symbol in exposure:
@@ -710,16 +732,13 @@ class AlertSystem:
     def check_trade_performance_alerts(self) -> None:
         """Check for trade performance alerts."""
         # Check active trades for significant losses
+        latest_prices = self.trade_monitor.get_latest_prices(
+            [trade.get('symbol', '') for trade in self.trade_monitor.active_trades]
+        )
         for trade in self.trade_monitor.active_trades:
             symbol = trade.get('symbol', '')
             entry_price = trade.get('price', 0)
-            current_price = 0
-            
-            # Get current price from portfolio data
-            if not self.trade_monitor.portfolio_data.empty and 'symbol' in self.trade_monitor.portfolio_data.columns and 'close' in self.trade_monitor.portfolio_data.columns:
-                symbol_data = self.trade_monitor.portfolio_data[self.trade_monitor.portfolio_data['symbol'] == symbol]
-                if not symbol_data.empty:
-                    current_price = symbol_data.iloc[-1]['close']
+            current_price = latest_prices.get(symbol, 0)
             
             if current_price > 0 and entry_price > 0:
                 # Calculate P&L percentage
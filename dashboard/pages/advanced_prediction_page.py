@@ -72,26 +72,8 @@ class AdvancedPredictionEngine(PredictionEngine):
         Returns:
             DataFrame with intraday data
         """
-        # Convert data range to days
-        range_map = {
-            "1 year": 365,
-            "2 years": 365 * 2
-        }
-        days = range_map.get(data_range, 365)
-        
-        # Calculate start and end dates
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
-        
-        # Get data - we'll use 1h interval for intraday analysis
-        ticker_obj = yf.Ticker(ticker)
-        df = ticker_obj.history(start=start_date, end=end_date, interval="1h")
-        
-        # Reset index and rename columns
-        df.reset_index(inplace=True)
-        df.columns = [col.lower() for col in df.columns]
-        if 'datetime' in df.columns:
-            df.rename(columns={'datetime': 'date'}, inplace=True)
+        # Hourly bars come from the shared (cached, coalesced) connector
+        df = self.get_intraday_bars(ticker, data_range)
         
         # Add hour column for time prediction
         df['hour'] = df['date'].dt.hour
@@ -0,0 +1,326 @@
+# Async Market Data Connector
+# This module provides asyncio-based connectors for non-blocking market data fetches
+
+import asyncio
+import os
+import pandas as pd
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, Hashable, List, Optional, Tuple, Union
+
+from data_processing.connectors.dtypes import DtypePolicy
+from data_processing.connectors.market_data import (
+    AlphaVantageConnector, MarketDataConnector, get_data_connector, to_panel
+)
+from data_processing.connectors.memory_cache import TTLCache
+from data_processing.connectors.rate_limiter import TokenBucket, get_rate_limiter
+
+# Connectors without a native async client share one bounded pool, so the
+# number of blocking calls in flight stays fixed however many requests are awaited
+_BLOCKING_EXECUTOR: Optional[ThreadPoolExecutor] = None
+
+
+def _get_blocking_executor() -> ThreadPoolExecutor:
+    """Get the shared executor for blocking data source calls."""
+    global _BLOCKING_EXECUTOR
+    if _BLOCKING_EXECUTOR is None:
+        _BLOCKING_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix='market-data')
+    return _BLOCKING_EXECUTOR
+
+
+async def _acquire_token(bucket: TokenBucket) -> None:
+    """Take a token from a rate limiter without blocking the event loop."""
+    while not bucket.try_acquire():
+        await asyncio.sleep(1.0 / bucket.rate)
+
+
+class AsyncMarketDataConnector:
+    """Base class for asyncio market data connectors.
+    
+    Mirrors MarketDataConnector with coroutine methods, so many symbols and
+    sources can be fetched concurrently from a single event loop.
+    """
+    
+    def __init__(self, dtype_policy: Optional[DtypePolicy] = None):
+        """Initialize the connector.
+        
+        Args:
+            dtype_policy: Dtypes applied to returned frames (if None, frames keep
+                the dtypes produced by the data source)
+        """
+        self.dtype_policy = dtype_policy
+    
+    def _apply_dtype_policy(self, df: pd.DataFrame, symbol: str) -> pd.DataFrame:
+        """Apply the connector's dtype policy to an output frame."""
+        if self.dtype_policy is None:
+            return df
+        return self.dtype_policy.apply(df, symbol=symbol)
+    
+    async def get_historical_data(self, symbol: str, start_date: str, end_date: str, interval: str) -> pd.DataFrame:
+        """Get historical market data for a symbol.
+        
+        Args:
+            symbol: The ticker symbol
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format
+            interval: Data interval (e.g., '1d', '1h')
+        
+        Returns:
+            DataFrame with historical data
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+    
+    async def get_historical_data_many(self,
+                                       symbols: List[str],
+                                       start_date: str,
+                                       end_date: str,
+                                       interval: Optional[str] = None,
+                                       max_concurrency: int = 8,
+                                       as_panel: bool = False) -> Tuple[Union[Dict[str, pd.DataFrame], pd.DataFrame], Dict[str, Exception]]:
+        """Get historical market data for many symbols concurrently.
+        
+        At most max_concurrency requests are awaited at any time. A failure for
+        one symbol does not affect the others.
+        
+        Args:
+            symbols: List of ticker symbols
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format
+            interval: Data interval (if None, uses the connector's default interval)
+            max_concurrency: Maximum number of concurrent requests
+            as_panel: Whether to return a single long DataFrame with a symbol column
+                instead of a dictionary of DataFrames
+        
+        Returns:
+            Tuple of (results, errors) where results maps each successful symbol to its
+            DataFrame (or is a single panel DataFrame if as_panel is True) and errors maps
+            each failed symbol to the exception it raised
+        """
+        requests = {symbol: (self, symbol, start_date, end_date, interval) for symbol in symbols}
+        results, errors = await gather_historical_data(requests, max_concurrency=max_concurrency)
+        
+        if as_panel:
+            return to_panel(results), errors
+        
+        return results, errors
+    
+    async def close(self) -> None:
+        """Release any network sessions held by the connector."""
+    
+    async def __aenter__(self) -> 'AsyncMarketDataConnector':
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+
+class ExecutorAsyncConnector(AsyncMarketDataConnector):
+    """Async adapter for a blocking MarketDataConnector.
+    
+    Used for sources without an async client (Yahoo Finance, local files).
+    Calls run on a shared bounded executor, so awaiting many requests never
+    creates a thread per request and the event loop stays responsive.
+    """
+    
+    def __init__(self, connector: MarketDataConnector, executor: Optional[Executor] = None):
+        """Initialize the adapter.
+        
+        Args:
+            connector: Blocking connector to wrap
+            executor: Executor to run calls on (if None, uses the shared pool)
+        """
+        super().__init__(dtype_policy=connector.dtype_policy)
+        self.connector = connector
+        self.executor = executor
+    
+    async def get_historical_data(self, symbol: str, start_date: str, end_date: str, interval: Optional[str] = None) -> pd.DataFrame:
+        """Get historical market data from the wrapped connector.
+        
+        Args:
+            symbol: The ticker symbol
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format
+            interval: Data interval (if None, uses the wrapped connector's default)
+        
+        Returns:
+            DataFrame with historical data
+        """
+        args = (symbol, start_date, end_date) if interval is None else (symbol, start_date, end_date, interval)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor or _get_blocking_executor(),
+                                          self.connector.get_historical_data, *args)
+    
+    async def get_latest_quotes(self, symbols: List[str]) -> pd.DataFrame:
+        """Get the latest available bar for many symbols.
+        
+        Args:
+            symbols: List of ticker symbols
+        
+        Returns:
+            DataFrame indexed by symbol with date, open, high, low, close and volume columns
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor or _get_blocking_executor(),
+                                          self.connector.get_latest_quotes, symbols)
+
+
+class AsyncAlphaVantageConnector(AsyncMarketDataConnector):
+    """Native async connector for Alpha Vantage data.
+    
+    Uses the aiohttp client shipped with the alpha_vantage package. Full series
+    are kept in the same in-memory cache and drawn from the same per-key rate
+    limiter as AlphaVantageConnector, and concurrent requests for a series that
+    is already being downloaded await that download instead of repeating it.
+    """
+    
+    def __init__(self,
+                 api_key: Optional[str] = None,
+                 calls_per_minute: int = AlphaVantageConnector.DEFAULT_CALLS_PER_MINUTE,
+                 series_cache: Optional[TTLCache] = None,
+                 dtype_policy: Optional[DtypePolicy] = None):
+        """Initialize the async Alpha Vantage connector.
+        
+        Args:
+            api_key: Alpha Vantage API key (if None, will look for ALPHA_VANTAGE_API_KEY env var)
+            calls_per_minute: Maximum number of API calls per minute for this key
+            series_cache: Cache for full series (if None, uses the cache shared with AlphaVantageConnector)
+            dtype_policy: Dtypes applied to returned frames (if None, keeps the source dtypes)
+        """
+        super().__init__(dtype_policy=dtype_policy)
+        self.api_key = api_key or os.environ.get('ALPHA_VANTAGE_API_KEY')
+        if not self.api_key:
+            raise ValueError("Alpha Vantage API key is required. Set it as an argument or as ALPHA_VANTAGE_API_KEY environment variable.")
+        
+        self.rate_limiter = get_rate_limiter('alpha_vantage', self.api_key,
+                                             rate=calls_per_minute / 60.0, capacity=calls_per_minute)
+        self.series_cache = series_cache if series_cache is not None else AlphaVantageConnector._series_cache
+        self._ts = None
+        self._downloads: Dict[Tuple[str, str], asyncio.Task] = {}
+    
+    def _get_client(self):
+        """Create the aiohttp-backed TimeSeries client on first use."""
+        if self._ts is None:
+            # Imported here so that aiohttp is only needed when the async client is used
+            from alpha_vantage.async_support.timeseries import TimeSeries
+            self._ts = TimeSeries(key=self.api_key, output_format='pandas')
+        return self._ts
+    
+    async def get_historical_data(self, symbol: str, start_date: str, end_date: str, interval: str = 'daily') -> pd.DataFrame:
+        """Get historical market data from Alpha Vantage.
+        
+        Args:
+            symbol: The ticker symbol
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format
+            interval: Data interval ('daily', 'weekly', 'monthly', 'intraday')
+        
+        Returns:
+            DataFrame with historical data
+        """
+        key = (symbol.upper(), interval)
+        data = self.series_cache.get(key)
+        if data is None:
+            task = self._downloads.get(key)
+            if task is None:
+                task = asyncio.ensure_future(self._download_series(symbol, interval))
+                self._downloads[key] = task
+                task.add_done_callback(lambda _: self._downloads.pop(key, None))
+            data = await asyncio.shield(task)
+            self.series_cache.set(key, data)
+        
+        # Filter by date range
+        data = data.loc[start_date:end_date]
+        
+        # Reset index to make date a column
+        data = data.reset_index()
+        data.rename(columns={'index': 'date'}, inplace=True)
+        
+        return self._apply_dtype_policy(data, symbol)
+    
+    async def _download_series(self, symbol: str, interval: str) -> pd.DataFrame:
+        """Download the full series for a symbol and interval.
+        
+        Args:
+            symbol: The ticker symbol
+            interval: Data interval ('daily', 'weekly', 'monthly', 'intraday')
+        
+        Returns:
+            DataFrame indexed by date in ascending order
+        """
+        if interval not in ('daily', 'weekly', 'monthly') and 'intraday' not in interval:
+            raise ValueError(f"Unsupported interval: {interval}")
+        
+        await _acquire_token(self.rate_limiter)
+        
+        ts = self._get_client()
+        if interval == 'daily':
+            data, meta_data = await ts.get_daily_adjusted(symbol=symbol, outputsize='full')
+        elif interval == 'weekly':
+            data, meta_data = await ts.get_weekly_adjusted(symbol=symbol)
+        elif interval == 'monthly':
+            data, meta_data = await ts.get_monthly_adjusted(symbol=symbol)
+        else:
+            # Extract interval from string like 'intraday_1min'
+            intraday_interval = interval.split('_')[1] if '_' in interval else '5min'
+            data, meta_data = await ts.get_intraday(symbol=symbol, interval=intraday_interval, outputsize='full')
+        
+        data.rename(columns=AlphaVantageConnector.COLUMN_MAP, inplace=True)
+        
+        # Alpha Vantage returns the newest bar first; sort so date slicing works
+        return data.sort_index()
+    
+    async def close(self) -> None:
+        """Close the aiohttp session of the TimeSeries client."""
+        if self._ts is not None:
+            await self._ts.close()
+            self._ts = None
+
+
+async def gather_historical_data(requests: Dict[Hashable, Tuple[AsyncMarketDataConnector, str, str, str, Optional[str]]],
+                                 max_concurrency: int = 8) -> Tuple[Dict[Hashable, pd.DataFrame], Dict[Hashable, Exception]]:
+    """Fetch many requests, possibly from different sources, concurrently.
+    
+    Args:
+        requests: Dictionary mapping a caller-chosen key to a tuple of
+            (connector, symbol, start_date, end_date, interval); an interval of
+            None uses the connector's default interval
+        max_concurrency: Maximum number of requests awaited at any time
+    
+    Returns:
+        Tuple of (results, errors) keyed like requests, in request order
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    
+    async def fetch(connector, symbol, start_date, end_date, interval):
+        async with semaphore:
+            if interval is None:
+                return await connector.get_historical_data(symbol, start_date, end_date)
+            return await connector.get_historical_data(symbol, start_date, end_date, interval)
+    
+    keys = list(requests)
+    outcomes = await asyncio.gather(*(fetch(*requests[key]) for key in keys), return_exceptions=True)
+    
+    results = {}
+    errors = {}
+    for key, outcome in zip(keys, outcomes):
+        if isinstance(outcome, Exception):
+            errors[key] = outcome
+        else:
+            results[key] = outcome
+    
+    return results, errors
+
+
+def get_async_data_connector(source: str = 'yahoo', **kwargs) -> AsyncMarketDataConnector:
+    """Factory function to get the appropriate async data connector.
+    
+    Args:
+        source: Data source ('yahoo', 'alpha_vantage' or 'local')
+        **kwargs: Additional arguments for the connector
+    
+    Returns:
+        AsyncMarketDataConnector instance
+    """
+    if source.lower() == 'alpha_vantage':
+        return AsyncAlphaVantageConnector(**kwargs)
+    
+    return ExecutorAsyncConnector(get_data_connector(source, **kwargs))
@@ -0,0 +1,92 @@
+# Dtype Policy Module
+# This module defines the column dtypes applied to connector output frames
+
+import numpy as np
+import pandas as pd
+from typing import Optional
+
+PRICE_COLUMNS = ('open', 'high', 'low', 'close', 'adj close', 'adjusted_close')
+DATE_COLUMNS = ('date', 'datetime')
+
+
+class DtypePolicy:
+    """Column dtypes applied to connector output frames.
+    
+    The compact defaults store prices and volume as float32, low-cardinality
+    text as categoricals and dates as datetime64, roughly halving the memory of
+    multi-symbol panels compared with pandas' float64/object defaults.
+    """
+    
+    def __init__(self,
+                 price_dtype: str = 'float32',
+                 volume_dtype: str = 'float32',
+                 other_float_dtype: Optional[str] = 'float32',
+                 categorize_text: bool = True,
+                 add_symbol: bool = True,
+                 date_as_index: bool = False):
+        """Initialize the dtype policy.
+        
+        Args:
+            price_dtype: Dtype for open/high/low/close columns
+            volume_dtype: Dtype for the volume column (an integer dtype falls back
+                to float32 when the column has missing values)
+            other_float_dtype: Dtype for other float columns such as dividends
+                (if None, they are left unchanged)
+            categorize_text: Whether to store text columns as categoricals
+            add_symbol: Whether to add a categorical 'symbol' column
+            date_as_index: Whether to move the date column into a DatetimeIndex
+        """
+        self.price_dtype = price_dtype
+        self.volume_dtype = volume_dtype
+        self.other_float_dtype = other_float_dtype
+        self.categorize_text = categorize_text
+        self.add_symbol = add_symbol
+        self.date_as_index = date_as_index
+    
+    def apply(self, data: pd.DataFrame, symbol: Optional[str] = None) -> pd.DataFrame:
+        """Apply the policy to a frame.
+        
+        Args:
+            data: DataFrame returned by a connector
+            symbol: Ticker symbol of the data (used for the 'symbol' column)
+            
+        Returns:
+            DataFrame with the policy's dtypes
+        """
+        dtypes = {}
+        date_column = None
+        
+        for col in data.columns:
+            name = str(col).lower()
+            column = data[col]
+            
+            if name in DATE_COLUMNS:
+                date_column = col
+            elif name in PRICE_COLUMNS and pd.api.types.is_numeric_dtype(column):
+                dtypes[col] = self.price_dtype
+            elif name == 'volume' and pd.api.types.is_numeric_dtype(column):
+                if np.issubdtype(np.dtype(self.volume_dtype), np.integer) and column.isna().any():
+                    dtypes[col] = 'float32'
+                else:
+                    dtypes[col] = self.volume_dtype
+            elif self.other_float_dtype is not None and pd.api.types.is_float_dtype(column):
+                dtypes[col] = self.other_float_dtype
+            elif self.categorize_text and pd.api.types.is_object_dtype(column):
+                dtypes[col] = 'category'
+        
+        df = data.astype(dtypes) if dtypes else data
+        
+        if date_column is not None and not pd.api.types.is_datetime64_any_dtype(df[date_column]):
+            df[date_column] = pd.to_datetime(df[date_column])
+        
+        if self.add_symbol and symbol is not None:
+            df['symbol'] = pd.Categorical.from_codes(np.zeros(len(df), dtype=np.int8), categories=[symbol])
+        
+        if self.date_as_index and date_column is not None:
+            df = df.set_index(date_column)
+        
+        return df
+
+
+# Default compact policy for in-process panels
+COMPACT_DTYPES = DtypePolicy()
@@ -0,0 +1,170 @@
+# Local File Connector
+# This module serves OHLCV data from Parquet or CSV files on disk
+
+import os
+import pandas as pd
+import pyarrow.parquet as pq
+from pyarrow import types as pa_types
+from typing import List, Optional
+from urllib.parse import quote, unquote
+
+from data_processing.connectors.dtypes import DtypePolicy
+from data_processing.connectors.market_data import MarketDataConnector
+
+
+class LocalFileConnector(MarketDataConnector):
+    """Connector that replays OHLCV data from local files.
+
+    Files are looked up as `<data_dir>/<interval>/<SYMBOL>.parquet` (the layout
+    written by OHLCVCache, so a cache directory can be replayed directly), then
+    `<data_dir>/<SYMBOL>.parquet`, and finally the same paths with a `.csv`
+    extension. Parquet files are memory-mapped, read only for the requested
+    columns, and filtered by date inside the reader.
+    """
+
+    def __init__(self,
+                 data_dir: str = './data/market_cache',
+                 columns: Optional[List[str]] = None,
+                 dtype_policy: Optional[DtypePolicy] = None):
+        """Initialize the local file connector.
+
+        Args:
+            data_dir: Directory containing the data files
+            columns: Columns to load besides the date (if None, loads all columns)
+            dtype_policy: Dtypes applied to returned frames (if None, keeps the file dtypes)
+        """
+        super().__init__(dtype_policy=dtype_policy)
+        if not os.path.isdir(data_dir):
+            raise ValueError(f"Data directory not found: {data_dir}")
+
+        self.data_dir = data_dir
+        self.columns = columns
+
+    def get_historical_data(self, symbol: str, start_date: str, end_date: str, interval: str = '1d') -> pd.DataFrame:
+        """Get historical market data from local files.
+
+        Args:
+            symbol: The ticker symbol
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format (exclusive, as for Yahoo Finance)
+            interval: Data interval ('1d', '1h', etc.)
+
+        Returns:
+            DataFrame with historical data
+        """
+        path = self._find_file(symbol, interval)
+
+        if path.endswith('.parquet'):
+            df = self._read_parquet(path, start_date, end_date)
+        else:
+            df = self._read_csv(path, start_date, end_date)
+
+        # Ensure the dataframe has the expected columns
+        required_columns = ['open', 'high', 'low', 'close', 'volume']
+        for col in required_columns:
+            if col not in df.columns and (self.columns is None or col in self.columns):
+                raise ValueError(f"Required column {col} not found in {path}")
+
+        return self._apply_dtype_policy(df.reset_index(drop=True), symbol)
+
+    def available_symbols(self, interval: str = '1d') -> List[str]:
+        """List the symbols that have data files for an interval.
+
+        Args:
+            interval: Data interval
+
+        Returns:
+            Sorted list of symbols
+        """
+        symbols = set()
+        for directory in (os.path.join(self.data_dir, quote(interval, safe='')), self.data_dir):
+            if not os.path.isdir(directory):
+                continue
+            for filename in os.listdir(directory):
+                for extension in ('.parquet', '.csv'):
+                    if filename.endswith(extension):
+                        symbols.add(unquote(filename[:-len(extension)]))
+        return sorted(symbols)
+
+    def _find_file(self, symbol: str, interval: str) -> str:
+        """Find the data file for a symbol and interval."""
+        name = quote(symbol.upper(), safe='')
+        candidates = []
+        for extension in ('.parquet', '.csv'):
+            candidates.append(os.path.join(self.data_dir, quote(interval, safe=''), f"{name}{extension}"))
+            candidates.append(os.path.join(self.data_dir, f"{name}{extension}"))
+
+        for path in candidates:
+            if os.path.exists(path):
+                return path
+
+        raise ValueError(f"No local data file for {symbol} ({interval}) in {self.data_dir}")
+
+    def _read_parquet(self, path: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """Read a date range from a Parquet file with projection and predicate pushdown."""
+        schema = pq.read_schema(path, memory_map=True)
+        date_column = self._find_date_column(schema)
+
+        columns = None
+        if self.columns is not None:
+            columns = [date_column] + [col for col in self.columns if col in schema.names and col != date_column]
+
+        # Filter bounds must match the column's timezone for the comparison to be pushed down
+        start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+        tz = getattr(schema.field(date_column).type, 'tz', None)
+        if tz is not None:
+            start, end = start.tz_localize(tz), end.tz_localize(tz)
+
+        table = pq.read_table(
+            path,
+            columns=columns,
+            filters=[(date_column, '>=', start), (date_column, '<', end)],
+            memory_map=True
+        )
+        df = table.to_pandas()
+
+        # Files written from an indexed frame come back with the date as index
+        if isinstance(df.index, pd.DatetimeIndex):
+            df = df.reset_index()
+
+        return df
+
+    def _read_csv(self, path: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """Read a date range from a CSV file."""
+        header = pd.read_csv(path, nrows=0).columns
+        date_column = next((col for col in header if col.lower() in ('date', 'datetime')), header[0])
+
+        usecols = None
+        if self.columns is not None:
+            usecols = [date_column] + [col for col in self.columns if col in header and col != date_column]
+
+        df = pd.read_csv(path, usecols=usecols, parse_dates=[date_column])
+
+        # Timestamps with mixed UTC offsets (e.g. across DST changes) are not parsed by read_csv
+        if not pd.api.types.is_datetime64_any_dtype(df[date_column]):
+            df[date_column] = pd.to_datetime(df[date_column], utc=True)
+
+        dates = df[date_column]
+        start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+        if getattr(dates.dt, 'tz', None) is not None:
+            start, end = start.tz_localize(dates.dt.tz), end.tz_localize(dates.dt.tz)
+
+        return df[(dates >= start) & (dates < end)]
+
+    def _find_date_column(self, schema) -> str:
+        """Find the timestamp column of a Parquet schema."""
+        # Prefer the pandas index column, then a column named like a date
+        pandas_metadata = schema.pandas_metadata or {}
+        for column in pandas_metadata.get('index_columns', []):
+            if isinstance(column, str) and column in schema.names:
+                return column
+
+        for name in schema.names:
+            if name.lower() in ('date', 'datetime'):
+                return name
+
+        for field in schema:
+            if pa_types.is_timestamp(field.type):
+                return field.name
+
+        raise ValueError("No date column found in Parquet file")
@@ -5,15 +5,53 @@ import pandas as pd
 import numpy as np
 import yfinance as yf
 from alpha_vantage.timeseries import TimeSeries
-from typing import Dict, List, Tuple, Optional, Union
+from typing import Dict, Iterator, List, Tuple, Optional, Union
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 
+from data_processing.connectors.dtypes import DtypePolicy
+from data_processing.connectors.memory_cache import TTLCache
+from data_processing.connectors.ohlcv_cache import OHLCVCache
+from data_processing.connectors.rate_limiter import get_rate_limiter
+from data_processing.connectors.resampling import derive_intervals
+from data_processing.connectors.streaming import Bar, stream_bars
+
+def to_panel(results: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Stack per-symbol frames into one long frame with a categorical symbol column.
+    
+    Args:
+        results: Dictionary mapping symbols to DataFrames, in the desired order
+        
+    Returns:
+        DataFrame with a symbol column followed by the columns of the input frames
+    """
+    if not results:
+        return pd.DataFrame()
+    frames = [df.drop(columns='symbol') if 'symbol' in df.columns else df for df in results.values()]
+    panel = pd.concat(frames, keys=list(results), names=['symbol', None]).reset_index(level=0)
+    panel['symbol'] = pd.Categorical(panel['symbol'], categories=list(results))
+    return panel.reset_index(drop=True)
+
+
 class MarketDataConnector:
     """Base class for market data connectors."""
     
-    def __init__(self):
-        pass
+    def __init__(self, dtype_policy: Optional[DtypePolicy] = None):
+        """Initialize the connector.
+        
+        Args:
+            dtype_policy: Dtypes applied to returned frames (if None, frames keep
+                the dtypes produced by the data source)
+        """
+        self.dtype_policy = dtype_policy
+    
+    def _apply_dtype_policy(self, df: pd.DataFrame, symbol: str) -> pd.DataFrame:
+        """Apply the connector's dtype policy to an output frame."""
+        if self.dtype_policy is None:
+            return df
+        return self.dtype_policy.apply(df, symbol=symbol)
     
     def get_historical_data(self, symbol: str, start_date: str, end_date: str, interval: str) -> pd.DataFrame:
         """Get historical market data for a symbol.
@@ -28,17 +66,154 @@ class MarketDataConnector:
             DataFrame with historical data
         """
         raise NotImplementedError("Subclasses must implement this method")
+    
+    def get_historical_data_many(self,
+                                 symbols: List[str],
+                                 start_date: str,
+                                 end_date: str,
+                                 interval: Optional[str] = None,
+                                 max_workers: int = 8,
+                                 as_panel: bool = False) -> Tuple[Union[Dict[str, pd.DataFrame], pd.DataFrame], Dict[str, Exception]]:
+        """Get historical market data for many symbols concurrently.
+        
+        Requests run on a bounded thread pool, so at most max_workers fetches are
+        in flight at any time. A failure for one symbol does not affect the others.
+        
+        Args:
+            symbols: List of ticker symbols
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format
+            interval: Data interval (if None, uses the connector's default interval)
+            max_workers: Maximum number of concurrent requests
+            as_panel: Whether to return a single long DataFrame with a symbol column
+                instead of a dictionary of DataFrames
+            
+        Returns:
+            Tuple of (results, errors) where results maps each successful symbol to its
+            DataFrame (or is a single panel DataFrame if as_panel is True) and errors maps
+            each failed symbol to the exception it raised
+        """
+        kwargs = {'interval': interval} if interval is not None else {}
+        results = {}
+        errors = {}
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(symbols) or 1))) as executor:
+            futures = {
+                executor.submit(self.get_historical_data, symbol, start_date, end_date, **kwargs): symbol
+                for symbol in symbols
+            }
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    results[symbol] = future.result()
+                except Exception as e:
+                    errors[symbol] = e
+        
+        # Preserve the requested symbol order
+        results = {symbol: results[symbol] for symbol in symbols if symbol in results}
+        
+        if as_panel:
+            return to_panel(results), errors
+        
+        return results, errors
+    
+    def stream_bars(self,
+                    symbols: List[str],
+                    interval: str = '1m',
+                    poll_seconds: Optional[float] = None,
+                    stop_event: Optional[threading.Event] = None) -> Iterator[Bar]:
+        """Yield bars for many symbols as they close.
+        
+        The connector is polled for recent bars and each newly closed bar is
+        yielded once, in timestamp order. Use SimulatedBarFeed to replay
+        history through the same Bar interface without a network.
+        
+        Args:
+            symbols: List of ticker symbols
+            interval: Bar interval (e.g. '1m', '1h', '1d')
+            poll_seconds: Seconds between polls (if None, derived from the interval)
+            stop_event: Event that ends the stream when set
+            
+        Yields:
+            Bar objects
+        """
+        return stream_bars(self, symbols, interval=interval, poll_seconds=poll_seconds, stop_event=stop_event)
+    
+    def get_multi_interval_data(self,
+                                symbol: str,
+                                start_date: str,
+                                end_date: str,
+                                intervals: List[str],
+                                base_interval: str) -> Dict[str, pd.DataFrame]:
+        """Get several intervals for a symbol from a single download.
+        
+        Bars are fetched once at base_interval and every other interval is
+        resampled locally, so all intervals agree with each other.
+        
+        Args:
+            symbol: The ticker symbol
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format
+            intervals: Intervals to return (e.g. ['1h', '1d', '1wk'])
+            base_interval: Finest interval to download (e.g. '1h')
+            
+        Returns:
+            Dictionary mapping each interval to a DataFrame with historical data
+        """
+        data = self.get_historical_data(symbol, start_date, end_date, base_interval)
+        return derive_intervals(data, intervals, base_interval)
+    
+    def get_latest_quotes(self, symbols: List[str]) -> pd.DataFrame:
+        """Get the latest available bar for many symbols.
+        
+        The default implementation fetches the last few days for every symbol
+        concurrently; connectors with a batched quote endpoint override it.
+        
+        Args:
+            symbols: List of ticker symbols
+            
+        Returns:
+            DataFrame indexed by symbol with date, open, high, low, close and volume
+            columns; symbols without data are omitted
+        """
+        end_date = (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d')
+        start_date = (datetime.now() - timedelta(days=5)).strftime('%Y-%m-%d')
+        
+        results, _ = self.get_historical_data_many(symbols, start_date, end_date)
+        
+        quotes = {}
+        for symbol, df in results.items():
+            if df.empty:
+                continue
+            row = df.iloc[-1]
+            date_column = next((col for col in df.columns if str(col).lower() in ('date', 'datetime')), df.columns[0])
+            quotes[symbol] = {
+                'date': row[date_column],
+                **{col: row[col] for col in ['open', 'high', 'low', 'close', 'volume'] if col in df.columns}
+            }
+        
+        return pd.DataFrame.from_dict(quotes, orient='index')
 
 
 class YahooFinanceConnector(MarketDataConnector):
     """Connector for Yahoo Finance data."""
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, cache_dir: Optional[str] = None, dtype_policy: Optional[DtypePolicy] = None):
+        """Initialize the Yahoo Finance connector.
+        
+        Args:
+            cache_dir: Directory for the on-disk OHLCV cache (if None, every request goes to the network)
+            dtype_policy: Dtypes applied to returned frames (if None, keeps the source dtypes)
+        """
+        super().__init__(dtype_policy=dtype_policy)
+        self.cache = OHLCVCache(cache_dir) if cache_dir else None
     
     def get_historical_data(self, symbol: str, start_date: str, end_date: str, interval: str = '1d') -> pd.DataFrame:
         """Get historical market data from Yahoo Finance.
         
+        When a cache directory is configured, only the date ranges that are not
+        already on disk are downloaded.
+        
         Args:
             symbol: The ticker symbol
             start_date: Start date in YYYY-MM-DD format
@@ -48,25 +223,86 @@ class YahooFinanceConnector(MarketDataConnector):
         Returns:
             DataFrame with historical data
         """
-        ticker = yf.Ticker(symbol)
-        df = ticker.history(start=start_date, end=end_date, interval=interval)
+        required_columns = ['open', 'high', 'low', 'close', 'volume']
+        
+        if self.cache is not None:
+            df = self.cache.get(symbol, interval, start_date, end_date, self._download)
+            if df.empty:
+                # Nothing cached or downloaded: return an empty frame with the same
+                # layout as an empty download
+                df = pd.DataFrame(columns=required_columns, index=pd.DatetimeIndex([], name='Date'), dtype=float)
+        else:
+            df = self._download(symbol, start_date, end_date, interval)
         
         # Ensure the dataframe has the expected columns
-        required_columns = ['Open', 'High', 'Low', 'Close', 'Volume']
         for col in required_columns:
             if col not in df.columns:
-                raise ValueError(f"Required column {col} not found in Yahoo Finance data")
-        
-        # Rename columns to lowercase for consistency
-        df.columns = [col.lower() for col in df.columns]
+                raise ValueError(f"Required column {col.capitalize()} not found in Yahoo Finance data")
         
         # Reset index to make date a column
-        df.reset_index(inplace=True)
+        df = df.reset_index()
         if 'date' not in df.columns and 'datetime' in df.columns:
             df.rename(columns={'datetime': 'date'}, inplace=True)
         
+        return self._apply_dtype_policy(df, symbol)
+    
+    def _download(self, symbol: str, start_date: str, end_date: str, interval: str) -> pd.DataFrame:
+        """Download bars from Yahoo Finance.
+        
+        Args:
+            symbol: The ticker symbol
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format
+            interval: Data interval
+            
+        Returns:
+            DataFrame indexed by bar timestamp with lowercase column names
+        """
+        ticker = yf.Ticker(symbol)
+        df = ticker.history(start=start_date, end=end_date, interval=interval)
+        
+        # Rename columns to lowercase for consistency
+        df.columns = [col.lower() for col in df.columns]
         return df
     
+    def get_latest_quotes(self, symbols: List[str]) -> pd.DataFrame:
+        """Get the latest available bar for many symbols in one batched request.
+        
+        Args:
+            symbols: List of ticker symbols
+            
+        Returns:
+            DataFrame indexed by symbol with date, open, high, low, close and volume
+            columns; symbols without data are omitted
+        """
+        data = yf.download(
+            tickers=list(symbols),
+            period='5d',
+            interval='1d',
+            group_by='ticker',
+            auto_adjust=True,
+            threads=True,
+            progress=False
+        )
+        
+        quotes = {}
+        for symbol in symbols:
+            if isinstance(data.columns, pd.MultiIndex):
+                if symbol not in data.columns.get_level_values(0):
+                    continue
+                frame = data[symbol]
+            else:
+                frame = data
+            
+            frame = frame.dropna(how='all')
+            if frame.empty:
+                continue
+            
+            row = frame.iloc[-1]
+            quotes[symbol] = {'date': frame.index[-1], **{col.lower(): row[col] for col in frame.columns}}
+        
+        return pd.DataFrame.from_dict(quotes, orient='index')
+    
     def get_latest_data(self, symbol: str) -> pd.DataFrame:
         """Get the latest available data for a symbol.
         
@@ -76,28 +312,58 @@ class YahooFinanceConnector(MarketDataConnector):
         Returns:
             DataFrame with the latest data
         """
-        end_date = datetime.now().strftime('%Y-%m-%d')
-        start_date = (datetime.now() - timedelta(days=5)).strftime('%Y-%m-%d')
-        
-        df = self.get_historical_data(symbol, start_date, end_date, '1d')
-        return df.tail(1)
+        return self.get_latest_quotes([symbol]).reset_index(drop=True)
 
 
 class AlphaVantageConnector(MarketDataConnector):
-    """Connector for Alpha Vantage data."""
+    """Connector for Alpha Vantage data.
+    
+    Each (symbol, interval) series is downloaded in full once and kept in a
+    shared in-memory cache; date-range requests are served as slices of it.
+    Outgoing API calls go through a token bucket sized to the free-tier quota,
+    so batch jobs wait for capacity instead of being rejected.
+    """
+    
+    # Free-tier quota: 5 requests per minute
+    DEFAULT_CALLS_PER_MINUTE = 5
+    
+    # Alpha Vantage column names mapped to the names used by the other connectors
+    COLUMN_MAP = {
+        '1. open': 'open',
+        '2. high': 'high',
+        '3. low': 'low',
+        '4. close': 'close',
+        '5. adjusted close': 'adjusted_close',
+        '6. volume': 'volume',
+        '7. dividend amount': 'dividend',
+        '8. split coefficient': 'split_coefficient'
+    }
     
-    def __init__(self, api_key: Optional[str] = None):
+    # Full series shared by all connector instances, refreshed after an hour
+    _series_cache = TTLCache(ttl=3600, max_entries=256)
+    
+    def __init__(self,
+                 api_key: Optional[str] = None,
+                 calls_per_minute: int = DEFAULT_CALLS_PER_MINUTE,
+                 series_cache: Optional[TTLCache] = None,
+                 dtype_policy: Optional[DtypePolicy] = None):
         """Initialize the Alpha Vantage connector.
         
         Args:
             api_key: Alpha Vantage API key (if None, will look for ALPHA_VANTAGE_API_KEY env var)
+            calls_per_minute: Maximum number of API calls per minute for this key
+            series_cache: Cache for full series (if None, uses the cache shared by all instances)
+            dtype_policy: Dtypes applied to returned frames (if None, keeps the source dtypes)
         """
-        super().__init__()
+        super().__init__(dtype_policy=dtype_policy)
         self.api_key = api_key or os.environ.get('ALPHA_VANTAGE_API_KEY')
         if not self.api_key:
             raise ValueError("Alpha Vantage API key is required. Set it as an argument or as ALPHA_VANTAGE_API_KEY environment variable.")
         
         self.ts = TimeSeries(key=self.api_key, output_format='pandas')
+        self.rate_limiter = get_rate_limiter('alpha_vantage', self.api_key,
+                                             rate=calls_per_minute / 60.0, capacity=calls_per_minute)
+        self.series_cache = series_cache if series_cache is not None else self._series_cache
     
     def get_historical_data(self, symbol: str, start_date: str, end_date: str, interval: str = 'daily') -> pd.DataFrame:
         """Get historical market data from Alpha Vantage.
@@ -111,6 +377,35 @@ class AlphaVantageConnector(MarketDataConnector):
         Returns:
             DataFrame with historical data
         """
+        data = self.series_cache.get_or_set(
+            (symbol.upper(), interval),
+            lambda: self._download_series(symbol, interval)
+        )
+        
+        # Filter by date range
+        data = data.loc[start_date:end_date]
+        
+        # Reset index to make date a column
+        data = data.reset_index()
+        data.rename(columns={'index': 'date'}, inplace=True)
+        
+        return self._apply_dtype_policy(data, symbol)
+    
+    def _download_series(self, symbol: str, interval: str) -> pd.DataFrame:
+        """Download the full series for a symbol and interval.
+        
+        Args:
+            symbol: The ticker symbol
+            interval: Data interval ('daily', 'weekly', 'monthly', 'intraday')
+            
+        Returns:
+            DataFrame indexed by date in ascending order
+        """
+        if interval not in ('daily', 'weekly', 'monthly') and 'intraday' not in interval:
+            raise ValueError(f"Unsupported interval: {interval}")
+        
+        self.rate_limiter.acquire()
+        
         # Map interval to Alpha Vantage function
         if interval == 'daily':
             data, meta_data = self.ts.get_daily_adjusted(symbol=symbol, outputsize='full')
@@ -118,50 +413,42 @@ class AlphaVantageConnector(MarketDataConnector):
             data, meta_data = self.ts.get_weekly_adjusted(symbol=symbol)
         elif interval == 'monthly':
             data, meta_data = self.ts.get_monthly_adjusted(symbol=symbol)
-        elif 'intraday' in interval:
+        else:
             # Extract interval from string like 'intraday_1min'
             intraday_interval = interval.split('_')[1] if '_' in interval else '5min'
             data, meta_data = self.ts.get_intraday(symbol=symbol, interval=intraday_interval, outputsize='full')
-        else:
-            raise ValueError(f"Unsupported interval: {interval}")
         
         # Rename columns for consistency
-        column_map = {
-            '1. open': 'open',
-            '2. high': 'high',
-            '3. low': 'low',
-            '4. close': 'close',
-            '5. adjusted close': 'adjusted_close',
-            '6. volume': 'volume',
-            '7. dividend amount': 'dividend',
-            '8. split coefficient': 'split_coefficient'
-        }
-        
-        data.rename(columns=column_map, inplace=True)
+        data.rename(columns=self.COLUMN_MAP, inplace=True)
         
-        # Filter by date range
-        data = data.loc[start_date:end_date]
-        
-        # Reset index to make date a column
-        data.reset_index(inplace=True)
-        data.rename(columns={'index': 'date'}, inplace=True)
-        
-        return data
+        # Alpha Vantage returns the newest bar first; sort so date slicing works
+        return data.sort_index()
 
 
-def get_data_connector(source: str = 'yahoo', **kwargs) -> MarketDataConnector:
+def get_data_connector(source: str = 'yahoo', coalesce: bool = False, **kwargs) -> MarketDataConnector:
     """Factory function to get the appropriate data connector.
     
     Args:
-        source: Data source ('yahoo' or 'alpha_vantage')
+        source: Data source ('yahoo', 'alpha_vantage' or 'local')
+        coalesce: Whether identical concurrent requests should share a single fetch
         **kwargs: Additional arguments for the connector
         
     Returns:
         MarketDataConnector instance
     """
     if source.lower() == 'yahoo':
-        return YahooFinanceConnector()
+        connector = YahooFinanceConnector(**kwargs)
     elif source.lower() == 'alpha_vantage':
-        return AlphaVantageConnector(**kwargs)
+        connector = AlphaVantageConnector(**kwargs)
+    elif source.lower() == 'local':
+        # Imported here because the local connector builds on this module
+        from data_processing.connectors.local_files import LocalFileConnector
+        connector = LocalFileConnector(**kwargs)
     else:
-        raise ValueError(f"Unsupported data source: {source}")
\ No newline at end of file
+        raise ValueError(f"Unsupported data source: {source}")
+    
+    if coalesce:
+        from data_processing.connectors.single_flight import CoalescingConnector
+        connector = CoalescingConnector(connector)
+    
+    return connector
\ No newline at end of file
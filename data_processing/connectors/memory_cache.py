@@ -0,0 +1,97 @@
+# Memory Cache Module
+# This module provides a small thread-safe in-memory cache with expiry
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """Thread-safe in-memory cache whose entries expire after a fixed time.
+    
+    When max_entries is set, the least recently used entry is evicted once the
+    cache is full.
+    """
+    
+    def __init__(self, ttl: float, max_entries: Optional[int] = None):
+        """Initialize the cache.
+        
+        Args:
+            ttl: Number of seconds an entry stays valid
+            max_entries: Maximum number of entries to keep (if None, unbounded)
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value if it is present and has not expired.
+        
+        Args:
+            key: Cache key
+            default: Value to return on a miss
+            
+        Returns:
+            Cached value or default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return default
+            
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value.
+        
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            if self.max_entries is not None:
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+    
+    def get_or_set(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Get a value, computing and storing it on a miss.
+        
+        Args:
+            key: Cache key
+            compute: Function returning the value to store on a miss
+            
+        Returns:
+            Cached or newly computed value
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.set(key, value)
+        return value
+    
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Remove one entry, or all entries if key is None.
+        
+        Args:
+            key: Cache key to remove
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
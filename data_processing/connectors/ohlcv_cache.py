@@ -0,0 +1,213 @@
+# OHLCV Cache Module
+# This module provides a persistent columnar cache for market data bars
+
+import os
+import json
+import threading
+import pandas as pd
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+# Locks are shared per cache file so that every connector instance in the
+# process serializes its read-merge-write cycle on the same (symbol, interval)
+_LOCKS: Dict[str, threading.Lock] = {}
+_LOCKS_GUARD = threading.Lock()
+
+
+def _get_lock(path: str) -> threading.Lock:
+    """Get the process-wide lock for a cache file."""
+    with _LOCKS_GUARD:
+        if path not in _LOCKS:
+            _LOCKS[path] = threading.Lock()
+        return _LOCKS[path]
+
+
+class OHLCVCache:
+    """On-disk cache of OHLCV bars keyed by (symbol, interval).
+
+    Bars are stored as one Parquet file per symbol and interval, together with a
+    small JSON sidecar recording the date range that has already been downloaded.
+    Requests are served from disk and only the date ranges outside the covered
+    range are fetched from the upstream source.
+    """
+
+    def __init__(self, cache_dir: str = './data/market_cache'):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory to store cached bars
+        """
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, symbol: str, interval: str) -> Tuple[str, str]:
+        """Get the data and metadata file paths for a cache key."""
+        directory = os.path.join(self.cache_dir, quote(interval, safe=''))
+        os.makedirs(directory, exist_ok=True)
+        name = quote(symbol.upper(), safe='')
+        return (os.path.join(directory, f"{name}.parquet"),
+                os.path.join(directory, f"{name}.meta.json"))
+
+    def load(self, symbol: str, interval: str) -> Optional[pd.DataFrame]:
+        """Load all cached bars for a symbol and interval.
+
+        Args:
+            symbol: The ticker symbol
+            interval: Data interval
+
+        Returns:
+            DataFrame indexed by bar timestamp, or None if nothing is cached
+        """
+        data_path, _ = self._paths(symbol, interval)
+        if not os.path.exists(data_path):
+            return None
+        return pd.read_parquet(data_path)
+
+    def coverage(self, symbol: str, interval: str) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """Get the date range already downloaded for a symbol and interval.
+
+        Args:
+            symbol: The ticker symbol
+            interval: Data interval
+
+        Returns:
+            Tuple of (start, end) with an exclusive end, or None if nothing is cached
+        """
+        _, meta_path = self._paths(symbol, interval)
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, 'r') as f:
+            meta = json.load(f)
+        return pd.Timestamp(meta['start']), pd.Timestamp(meta['end'])
+
+    def missing_ranges(self, symbol: str, interval: str, start_date: str, end_date: str) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """Get the date ranges of a request that are not covered by the cache.
+
+        Gaps between the request and the cached range are included so that the
+        covered range always stays contiguous.
+
+        Args:
+            symbol: The ticker symbol
+            interval: Data interval
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format (exclusive)
+
+        Returns:
+            List of (start, end) ranges to download
+        """
+        start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+        covered = self.coverage(symbol, interval)
+        if covered is None:
+            return [(start, end)]
+
+        covered_start, covered_end = covered
+        missing = []
+        if start < covered_start:
+            missing.append((start, covered_start))
+        if end > covered_end:
+            missing.append((covered_end, end))
+        return missing
+
+    def get(self,
+            symbol: str,
+            interval: str,
+            start_date: str,
+            end_date: str,
+            fetch: Callable[[str, str, str, str], pd.DataFrame]) -> pd.DataFrame:
+        """Get bars for a date range, downloading only what is not cached.
+
+        Args:
+            symbol: The ticker symbol
+            interval: Data interval
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format (exclusive)
+            fetch: Function called as fetch(symbol, start_date, end_date, interval)
+                returning a DataFrame indexed by bar timestamp
+
+        Returns:
+            DataFrame with the cached bars in [start_date, end_date)
+        """
+        data_path, meta_path = self._paths(symbol, interval)
+
+        with _get_lock(data_path):
+            cached = self.load(symbol, interval)
+            missing = self.missing_ranges(symbol, interval, start_date, end_date)
+
+            if missing:
+                frames = [cached] if cached is not None else []
+                # Only ranges that returned bars are marked as covered, so a failed
+                # or empty download is retried by the next request
+                downloaded = []
+                for range_start, range_end in missing:
+                    fetched = fetch(symbol, range_start.strftime('%Y-%m-%d'), range_end.strftime('%Y-%m-%d'), interval)
+                    if fetched is not None and not fetched.empty:
+                        frames.append(fetched)
+                        downloaded.append((range_start, range_end))
+
+                frames = [frame for frame in frames if not frame.empty]
+                if frames:
+                    merged = pd.concat(frames)
+                    merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+                    self._write(merged, data_path)
+                    cached = merged
+
+                if downloaded:
+                    self._extend_coverage(symbol, interval, downloaded, meta_path)
+
+        if cached is None:
+            return pd.DataFrame()
+
+        return self._slice(cached, start_date, end_date)
+
+    def _extend_coverage(self, symbol: str, interval: str, fetched: List[Tuple[pd.Timestamp, pd.Timestamp]], meta_path: str) -> None:
+        """Record newly downloaded ranges in the metadata sidecar."""
+        # The current day's bar is still forming, so it is never marked as covered
+        today = pd.Timestamp.now().normalize()
+
+        starts = [start for start, _ in fetched]
+        ends = [end for _, end in fetched]
+        covered = self.coverage(symbol, interval)
+        if covered is not None:
+            starts.append(covered[0])
+            ends.append(covered[1])
+
+        start, end = min(starts), min(max(ends), today)
+        if end <= start:
+            return
+
+        tmp_path = f"{meta_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'start': start.isoformat(), 'end': end.isoformat()}, f)
+        os.replace(tmp_path, meta_path)
+
+    def _write(self, data: pd.DataFrame, data_path: str) -> None:
+        """Atomically write bars to a Parquet file."""
+        tmp_path = f"{data_path}.tmp"
+        data.to_parquet(tmp_path)
+        os.replace(tmp_path, data_path)
+
+    def _slice(self, data: pd.DataFrame, start_date: str, end_date: str) -> pd.DataFrame:
+        """Select the bars in [start_date, end_date) from a timestamp-indexed frame."""
+        start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+        tz = getattr(data.index, 'tz', None)
+        if tz is not None:
+            start, end = start.tz_localize(tz), end.tz_localize(tz)
+
+        mask = (data.index >= start) & (data.index < end)
+        return data.loc[mask]
+
+    def clear(self, symbol: Optional[str] = None, interval: Optional[str] = None) -> None:
+        """Remove cached bars.
+
+        Args:
+            symbol: Symbol to clear (if None, clears all symbols)
+            interval: Interval to clear (if None, clears all intervals)
+        """
+        intervals = [quote(interval, safe='')] if interval else os.listdir(self.cache_dir)
+        for interval_dir in intervals:
+            directory = os.path.join(self.cache_dir, interval_dir)
+            if not os.path.isdir(directory):
+                continue
+            for filename in os.listdir(directory):
+                if symbol is None or filename.startswith(f"{quote(symbol.upper(), safe='')}."):
+                    os.remove(os.path.join(directory, filename))
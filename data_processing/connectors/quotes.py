@@ -0,0 +1,89 @@
+# Quote Snapshot Module
+# This module serves the latest bar for many symbols from a short-lived cache
+
+import threading
+import pandas as pd
+from typing import Dict, List, Optional
+
+from data_processing.connectors.market_data import MarketDataConnector, YahooFinanceConnector
+from data_processing.connectors.memory_cache import TTLCache
+
+
+class QuoteSnapshotService:
+    """Latest-bar snapshots for many symbols.
+    
+    Symbols missing from the cache are fetched together in one batched connector
+    call; results stay valid for a short time so that every panel reading current
+    prices during a refresh shares the same download.
+    """
+    
+    def __init__(self, connector: Optional[MarketDataConnector] = None, ttl: float = 15.0):
+        """Initialize the quote snapshot service.
+        
+        Args:
+            connector: Connector used to fetch quotes (if None, uses Yahoo Finance)
+            ttl: Number of seconds a quote stays valid
+        """
+        self.connector = connector or YahooFinanceConnector()
+        self.cache = TTLCache(ttl=ttl)
+    
+    def get_quotes(self, symbols: List[str]) -> pd.DataFrame:
+        """Get the latest bar for each symbol.
+        
+        Args:
+            symbols: List of ticker symbols
+            
+        Returns:
+            DataFrame indexed by symbol with date, open, high, low, close and volume
+            columns; symbols without data are omitted
+        """
+        quotes = {}
+        missing = []
+        for symbol in dict.fromkeys(symbols):
+            quote = self.cache.get(symbol)
+            if quote is None:
+                missing.append(symbol)
+            else:
+                quotes[symbol] = quote
+        
+        if missing:
+            fetched = self.connector.get_latest_quotes(missing)
+            for symbol, quote in fetched.iterrows():
+                self.cache.set(symbol, quote)
+                quotes[symbol] = quote
+        
+        if not quotes:
+            return pd.DataFrame(columns=['date', 'open', 'high', 'low', 'close', 'volume'])
+        
+        result = pd.DataFrame([quotes[symbol] for symbol in symbols if symbol in quotes])
+        result.index.name = 'symbol'
+        return result
+    
+    def get_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """Get the latest close price for each symbol.
+        
+        Args:
+            symbols: List of ticker symbols
+            
+        Returns:
+            Dictionary mapping symbols to their latest close price
+        """
+        quotes = self.get_quotes(symbols)
+        return {symbol: float(price) for symbol, price in quotes['close'].items()}
+
+
+_default_service = None
+_default_service_lock = threading.Lock()
+
+
+def get_quote_service() -> QuoteSnapshotService:
+    """Get the quote snapshot service shared by the process.
+    
+    Returns:
+        QuoteSnapshotService instance
+    """
+    global _default_service
+    with _default_service_lock:
+        if _default_service is None:
+            _default_service = QuoteSnapshotService()
+        return _default_service
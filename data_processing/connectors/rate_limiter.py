@@ -0,0 +1,106 @@
+# Rate Limiter Module
+# This module provides a token-bucket limiter for outgoing data provider requests
+
+import time
+import threading
+from typing import Dict, Optional, Tuple
+
+
+class TokenBucket:
+    """Thread-safe token-bucket rate limiter.
+    
+    The bucket holds up to `capacity` tokens and refills at `rate` tokens per
+    second. Each request takes one token; when the bucket is empty, callers
+    block until a token becomes available instead of failing.
+    """
+    
+    def __init__(self, rate: float, capacity: int):
+        """Initialize the token bucket.
+        
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens (the allowed burst size)
+        """
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("Rate and capacity must be positive")
+        
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self) -> None:
+        """Add the tokens accrued since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+    
+    def try_acquire(self, tokens: int = 1) -> bool:
+        """Take tokens without blocking.
+        
+        Args:
+            tokens: Number of tokens to take
+            
+        Returns:
+            True if the tokens were taken, False if the bucket is empty
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+    
+    def acquire(self, tokens: int = 1, timeout: Optional[float] = None) -> bool:
+        """Take tokens, blocking until they are available.
+        
+        Args:
+            tokens: Number of tokens to take
+            timeout: Maximum number of seconds to wait (if None, waits indefinitely)
+            
+        Returns:
+            True if the tokens were taken, False if the timeout expired
+        """
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket of capacity {self.capacity}")
+        
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+            
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+
+# Buckets are shared per (provider, key) so that every connector instance in the
+# process draws from the same quota
+_BUCKETS: Dict[Tuple[str, str], TokenBucket] = {}
+_BUCKETS_LOCK = threading.Lock()
+
+
+def get_rate_limiter(provider: str, key: str, rate: float, capacity: int) -> TokenBucket:
+    """Get the process-wide token bucket for a provider and API key.
+    
+    Args:
+        provider: Data provider name
+        key: API key the quota applies to
+        rate: Tokens added per second (used only when the bucket is created)
+        capacity: Maximum burst size (used only when the bucket is created)
+        
+    Returns:
+        TokenBucket instance
+    """
+    with _BUCKETS_LOCK:
+        if (provider, key) not in _BUCKETS:
+            _BUCKETS[(provider, key)] = TokenBucket(rate=rate, capacity=capacity)
+        return _BUCKETS[(provider, key)]
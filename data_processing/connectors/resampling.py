@@ -0,0 +1,98 @@
+# Resampling Module
+# This module derives coarser OHLCV bars from finer-grained bars
+
+import pandas as pd
+from typing import Dict, List, Optional
+
+# Pandas resampling rules for the intervals used across the project. Weekly bars
+# follow Yahoo Finance and are labeled with the Monday that starts the week.
+INTERVAL_RULES = {
+    '1h': {'rule': pd.offsets.Hour(1)},
+    '60m': {'rule': pd.offsets.Hour(1)},
+    '1d': {'rule': '1D'},
+    'daily': {'rule': '1D'},
+    '1wk': {'rule': 'W-MON', 'label': 'left', 'closed': 'left'},
+    'weekly': {'rule': 'W-MON', 'label': 'left', 'closed': 'left'},
+    '1mo': {'rule': 'MS'},
+    'monthly': {'rule': 'MS'}
+}
+
+# How each column is combined when bars are merged; other columns keep their last value
+AGGREGATIONS = {
+    'open': 'first',
+    'high': 'max',
+    'low': 'min',
+    'close': 'last',
+    'adjusted_close': 'last',
+    'volume': 'sum',
+    'dividends': 'sum',
+    'dividend': 'sum',
+    'stock splits': 'max'
+}
+
+
+def resample_ohlcv(data: pd.DataFrame, interval: str, date_column: Optional[str] = None, offset: Optional[str] = None) -> pd.DataFrame:
+    """Resample OHLCV bars to a coarser interval.
+    
+    Bars are combined with first/max/min/last/sum for open/high/low/close/volume
+    in a single vectorized pass. Periods without any input bar are dropped.
+    
+    Args:
+        data: DataFrame with OHLCV data, indexed by timestamp or with a date column
+        interval: Target interval ('1h', '1d', '1wk', '1mo' or 'daily', 'weekly', 'monthly')
+        date_column: Name of the date column (if None, uses a 'date'/'datetime' column
+            if present, otherwise the index)
+        offset: Offset of the bins from midnight (e.g. '30min' for hourly US equity bars)
+        
+    Returns:
+        DataFrame with resampled bars in the same layout as the input
+    """
+    if interval not in INTERVAL_RULES:
+        raise ValueError(f"Unsupported interval: {interval}")
+    
+    if date_column is None:
+        date_column = next((col for col in data.columns if str(col).lower() in ('date', 'datetime')), None)
+    
+    df = data.set_index(date_column) if date_column is not None else data.copy(deep=False)
+    if not isinstance(df.index, pd.DatetimeIndex):
+        df.index = pd.to_datetime(df.index)
+    
+    aggregations = {col: AGGREGATIONS.get(str(col).lower(), 'last') for col in df.columns}
+    
+    resample_args = dict(INTERVAL_RULES[interval])
+    rule = resample_args.pop('rule')
+    if offset is not None:
+        resample_args['offset'] = offset
+    
+    resampled = df.resample(rule, **resample_args).agg(aggregations)
+    
+    # Drop periods without any trading (weekends, holidays, closed sessions)
+    price_column = next((col for col in resampled.columns if str(col).lower() == 'open'), None)
+    if price_column is not None:
+        resampled = resampled[resampled[price_column].notna()]
+    
+    if date_column is not None:
+        resampled.index.name = date_column
+        resampled = resampled.reset_index()
+    
+    return resampled
+
+
+def derive_intervals(data: pd.DataFrame, intervals: List[str], base_interval: str, date_column: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+    """Build several intervals from one set of fine-grained bars.
+    
+    Because every interval comes from the same bars, they always agree with each other.
+    
+    Args:
+        data: DataFrame with OHLCV bars at base_interval
+        intervals: Intervals to build
+        base_interval: Interval of the input bars (returned unchanged)
+        date_column: Name of the date column (if None, detected as in resample_ohlcv)
+        
+    Returns:
+        Dictionary mapping each interval to its bars
+    """
+    return {
+        interval: data if interval == base_interval else resample_ohlcv(data, interval, date_column=date_column)
+        for interval in intervals
+    }
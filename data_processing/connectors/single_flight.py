@@ -0,0 +1,213 @@
+# Single-Flight Module
+# This module coalesces identical concurrent data requests into a single fetch
+
+import inspect
+import threading
+import pandas as pd
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple, Union
+
+from data_processing.connectors.market_data import MarketDataConnector, get_data_connector
+
+
+class _Call:
+    """An in-flight call and the result it produced."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key.
+    
+    The first caller for a key runs the function; callers arriving with the same
+    key while it is running wait for it and receive the same result (or exception).
+    Once the call finishes the key is forgotten, so later calls run again.
+    """
+    
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+    
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run fn once for all concurrent callers with the same key.
+        
+        Args:
+            key: Key identifying identical requests
+            fn: Function to run
+            
+        Returns:
+            Tuple of (result, shared) where shared is True if the result was
+            delivered to more than one caller
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+        finally:
+            with self._lock:
+                del self._calls[key]
+                shared = call.waiters > 0
+            call.done.set()
+        
+        if call.error is not None:
+            raise call.error
+        return call.result, shared
+    
+    def in_flight(self) -> int:
+        """Get the number of keys currently being fetched."""
+        with self._lock:
+            return len(self._calls)
+
+
+# Group shared by every coalescing connector in the process, so that duplicate
+# requests from different callbacks and threads are merged
+_default_group = SingleFlight()
+
+
+class CoalescingConnector(MarketDataConnector):
+    """Connector wrapper that merges identical concurrent historical data requests.
+    
+    Requests for the same (connector, symbol, date range, interval) that arrive while
+    one is already in flight wait for it instead of going upstream. Callers that
+    share a result each receive their own copy, so they can modify it freely.
+    Requests are only shared between callers of the same wrapped connector, so
+    callers that should coalesce must share it (see get_shared_connector).
+    
+    Methods the wrapped connector overrides (e.g. a batched get_latest_quotes)
+    are called on it; the generic implementations of the base class run on
+    the wrapper, so their historical data requests are coalesced as well.
+    """
+    
+    def __init__(self, connector: MarketDataConnector, group: Optional[SingleFlight] = None):
+        """Initialize the coalescing connector.
+        
+        Args:
+            connector: Connector to forward requests to
+            group: Single-flight group (if None, uses the group shared by the process)
+        """
+        super().__init__(getattr(connector, 'dtype_policy', None))
+        self.connector = connector
+        self.group = group if group is not None else _default_group
+    
+    def get_historical_data(self, symbol: str, start_date: str, end_date: str, interval: Optional[str] = None) -> pd.DataFrame:
+        """Get historical market data, sharing in-flight requests.
+        
+        Args:
+            symbol: The ticker symbol
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format
+            interval: Data interval (if None, uses the wrapped connector's default)
+            
+        Returns:
+            DataFrame with historical data
+        """
+        if interval is None:
+            interval = self._default_interval()
+        kwargs = {'interval': interval} if interval is not None else {}
+        # Only requests to this very connector are shared: connectors of the same
+        # class can differ in settings (data directory, cache, dtype policy)
+        key = (id(self.connector), getattr(self.connector, 'dtype_policy', None),
+               symbol.upper(), start_date, end_date, interval)
+        
+        data, shared = self.group.do(
+            key,
+            lambda: self.connector.get_historical_data(symbol, start_date, end_date, **kwargs)
+        )
+        return data.copy() if shared else data
+    
+    def _delegate(self, name: str) -> Optional[Callable]:
+        """Get the wrapped connector's method if it overrides the base class's."""
+        method = getattr(type(self.connector), name, None)
+        if method is None or method is getattr(MarketDataConnector, name):
+            return None
+        return getattr(self.connector, name)
+    
+    def get_historical_data_many(self, symbols: List[str], start_date: str, end_date: str,
+                                 *args, **kwargs) -> Tuple[Union[Dict[str, pd.DataFrame], pd.DataFrame], Dict[str, Exception]]:
+        """Get historical market data for many symbols (see MarketDataConnector)."""
+        method = self._delegate('get_historical_data_many')
+        if method is not None:
+            return method(symbols, start_date, end_date, *args, **kwargs)
+        return super().get_historical_data_many(symbols, start_date, end_date, *args, **kwargs)
+    
+    def get_multi_interval_data(self, symbol: str, start_date: str, end_date: str,
+                                intervals: List[str], base_interval: str) -> Dict[str, pd.DataFrame]:
+        """Get several intervals for a symbol from a single download (see MarketDataConnector)."""
+        method = self._delegate('get_multi_interval_data')
+        if method is not None:
+            return method(symbol, start_date, end_date, intervals, base_interval)
+        return super().get_multi_interval_data(symbol, start_date, end_date, intervals, base_interval)
+    
+    def get_latest_quotes(self, symbols: List[str]) -> pd.DataFrame:
+        """Get the latest available bar for many symbols (see MarketDataConnector)."""
+        method = self._delegate('get_latest_quotes')
+        if method is not None:
+            return method(symbols)
+        return super().get_latest_quotes(symbols)
+    
+    def stream_bars(self, symbols: List[str], *args, **kwargs) -> Iterator:
+        """Yield bars for many symbols as they close (see MarketDataConnector)."""
+        method = self._delegate('stream_bars')
+        if method is not None:
+            return method(symbols, *args, **kwargs)
+        return super().stream_bars(symbols, *args, **kwargs)
+    
+    def _default_interval(self) -> Optional[str]:
+        """Get the interval the wrapped connector uses when none is given."""
+        try:
+            default = inspect.signature(self.connector.get_historical_data).parameters['interval'].default
+        except (KeyError, TypeError, ValueError):
+            return None
+        return None if default is inspect.Parameter.empty else default
+    
+    def __getattr__(self, name: str) -> Any:
+        # Forward everything else (e.g. get_latest_data) to the wrapped connector
+        if name == 'connector':
+            raise AttributeError(name)
+        return getattr(self.connector, name)
+
+
+_shared_connectors: Dict[Hashable, CoalescingConnector] = {}
+_shared_connectors_lock = threading.Lock()
+
+
+def get_shared_connector(source: str = 'yahoo', **kwargs) -> CoalescingConnector:
+    """Get the coalescing connector shared by the process for a configuration.
+    
+    Callers asking for the same source and options (e.g. dashboard callbacks
+    and prediction engines) get the same connector, so their identical
+    concurrent requests share a single fetch.
+    
+    Args:
+        source: Data source ('yahoo', 'alpha_vantage' or 'local')
+        **kwargs: Additional arguments for the connector (must be hashable)
+        
+    Returns:
+        CoalescingConnector instance
+    """
+    key = (source.lower(), tuple(sorted(kwargs.items())))
+    with _shared_connectors_lock:
+        connector = _shared_connectors.get(key)
+        if connector is None:
+            connector = get_data_connector(source, coalesce=True, **kwargs)
+            _shared_connectors[key] = connector
+        return connector
@@ -0,0 +1,215 @@
+# Streaming Module
+# This module provides bar-by-bar feeds for live and simulated market data
+
+import time
+import threading
+import pandas as pd
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional
+
+# Length of each bar interval in seconds
+INTERVAL_SECONDS = {
+    '1m': 60,
+    '2m': 120,
+    '5m': 300,
+    '15m': 900,
+    '30m': 1800,
+    '60m': 3600,
+    '90m': 5400,
+    '1h': 3600,
+    '1d': 86400,
+    'daily': 86400,
+    '5d': 5 * 86400,
+    '1wk': 7 * 86400,
+    'weekly': 7 * 86400
+}
+
+
+class Bar(NamedTuple):
+    """A single closed OHLCV bar."""
+    symbol: str
+    timestamp: pd.Timestamp
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+
+def _date_column(df: pd.DataFrame) -> str:
+    """Find the timestamp column of a connector frame."""
+    return next((col for col in df.columns if str(col).lower() in ('date', 'datetime')), df.columns[0])
+
+
+def _frame_to_bars(symbol: str, df: pd.DataFrame) -> List[Bar]:
+    """Convert a connector frame to a list of bars."""
+    timestamps = pd.to_datetime(df[_date_column(df)])
+    columns = [df[col].to_numpy() for col in ('open', 'high', 'low', 'close', 'volume')]
+    return [
+        Bar(symbol, timestamp, float(o), float(h), float(l), float(c), float(v))
+        for timestamp, o, h, l, c, v in zip(timestamps, *columns)
+    ]
+
+
+def _to_utc(timestamp: pd.Timestamp) -> pd.Timestamp:
+    """Convert a timestamp to UTC, treating naive timestamps as UTC."""
+    return timestamp.tz_localize('UTC') if timestamp.tzinfo is None else timestamp.tz_convert('UTC')
+
+
+def stream_bars(connector,
+                symbols: List[str],
+                interval: str = '1m',
+                poll_seconds: Optional[float] = None,
+                stop_event: Optional[threading.Event] = None,
+                clock: Callable[[], pd.Timestamp] = lambda: pd.Timestamp.now(tz='UTC'),
+                sleep: Optional[Callable[[float], None]] = None) -> Iterator[Bar]:
+    """Yield bars for many symbols as they close, by polling a connector.
+
+    The first poll that returns bars for a symbol only records its latest closed
+    bar; after that every newly closed bar is yielded once, ordered by timestamp.
+    Symbols already seen are fetched only from shortly before their last bar,
+    rather than over the whole lookback.
+
+    Args:
+        connector: MarketDataConnector to poll
+        symbols: List of ticker symbols
+        interval: Bar interval (e.g. '1m', '1h', '1d')
+        poll_seconds: Seconds between polls (if None, a quarter of the bar length,
+            at least 5 seconds)
+        stop_event: Event that ends the stream when set
+        clock: Function returning the current UTC time
+        sleep: Function used to wait between polls (if None, the wait ends early
+            when stop_event is set)
+
+    Yields:
+        Bar objects
+    """
+    if interval not in INTERVAL_SECONDS:
+        raise ValueError(f"Unsupported interval: {interval}")
+
+    bar_length = pd.Timedelta(seconds=INTERVAL_SECONDS[interval])
+    if poll_seconds is None:
+        poll_seconds = max(5.0, INTERVAL_SECONDS[interval] / 4)
+    lookback = max(pd.Timedelta(days=5), bar_length * 3)
+
+    last_seen: Dict[str, pd.Timestamp] = {}
+
+    while stop_event is None or not stop_event.is_set():
+        now = clock()
+        end_date = (now + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
+
+        # Symbols without bars yet are fetched over the whole lookback and only
+        # seeded; the others from a bar (and a day, since start dates are whole
+        # days in the exchange's time zone) before the earliest last bar
+        unseen = [symbol for symbol in symbols if symbol not in last_seen]
+        seen = [symbol for symbol in symbols if symbol in last_seen]
+        requests = []
+        if unseen:
+            requests.append((unseen, now - lookback))
+        if seen:
+            since = min(last_seen[symbol] for symbol in seen) - bar_length - pd.Timedelta(days=1)
+            requests.append((seen, max(since, now - lookback)))
+
+        new_bars = []
+        for group, start in requests:
+            results, errors = connector.get_historical_data_many(group, start.strftime('%Y-%m-%d'), end_date,
+                                                                 interval=interval)
+            for symbol, error in errors.items():
+                print(f"Error polling bars for {symbol}: {error}")
+
+            for symbol, df in results.items():
+                for bar in _frame_to_bars(symbol, df):
+                    bar_time = _to_utc(bar.timestamp)
+                    # Skip bars that are still forming or were already delivered
+                    if bar_time + bar_length > now:
+                        continue
+                    if symbol in last_seen and bar_time <= last_seen[symbol]:
+                        continue
+                    new_bars.append((bar_time, bar))
+
+        new_bars.sort(key=lambda item: item[0])
+        for bar_time, bar in new_bars:
+            last_seen[bar.symbol] = max(bar_time, last_seen.get(bar.symbol, bar_time))
+            if bar.symbol not in unseen:
+                yield bar
+
+        if sleep is not None:
+            sleep(poll_seconds)
+        elif stop_event is not None:
+            stop_event.wait(poll_seconds)
+        else:
+            time.sleep(poll_seconds)
+
+
+class SimulatedBarFeed:
+    """Deterministic replay of historical bars as a live feed.
+
+    Bars of all symbols are merged in timestamp order (ties broken by the order
+    of the symbols) and yielded with the original spacing divided by `speed`.
+    Replaying the same data always produces the same sequence.
+    """
+
+    def __init__(self,
+                 data: Dict[str, pd.DataFrame],
+                 speed: Optional[float] = None,
+                 sleep: Callable[[float], None] = time.sleep):
+        """Initialize the simulated feed.
+
+        Args:
+            data: Dictionary mapping symbols to DataFrames with OHLCV data
+            speed: Replay speed relative to real time (e.g. 3600 replays an hour
+                per second); if None, bars are yielded as fast as possible
+            sleep: Function used to wait between bars
+        """
+        self.data = data
+        self.speed = speed
+        self.sleep = sleep
+
+    @classmethod
+    def from_connector(cls,
+                       connector,
+                       symbols: List[str],
+                       start_date: str,
+                       end_date: str,
+                       interval: str = '1d',
+                       speed: Optional[float] = None) -> 'SimulatedBarFeed':
+        """Create a feed that replays history loaded from a connector.
+
+        Pairing this with the 'local' connector or a cached Yahoo connector
+        replays bars without touching the network.
+
+        Args:
+            connector: MarketDataConnector to load history from
+            symbols: List of ticker symbols
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format
+            interval: Bar interval
+            speed: Replay speed relative to real time
+
+        Returns:
+            SimulatedBarFeed instance
+        """
+        results, errors = connector.get_historical_data_many(symbols, start_date, end_date, interval=interval)
+        for symbol, error in errors.items():
+            print(f"Error loading bars for {symbol}: {error}")
+        return cls(results, speed=speed)
+
+    def bars(self) -> List[Bar]:
+        """Get all bars in replay order.
+
+        Returns:
+            List of bars
+        """
+        bars = []
+        for order, (symbol, df) in enumerate(self.data.items()):
+            bars.extend((_to_utc(bar.timestamp), order, bar) for bar in _frame_to_bars(symbol, df))
+        bars.sort(key=lambda item: (item[0], item[1]))
+        return [bar for _, _, bar in bars]
+
+    def __iter__(self) -> Iterator[Bar]:
+        previous_time = None
+        for bar in self.bars():
+            bar_time = _to_utc(bar.timestamp)
+            if self.speed and previous_time is not None and bar_time > previous_time:
+                self.sleep((bar_time - previous_time).total_seconds() / self.speed)
+            previous_time = bar_time
+            yield bar
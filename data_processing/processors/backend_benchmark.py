@@ -0,0 +1,105 @@
+# Indicator Backend Benchmark Module
+# This module benchmarks the NumPy and TA-Lib indicator backends
+#
+# Usage: python -m data_processing.processors.backend_benchmark [--repeat N]
+#
+# Parity between the backends is checked by tests/test_indicator_backends.py
+
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, List
+
+from data_processing.processors.indicators import ALL_FEATURES, compute_features, get_backend
+
+
+def make_series(periods: int, freq: str, annual_volatility: float, seed: int = 0) -> pd.DataFrame:
+    """Generate a synthetic OHLCV series from a geometric random walk.
+    
+    Args:
+        periods: Number of bars
+        freq: Bar frequency (pandas offset alias)
+        annual_volatility: Annualized volatility of the close
+        seed: Random seed
+    
+    Returns:
+        DataFrame with open, high, low, close and volume columns
+    """
+    rng = np.random.default_rng(seed)
+    bars_per_year = 252 if freq in ('B', 'D') else 252 * 7
+    scale = annual_volatility / np.sqrt(bars_per_year)
+    
+    close = 100 * np.exp(np.cumsum(rng.normal(0, scale, periods)))
+    open_ = close * np.exp(rng.normal(0, scale / 2, periods))
+    high = np.maximum(open_, close) * np.exp(np.abs(rng.normal(0, scale / 2, periods)))
+    low = np.minimum(open_, close) * np.exp(-np.abs(rng.normal(0, scale / 2, periods)))
+    volume = rng.integers(1e5, 1e7, periods).astype(np.float64)
+    
+    index = pd.date_range('2015-01-01', periods=periods, freq=freq)
+    return pd.DataFrame({'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume}, index=index)
+
+
+def datasets() -> Dict[str, pd.DataFrame]:
+    """Get the benchmark series: 10 years of daily and 2 years of hourly bars."""
+    return {
+        'daily_10y': make_series(252 * 10, 'B', 0.25, seed=1),
+        'hourly_2y': make_series(252 * 7 * 2, 'h', 0.25, seed=2),
+    }
+
+
+def _best_time(function: Callable, repeat: int) -> float:
+    """Get the fastest of several timed runs, in milliseconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def benchmark(data: pd.DataFrame, backends: List[str], repeat: int = 5) -> Dict[str, float]:
+    """Time the full feature graph on each backend.
+    
+    Args:
+        data: DataFrame with OHLCV data
+        backends: Backend names to time
+        repeat: Number of timed runs (the best is reported)
+    
+    Returns:
+        Dictionary mapping each backend to its best time in milliseconds
+    """
+    return {
+        backend: _best_time(lambda: compute_features(data, ALL_FEATURES, backend=backend), repeat)
+        for backend in backends
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    """Time the feature graph on every installed backend.
+    
+    Returns:
+        Exit code (always 0)
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the indicator backends")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per backend")
+    args = parser.parse_args(argv)
+    
+    try:
+        get_backend('talib')
+        backends = ['talib', 'numpy']
+    except ImportError:
+        print("TA-Lib is not installed; benchmarking the NumPy backend only")
+        backends = ['numpy']
+    
+    for name, data in datasets().items():
+        print(f"\n{name}: {len(data)} bars")
+        for backend, elapsed in benchmark(data, backends, args.repeat).items():
+            print(f"  {backend:>6}: {elapsed:8.2f} ms for {len(ALL_FEATURES)} features")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+# Columnar Feature Builder Module
+# This module builds feature frames in a single preallocated float array
+
+import numpy as np
+import pandas as pd
+from typing import Iterable, Optional, Union
+
+ArrayLike = Union[np.ndarray, pd.Series, float]
+
+
+def _forward_fill(values: np.ndarray) -> None:
+    """Forward-fill NaNs down each column of a 2-D array in place."""
+    for i in np.flatnonzero(np.isnan(values).any(axis=0)):
+        column = values[:, i]
+        missing = np.isnan(column)
+        # Leading NaNs (indicator warm-up) have nothing to fill from
+        first = missing.argmin()
+        if not missing[first:].any():
+            continue
+        
+        rows = np.where(missing, 0, np.arange(len(column)))
+        np.maximum.accumulate(rows, out=rows)
+        column[:] = column[rows]
+
+
+class FeatureMatrix:
+    """Feature frame under construction, backed by one float64 array.
+    
+    Columns are written into a preallocated column-major array, so each
+    column is contiguous and the finished frame wraps the array as a single
+    pandas block without copying or fragmenting.
+    """
+    
+    def __init__(self, index: pd.Index, columns: Iterable[str]):
+        """Allocate the matrix.
+        
+        Args:
+            index: Row index of the frame
+            columns: Column names, in output order
+        """
+        self.index = index
+        self.columns = list(columns)
+        self._positions = {column: i for i, column in enumerate(self.columns)}
+        self.values = np.full((len(index), len(self.columns)), np.nan, dtype=np.float64, order='F')
+    
+    def __setitem__(self, column: str, values: ArrayLike) -> None:
+        """Write a column; Series are aligned to the matrix index first."""
+        if isinstance(values, pd.Series):
+            if not values.index.equals(self.index):
+                values = values.reindex(self.index)
+            values = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        self.values[:, self._positions[column]] = values
+    
+    def __getitem__(self, column: str) -> np.ndarray:
+        """Get a view of a column."""
+        return self.values[:, self._positions[column]]
+    
+    def fill_forward(self) -> None:
+        """Fill NaNs from the previous row (like DataFrame.ffill)."""
+        _forward_fill(self.values)
+    
+    def fill_backward(self) -> None:
+        """Fill NaNs from the next row (like DataFrame.bfill)."""
+        _forward_fill(self.values[::-1])
+    
+    def fill(self, value: float) -> None:
+        """Replace remaining NaNs with a constant."""
+        np.nan_to_num(self.values, copy=False, nan=value, posinf=np.inf, neginf=-np.inf)
+    
+    def complete_rows(self) -> np.ndarray:
+        """Get a mask of the rows without any NaN."""
+        return ~np.isnan(self.values).any(axis=1)
+    
+    def to_frame(self, rows: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """Wrap the matrix as a DataFrame.
+        
+        Args:
+            rows: Boolean mask of rows to keep (if None, all rows without copying)
+        
+        Returns:
+            DataFrame with the matrix columns
+        """
+        if rows is None or rows.all():
+            return pd.DataFrame(self.values, index=self.index, columns=self.columns, copy=False)
+        return pd.DataFrame(np.asfortranarray(self.values[rows]), index=self.index[rows],
+                            columns=self.columns, copy=False)
@@ -0,0 +1,166 @@
+# Feature Cache Module
+# This module caches computed feature frames by the content of their input
+
+import os
+import json
+import pickle
+import hashlib
+import threading
+import pandas as pd
+from typing import Any, Callable, Optional
+
+from data_processing.connectors.memory_cache import TTLCache
+
+# Bump when a feature builder changes its output, so stale disk entries are ignored
+CACHE_VERSION = 2
+
+
+def _copy(value: Any) -> Any:
+    """Copy frames (or tuples of frames) so callers can modify them freely."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy()
+    if isinstance(value, tuple):
+        return tuple(_copy(item) for item in value)
+    return value
+
+
+class FeatureCache:
+    """Content-addressed cache for feature frames.
+    
+    Entries are keyed by a hash of the input data (values, index, column names
+    and dtypes) together with the feature builder's name and configuration, so
+    the same frame passed through the same builder is only processed once. A
+    bounded in-memory LRU tier is backed by an optional on-disk tier that
+    survives restarts.
+    """
+    
+    def __init__(self, max_entries: int = 64, cache_dir: Optional[str] = None):
+        """Initialize the feature cache.
+        
+        Args:
+            max_entries: Maximum number of results kept in memory
+            cache_dir: Directory for the on-disk tier (if None, only memory is used)
+        """
+        self.memory = TTLCache(ttl=float('inf'), max_entries=max_entries)
+        self.cache_dir = cache_dir
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+    
+    def make_key(self, data: pd.DataFrame, builder: str, **config) -> str:
+        """Build the cache key for a builder applied to a frame.
+        
+        Args:
+            data: Input DataFrame
+            builder: Name of the feature builder
+            **config: Builder settings that change its output
+        
+        Returns:
+            Hex digest identifying the result
+        """
+        digest = hashlib.sha256()
+        digest.update(json.dumps(
+            {'version': CACHE_VERSION, 'builder': builder, 'config': config,
+             'columns': [str(col) for col in data.columns],
+             'dtypes': [str(dtype) for dtype in data.dtypes]},
+            sort_keys=True, default=str
+        ).encode())
+        digest.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> Any:
+        """Get a cached result.
+        
+        Args:
+            key: Cache key from make_key()
+        
+        Returns:
+            Copy of the cached result, or None on a miss
+        """
+        value = self.memory.get(key)
+        if value is None and self.cache_dir:
+            value = self._read(key)
+            if value is not None:
+                self.memory.set(key, value)
+        return _copy(value)
+    
+    def set(self, key: str, value: Any) -> None:
+        """Store a result in memory and, if configured, on disk.
+        
+        Args:
+            key: Cache key from make_key()
+            value: Result to store
+        """
+        value = _copy(value)
+        self.memory.set(key, value)
+        if self.cache_dir:
+            self._write(key, value)
+    
+    def get_or_compute(self, data: pd.DataFrame, builder: str, compute: Callable[[], Any], **config) -> Any:
+        """Get a cached result, computing and storing it on a miss.
+        
+        Args:
+            data: Input DataFrame
+            builder: Name of the feature builder
+            compute: Function returning the result on a miss
+            **config: Builder settings that change its output
+        
+        Returns:
+            Cached or newly computed result
+        """
+        key = self.make_key(data, builder, **config)
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.set(key, value)
+        return value
+    
+    def clear(self) -> None:
+        """Remove all cached results from memory and disk."""
+        self.memory = TTLCache(ttl=float('inf'), max_entries=self.memory.max_entries)
+        if self.cache_dir:
+            for filename in os.listdir(self.cache_dir):
+                if filename.endswith('.pkl'):
+                    os.remove(os.path.join(self.cache_dir, filename))
+    
+    def _path(self, key: str) -> str:
+        """Get the disk path of a cache entry."""
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+    
+    def _read(self, key: str) -> Any:
+        """Read an entry from the disk tier."""
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            print(f"Error reading feature cache entry {key}: {e}")
+            return None
+    
+    def _write(self, key: str, value: Any) -> None:
+        """Atomically write an entry to the disk tier."""
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_feature_cache() -> FeatureCache:
+    """Get the feature cache shared by the process.
+    
+    The on-disk tier is enabled by setting the FEATURE_CACHE_DIR environment variable.
+    
+    Returns:
+        FeatureCache instance
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = FeatureCache(cache_dir=os.environ.get('FEATURE_CACHE_DIR'))
+        return _default_cache
@@ -1,10 +1,16 @@
 # Feature Engineering Module
 # This module transforms raw market data into features for the trading agent
 
+import warnings
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Optional, Union
-import talib as ta
+from typing import Any, Dict, List, Tuple, Optional, Union
+
+from data_processing.processors.columnar import FeatureMatrix
+from data_processing.processors.feature_cache import FeatureCache
+from data_processing.processors.incremental import IncrementalFeatureState
+from data_processing.processors.indicators import ALL_FEATURES, PRICE_FEATURES, compute_features, resolve, select_backend
+from data_processing.processors.panel import compute_panel_features
 
 class FeatureEngineer:
     """Feature engineering for market data.
@@ -13,152 +19,223 @@ class FeatureEngineer:
     by the trading agent, including technical indicators and other derived features.
     """
     
-    def __init__(self, include_indicators: bool = True):
+    def __init__(self,
+                 include_indicators: bool = True,
+                 cache: Optional[FeatureCache] = None,
+                 features: Optional[List[str]] = None,
+                 backend: Optional[str] = None):
         """Initialize the feature engineer.
         
         Args:
             include_indicators: Whether to include technical indicators
+            cache: Cache for processed frames (if None, features are always recomputed)
+            features: Features to compute (if None, all price features plus all
+                technical indicators when include_indicators is True); indicators
+                that no requested feature depends on are not computed
+            backend: Indicator backend, 'talib' or 'numpy' (if None, the
+                INDICATOR_BACKEND environment variable or TA-Lib when installed)
         """
         self.include_indicators = include_indicators
+        self.cache = cache
+        if features is None:
+            features = ALL_FEATURES if include_indicators else PRICE_FEATURES
+        self.features = list(features)
+        self.backend = select_backend(backend)
+        
+        # Fail early on unknown feature names
+        resolve(self.features)
+        
+        # Bars seen by process()/update(), kept until the incremental state is built
+        self._history = None
+        self._state = None
     
     def process(self, data: pd.DataFrame) -> pd.DataFrame:
         """Process raw market data into features.
         
+        The data also becomes the history that update() appends to.
+        
         Args:
             data: DataFrame with OHLCV data
             
         Returns:
             DataFrame with added features
         """
-        # Make a copy to avoid modifying the original data
-        df = data.copy()
-        
         # Ensure we have the required columns
         required_columns = ['open', 'high', 'low', 'close', 'volume']
         for col in required_columns:
-            if col not in df.columns:
+            if col not in data.columns:
                 raise ValueError(f"Required column {col} not found in data")
         
-        # Add basic price features
-        df = self._add_price_features(df)
+        if self.cache is not None:
+            df = self.cache.get_or_compute(data, 'FeatureEngineer.process', lambda: self._build_features(data),
+                                           features=self.features, backend=self.backend)
+        else:
+            df = self._build_features(data)
+        
+        self._history = data[required_columns]
+        self._state = None
+        
+        return df
+    
+    def _build_features(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Compute the selected features for a frame of OHLCV data.
+        
+        The numeric input columns and every feature are written into one
+        preallocated float array, which is filled and wrapped as a DataFrame
+        once, instead of growing the frame a column at a time.
+        
+        Args:
+            data: DataFrame with OHLCV data
+            
+        Returns:
+            DataFrame with added features
+        """
+        # Features replace any existing columns of the same name
+        passthrough = [col for col in data.columns if col not in self.features]
+        numeric = [col for col in passthrough if pd.api.types.is_numeric_dtype(data[col])]
+        other = [col for col in passthrough if col not in numeric]
         
-        # Add technical indicators if requested
-        if self.include_indicators:
-            df = self._add_technical_indicators(df)
+        matrix = FeatureMatrix(data.index, numeric + self.features)
+        for col in numeric:
+            matrix[col] = data[col]
+        for feature, values in compute_features(data, self.features, backend=self.backend).items():
+            matrix[feature] = values
         
         # Fill any NaN values that might have been introduced
-        df.fillna(method='ffill', inplace=True)
-        df.fillna(method='bfill', inplace=True)
+        matrix.fill_forward()
+        matrix.fill_backward()
         
         # Drop any remaining NaN rows
-        df.dropna(inplace=True)
-        
-        return df
+        rows = matrix.complete_rows()
+        if not other:
+            return matrix.to_frame(rows)
+        
+        # Non-numeric columns (dates, labels) are filled alongside the matrix
+        extra = data[other].ffill().bfill()
+        rows &= extra.notna().all(axis=1).to_numpy()
+        df = pd.concat([extra, matrix.to_frame()], axis=1)[passthrough + self.features]
+        return df[rows]
     
-    def _add_price_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Add basic price-derived features.
+    def process_panel(self, fields: Dict[str, Union[np.ndarray, pd.DataFrame]]) -> Dict[str, Union[np.ndarray, pd.DataFrame]]:
+        """Process a panel of many symbols into features in vectorized passes.
+        
+        Each field is a (time x symbol) array, so the cost grows with the
+        number of bars rather than with a Python loop over symbols. Unlike
+        process(), warm-up rows are left as NaN instead of being filled or
+        dropped, since symbols may start at different times.
         
         Args:
-            df: DataFrame with OHLCV data
+            fields: Dictionary mapping 'open', 'high', 'low', 'close' and 'volume'
+                to (time x symbol) arrays or DataFrames (see panel.pivot_panel)
             
         Returns:
-            DataFrame with added price features
+            Dictionary mapping each feature to a (time x symbol) array, or a
+            DataFrame when DataFrames were given
         """
-        # Calculate returns
-        df['daily_return'] = df['close'].pct_change()
-        df['log_return'] = np.log(df['close'] / df['close'].shift(1))
+        for col in ['open', 'high', 'low', 'close', 'volume']:
+            if col not in fields:
+                raise ValueError(f"Required field {col} not found in panel")
         
-        # Calculate price ranges
-        df['high_low_range'] = df['high'] - df['low']
-        df['close_open_range'] = df['close'] - df['open']
+        return compute_panel_features(fields, self.features)
+    
+    def update(self, new_data: pd.DataFrame) -> pd.DataFrame:
+        """Compute features for bars appended to the data last passed to process().
         
-        # Normalized price
-        df['normalized_price'] = df['close'] / df['close'].iloc[0] if len(df) > 0 else 1.0
+        Indicator state (moving-average windows, EMA and Wilder smoothing, OBV
+        running total) is built from the history on the first call and then
+        carried forward, so each call only costs the new bars. The rows match
+        what process() returns for the same bars over the full history.
         
-        # Volatility (rolling standard deviation of returns)
-        df['volatility_5d'] = df['daily_return'].rolling(window=5).std()
-        df['volatility_20d'] = df['daily_return'].rolling(window=20).std()
+        Args:
+            new_data: DataFrame with OHLCV data for the bars after the history
+            
+        Returns:
+            DataFrame with added features for the new bars
+        """
+        if self._history is None and self._state is None:
+            raise ValueError("No history to update. Call process() first.")
         
-        return df
+        required_columns = ['open', 'high', 'low', 'close', 'volume']
+        for col in required_columns:
+            if col not in new_data.columns:
+                raise ValueError(f"Required column {col} not found in data")
+        
+        if self._state is None:
+            state = IncrementalFeatureState(features=self.features)
+            state.update_frame(self._history)
+            if not state.is_warm:
+                # Until every indicator has a value, process() back-fills the early
+                # rows from later bars, so the new rows depend on the whole history
+                return self._update_from_history(new_data)
+            self._state = state
+            self._history = None
+        
+        features = self._state.update_frame(new_data)
+        return pd.concat([new_data.drop(columns=features.columns, errors='ignore'), features], axis=1)
     
-    def _add_technical_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Add technical indicators as features.
+    def _update_from_history(self, new_data: pd.DataFrame) -> pd.DataFrame:
+        """Append bars to the history and recompute features over all of it.
         
         Args:
-            df: DataFrame with OHLCV data
+            new_data: DataFrame with OHLCV data for the bars after the history
             
         Returns:
-            DataFrame with added technical indicators
+            DataFrame with added features for the new bars (empty while the
+            history is too short for every indicator)
         """
-        # Moving averages
-        df['sma_5'] = ta.SMA(df['close'], timeperiod=5)
-        df['sma_20'] = ta.SMA(df['close'], timeperiod=20)
-        df['sma_50'] = ta.SMA(df['close'], timeperiod=50)
-        df['sma_200'] = ta.SMA(df['close'], timeperiod=200)
-        
-        # Exponential moving averages
-        df['ema_5'] = ta.EMA(df['close'], timeperiod=5)
-        df['ema_20'] = ta.EMA(df['close'], timeperiod=20)
-        
-        # MACD
-        macd, macd_signal, macd_hist = ta.MACD(
-            df['close'], fastperiod=12, slowperiod=26, signalperiod=9
-        )
-        df['macd'] = macd
-        df['macd_signal'] = macd_signal
-        df['macd_hist'] = macd_hist
-        
-        # RSI
-        df['rsi_14'] = ta.RSI(df['close'], timeperiod=14)
-        
-        # Bollinger Bands
-        upper, middle, lower = ta.BBANDS(
-            df['close'], timeperiod=20, nbdevup=2, nbdevdn=2, matype=0
-        )
-        df['bb_upper'] = upper
-        df['bb_middle'] = middle
-        df['bb_lower'] = lower
-        
-        # Stochastic Oscillator
-        slowk, slowd = ta.STOCH(
-            df['high'], df['low'], df['close'],
-            fastk_period=5, slowk_period=3, slowk_matype=0,
-            slowd_period=3, slowd_matype=0
-        )
-        df['stoch_k'] = slowk
-        df['stoch_d'] = slowd
-        
-        # Average True Range (ATR)
-        df['atr'] = ta.ATR(df['high'], df['low'], df['close'], timeperiod=14)
-        
-        # On-Balance Volume (OBV)
-        df['obv'] = ta.OBV(df['close'], df['volume'])
-        
-        # Commodity Channel Index (CCI)
-        df['cci'] = ta.CCI(df['high'], df['low'], df['close'], timeperiod=14)
-        
-        # Relative price position
-        df['price_sma_ratio_20'] = df['close'] / df['sma_20']
-        df['price_sma_ratio_50'] = df['close'] / df['sma_50']
-        
-        # Moving average crossovers
-        df['sma_5_20_cross'] = (df['sma_5'] > df['sma_20']).astype(int)
-        df['sma_20_50_cross'] = (df['sma_20'] > df['sma_50']).astype(int)
+        required_columns = ['open', 'high', 'low', 'close', 'volume']
+        history = pd.concat([self._history, new_data[required_columns]], ignore_index=True)
+        processed = self.process(history)
         
-        return df
+        feature_columns = processed.columns.difference(required_columns, sort=False)
+        
+        if len(processed) < len(history):
+            # process() drops every row while any indicator is still undefined
+            return new_data.iloc[:0].reindex(columns=new_data.columns.union(feature_columns, sort=False))
+        
+        features = pd.DataFrame(processed[feature_columns].to_numpy()[-len(new_data):],
+                                index=new_data.index, columns=feature_columns)
+        return pd.concat([new_data.drop(columns=feature_columns, errors='ignore'), features], axis=1)
 
 
 class DataNormalizer:
-    """Normalize data for machine learning models."""
+    """Normalize data for machine learning models.
     
-    def __init__(self, method: str = 'minmax'):
+    Statistics can be fitted in one pass with fit() or kept current on
+    streaming data with partial_fit(), which merges each batch into running
+    counts, means and variances (Welford), minimums and maximums, and a
+    reservoir sample from which the 'robust' quantiles are estimated.
+    """
+    
+    def __init__(self, method: str = 'minmax', sample_size: int = 10000, random_state: Optional[int] = None):
         """Initialize the data normalizer.
         
         Args:
             method: Normalization method ('minmax', 'zscore', or 'robust')
+            sample_size: Rows kept in the reservoir sample used to estimate
+                quantiles during partial_fit() ('robust' only)
+            random_state: Seed for the reservoir sample
         """
         self.method = method
+        self.sample_size = sample_size
         self.stats = {}
+        self._rng = np.random.default_rng(random_state)
+        self._reset()
+    
+    def _reset(self) -> None:
+        """Clear the running statistics."""
+        self.columns: List = []
+        self._positions: Dict = {}
+        self._count = None
+        self._mean = None
+        self._m2 = None
+        self._min = None
+        self._max = None
+        self._sample = None
+        self._seen = 0
+        self._offset = None
+        self._scale = None
+        self._active = None
     
     def fit(self, data: pd.DataFrame) -> None:
         """Fit the normalizer to the data.
@@ -166,58 +243,207 @@ class DataNormalizer:
         Args:
             data: DataFrame to fit the normalizer to
         """
-        self.stats = {}
+        self._reset()
+        values = self._start(data)
+        self._accumulate(values)
         
-        for column in data.columns:
-            if self.method == 'minmax':
-                self.stats[column] = {
-                    'min': data[column].min(),
-                    'max': data[column].max()
-                }
-            elif self.method == 'zscore':
-                self.stats[column] = {
-                    'mean': data[column].mean(),
-                    'std': data[column].std()
-                }
-            elif self.method == 'robust':
-                self.stats[column] = {
-                    'median': data[column].median(),
-                    'iqr': data[column].quantile(0.75) - data[column].quantile(0.25)
-                }
+        # A single batch gets exact quantiles rather than reservoir estimates
+        self._refresh(values)
     
-    def transform(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Transform the data using the fitted normalizer.
+    def partial_fit(self, data: pd.DataFrame) -> None:
+        """Update the fitted statistics with a new batch of rows.
+        
+        Means, deviations, minimums and maximums are exactly those of all rows
+        seen so far; 'robust' medians and interquartile ranges are estimated
+        from a uniform sample of them.
         
         Args:
-            data: DataFrame to normalize
+            data: DataFrame with (at least) the columns seen by earlier fits
+        """
+        if self._count is None:
+            values = self._start(data)
+        else:
+            missing = [column for column in self.columns if column not in data.columns]
+            if missing:
+                raise ValueError(f"Columns {missing} were fitted but not found in data")
+            values = data[self.columns].to_numpy(dtype=np.float64)
+        
+        self._accumulate(values)
+        self._refresh()
+    
+    def _start(self, data: pd.DataFrame) -> np.ndarray:
+        """Initialize empty running statistics for the numeric columns of data."""
+        self.columns = list(data.select_dtypes(include=['number', 'bool']).columns)
+        self._positions = {column: i for i, column in enumerate(self.columns)}
+        
+        width = len(self.columns)
+        self._count = np.zeros(width)
+        self._mean = np.zeros(width)
+        self._m2 = np.zeros(width)
+        self._min = np.full(width, np.nan)
+        self._max = np.full(width, np.nan)
+        self._sample = np.empty((0, width))
+        self._seen = 0
+        return data[self.columns].to_numpy(dtype=np.float64)
+    
+    def _accumulate(self, values: np.ndarray) -> None:
+        """Merge a batch of rows into the running statistics (missing values are skipped)."""
+        if len(values) == 0:
+            return
+        
+        valid = ~np.isnan(values)
+        count = valid.sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(count > 0, np.where(valid, values, 0.0).sum(axis=0) / count, 0.0)
+            m2 = np.where(valid, (values - mean) ** 2, 0.0).sum(axis=0)
             
+            # Combine the batch with the running moments (Chan et al.'s pairwise Welford update)
+            total = self._count + count
+            delta = mean - self._mean
+            share = np.where(total > 0, count / total, 0.0)
+            self._mean = self._mean + delta * share
+            self._m2 = self._m2 + m2 + delta * delta * self._count * share
+            self._count = total
+        
+        self._min = np.fmin(self._min, np.fmin.reduce(values, axis=0))
+        self._max = np.fmax(self._max, np.fmax.reduce(values, axis=0))
+        
+        if self.method == 'robust':
+            self._sample_rows(values)
+    
+    def _sample_rows(self, values: np.ndarray) -> None:
+        """Add a batch of rows to the reservoir sample (Vitter's algorithm R)."""
+        room = max(self.sample_size - len(self._sample), 0)
+        if room:
+            self._sample = np.concatenate([self._sample, values[:room]])
+        
+        rest = values[room:]
+        if len(rest):
+            # Row i of the stream replaces a random slot with probability sample_size / (i + 1)
+            slots = self._rng.integers(0, self._seen + room + np.arange(len(rest)) + 1)
+            keep = slots < self.sample_size
+            self._sample[slots[keep]] = rest[keep]
+        self._seen += len(values)
+    
+    def _refresh(self, values: Optional[np.ndarray] = None) -> None:
+        """Derive the normalization statistics from the running state.
+        
+        Args:
+            values: Every fitted row, for exact quantiles (if None, the reservoir
+                sample is used)
+        """
+        if self.method == 'minmax':
+            offset, scale = self._min, self._max - self._min
+            stats = {'min': self._min, 'max': self._max}
+        elif self.method == 'zscore':
+            with np.errstate(invalid='ignore', divide='ignore'):
+                std = np.where(self._count > 1, np.sqrt(self._m2 / (self._count - 1)), np.nan)
+            offset, scale = self._mean, std
+            stats = {'mean': self._mean, 'std': std}
+        elif self.method == 'robust':
+            source = values if values is not None else self._sample
+            with warnings.catch_warnings():
+                # Columns without any value have undefined quantiles
+                warnings.simplefilter('ignore', RuntimeWarning)
+                if len(source):
+                    lower, median, upper = np.nanquantile(source, [0.25, 0.5, 0.75], axis=0)
+                else:
+                    lower = median = upper = np.full(len(self.columns), np.nan)
+            offset, scale = median, upper - lower
+            stats = {'median': median, 'iqr': scale}
+        else:
+            self.stats = {}
+            return
+        
+        self._set_scaling(offset, scale)
+        self.stats = {
+            column: {name: float(stat[i]) for name, stat in stats.items()}
+            for i, column in enumerate(self.columns)
+        }
+    
+    def _set_scaling(self, offset: np.ndarray, scale: np.ndarray) -> None:
+        """Set the per-column offset and scale applied by transform()."""
+        self._offset = np.asarray(offset, dtype=np.float64)
+        # Columns without spread (or without values) are left unscaled
+        with np.errstate(invalid='ignore'):
+            self._active = np.asarray(scale, dtype=np.float64) > 0
+        self._scale = np.where(self._active, scale, 1.0)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Export the fitted state as plain Python values (e.g. for JSON).
+        
+        The reservoir sample is not included, so after from_dict() the
+        'robust' estimates of later partial_fit() calls start from new rows.
+        
         Returns:
-            Normalized DataFrame
+            Dictionary accepted by from_dict()
         """
         if not self.stats:
             raise ValueError("Normalizer has not been fitted. Call fit() first.")
         
-        df = data.copy()
-        
-        for column in df.columns:
-            if column in self.stats:
-                if self.method == 'minmax':
-                    min_val = self.stats[column]['min']
-                    max_val = self.stats[column]['max']
-                    if max_val > min_val:  # Avoid division by zero
-                        df[column] = (df[column] - min_val) / (max_val - min_val)
-                elif self.method == 'zscore':
-                    mean = self.stats[column]['mean']
-                    std = self.stats[column]['std']
-                    if std > 0:  # Avoid division by zero
-                        df[column] = (df[column] - mean) / std
-                elif self.method == 'robust':
-                    median = self.stats[column]['median']
-                    iqr = self.stats[column]['iqr']
-                    if iqr > 0:  # Avoid division by zero
-                        df[column] = (df[column] - median) / iqr
+        return {
+            'method': self.method,
+            'sample_size': self.sample_size,
+            'columns': list(self.columns),
+            'stats': self.stats,
+            'offset': self._offset.tolist(),
+            'scale': np.where(self._active, self._scale, 0.0).tolist(),
+            'count': self._count.tolist(),
+            'mean': self._mean.tolist(),
+            'm2': self._m2.tolist(),
+            'min': self._min.tolist(),
+            'max': self._max.tolist(),
+        }
+    
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> 'DataNormalizer':
+        """Rebuild a fitted normalizer from to_dict() output.
         
-        return df
+        Args:
+            state: Dictionary from to_dict()
+        
+        Returns:
+            Fitted DataNormalizer
+        """
+        normalizer = cls(method=state['method'], sample_size=state.get('sample_size', 10000))
+        normalizer.columns = list(state['columns'])
+        normalizer._positions = {column: i for i, column in enumerate(normalizer.columns)}
+        for name in ('count', 'mean', 'm2', 'min', 'max'):
+            setattr(normalizer, f"_{name}", np.asarray(state[name], dtype=np.float64))
+        normalizer._sample = np.empty((0, len(normalizer.columns)))
+        normalizer._set_scaling(state['offset'], state['scale'])
+        normalizer.stats = {column: dict(stats) for column, stats in state['stats'].items()}
+        return normalizer
+    
+    def _scaled_columns(self, data: pd.DataFrame) -> Tuple[List, np.ndarray]:
+        """Get the columns of data that are scaled, and their positions in the fitted statistics."""
+        if not self.stats:
+            raise ValueError("Normalizer has not been fitted. Call fit() first.")
+        
+        columns = [column for column in data.columns
+                   if column in self._positions and self._active[self._positions[column]]]
+        return columns, np.array([self._positions[column] for column in columns], dtype=int)
+    
+    @staticmethod
+    def _replace_columns(data: pd.DataFrame, columns: List, values: np.ndarray) -> pd.DataFrame:
+        """Build a frame like data with some columns replaced by new values."""
+        scaled = pd.DataFrame(values, index=data.index, columns=columns)
+        if len(columns) == len(data.columns):
+            return scaled
+        return pd.concat([data.drop(columns=columns), scaled], axis=1)[data.columns]
+    
+    def transform(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Transform the data using the fitted normalizer.
+        
+        Args:
+            data: DataFrame to normalize
+            
+        Returns:
+            Normalized DataFrame
+        """
+        columns, positions = self._scaled_columns(data)
+        values = data[columns].to_numpy(dtype=np.float64)
+        return self._replace_columns(data, columns, (values - self._offset[positions]) / self._scale[positions])
     
     def fit_transform(self, data: pd.DataFrame) -> pd.DataFrame:
         """Fit the normalizer to the data and transform it.
@@ -240,24 +466,6 @@ class DataNormalizer:
         Returns:
             DataFrame in original scale
         """
-        if not self.stats:
-            raise ValueError("Normalizer has not been fitted. Call fit() first.")
-        
-        df = data.copy()
-        
-        for column in df.columns:
-            if column in self.stats:
-                if self.method == 'minmax':
-                    min_val = self.stats[column]['min']
-                    max_val = self.stats[column]['max']
-                    df[column] = df[column] * (max_val - min_val) + min_val
-                elif self.method == 'zscore':
-                    mean = self.stats[column]['mean']
-                    std = self.stats[column]['std']
-                    df[column] = df[column] * std + mean
-                elif self.method == 'robust':
-                    median = self.stats[column]['median']
-                    iqr = self.stats[column]['iqr']
-                    df[column] = df[column] * iqr + median
-        
-        return df
\ No newline at end of file
+        columns, positions = self._scaled_columns(data)
+        values = data[columns].to_numpy(dtype=np.float64)
+        return self._replace_columns(data, columns, values * self._scale[positions] + self._offset[positions])
\ No newline at end of file
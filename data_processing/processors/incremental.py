@@ -0,0 +1,367 @@
+# Incremental Feature Module
+# This module keeps indicator state so features can be computed bar by bar
+
+import math
+import numpy as np
+import pandas as pd
+from collections import deque
+from typing import Dict, List, Optional
+
+from data_processing.processors.indicators import INDICATOR_FEATURES, PRICE_FEATURES
+
+NAN = float('nan')
+
+
+def _is_zero(value: float) -> bool:
+    """Zero test used by TA-Lib for divisors."""
+    return -1e-8 < value < 1e-8
+
+
+class RollingMean:
+    """Simple moving average over a fixed window (TA-Lib SMA)."""
+    
+    def __init__(self, period: int):
+        self.period = period
+        self.window = deque(maxlen=period)
+    
+    def update(self, value: float) -> float:
+        self.window.append(value)
+        if len(self.window) < self.period:
+            return NAN
+        return sum(self.window) / self.period
+
+
+class RollingStd:
+    """Sample standard deviation over a fixed window (pandas rolling().std())."""
+    
+    def __init__(self, period: int):
+        self.period = period
+        self.window = deque(maxlen=period)
+    
+    def update(self, value: float) -> float:
+        # Missing values restart the window, as they do for a pandas rolling window
+        if math.isnan(value):
+            self.window.clear()
+            return NAN
+        self.window.append(value)
+        if len(self.window) < self.period:
+            return NAN
+        return float(np.std(self.window, ddof=1))
+
+
+class ExponentialMean:
+    """Exponential moving average seeded with a simple average (TA-Lib EMA)."""
+    
+    def __init__(self, period: int):
+        self.period = period
+        self.k = 2.0 / (period + 1)
+        self.value: Optional[float] = None
+        self._seed: List[float] = []
+    
+    def update(self, value: float) -> float:
+        if self.value is None:
+            self._seed.append(value)
+            if len(self._seed) < self.period:
+                return NAN
+            self.value = sum(self._seed) / self.period
+            self._seed = []
+        else:
+            self.value = ((value - self.value) * self.k) + self.value
+        return self.value
+
+
+class MACDState:
+    """MACD line, signal and histogram (TA-Lib MACD).
+    
+    TA-Lib seeds the fast EMA on the bars that end where the slow EMA's seed
+    ends, so the fast EMA only starts consuming bars after slow - fast bars.
+    """
+    
+    def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9):
+        self.skip = slow_period - fast_period
+        self.fast = ExponentialMean(fast_period)
+        self.slow = ExponentialMean(slow_period)
+        self.signal = ExponentialMean(signal_period)
+        self.count = 0
+    
+    def update(self, value: float):
+        self.count += 1
+        slow = self.slow.update(value)
+        fast = self.fast.update(value) if self.count > self.skip else NAN
+        if math.isnan(slow):
+            return NAN, NAN, NAN
+        
+        macd = fast - slow
+        signal = self.signal.update(macd)
+        if math.isnan(signal):
+            return NAN, NAN, NAN
+        return macd, signal, macd - signal
+
+
+class RSIState:
+    """Relative strength index with Wilder smoothing (TA-Lib RSI)."""
+    
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev: Optional[float] = None
+        self.count = 0
+        self.gain = 0.0
+        self.loss = 0.0
+    
+    def update(self, value: float) -> float:
+        if self.prev is None:
+            self.prev = value
+            return NAN
+        
+        change = value - self.prev
+        self.prev = value
+        
+        if self.count < self.period:
+            # Warm-up: simple average of the first period changes
+            if change < 0:
+                self.loss -= change
+            else:
+                self.gain += change
+            self.count += 1
+            if self.count < self.period:
+                return NAN
+            self.loss /= self.period
+            self.gain /= self.period
+        else:
+            self.loss *= (self.period - 1)
+            self.gain *= (self.period - 1)
+            if change < 0:
+                self.loss -= change
+            else:
+                self.gain += change
+            self.loss /= self.period
+            self.gain /= self.period
+        
+        total = self.gain + self.loss
+        return 0.0 if _is_zero(total) else 100.0 * (self.gain / total)
+
+
+class BollingerState:
+    """Bollinger bands around a simple average with population deviation (TA-Lib BBANDS)."""
+    
+    def __init__(self, period: int = 20, nbdev: float = 2.0):
+        self.period = period
+        self.nbdev = nbdev
+        self.window = deque(maxlen=period)
+    
+    def update(self, value: float):
+        self.window.append(value)
+        if len(self.window) < self.period:
+            return NAN, NAN, NAN
+        
+        mean = sum(self.window) / self.period
+        variance = sum(x * x for x in self.window) / self.period - mean * mean
+        std = math.sqrt(variance) if variance >= 1e-8 else 0.0
+        return mean + self.nbdev * std, mean, mean - self.nbdev * std
+
+
+class StochasticState:
+    """Slow stochastic oscillator with simple averages (TA-Lib STOCH)."""
+    
+    def __init__(self, fastk_period: int = 5, slowk_period: int = 3, slowd_period: int = 3):
+        self.highs = deque(maxlen=fastk_period)
+        self.lows = deque(maxlen=fastk_period)
+        self.slowk = RollingMean(slowk_period)
+        self.slowd = RollingMean(slowd_period)
+    
+    def update(self, high: float, low: float, close: float):
+        self.highs.append(high)
+        self.lows.append(low)
+        if len(self.highs) < self.highs.maxlen:
+            return NAN, NAN
+        
+        lowest = min(self.lows)
+        diff = (max(self.highs) - lowest) / 100.0
+        fastk = (close - lowest) / diff if diff != 0.0 else 0.0
+        
+        slowk = self.slowk.update(fastk)
+        if math.isnan(slowk):
+            return NAN, NAN
+        slowd = self.slowd.update(slowk)
+        if math.isnan(slowd):
+            return NAN, NAN
+        return slowk, slowd
+
+
+class ATRState:
+    """Average true range with Wilder smoothing (TA-Lib ATR)."""
+    
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_close: Optional[float] = None
+        self.value: Optional[float] = None
+        self._seed: List[float] = []
+    
+    def update(self, high: float, low: float, close: float) -> float:
+        prev_close = self.prev_close
+        self.prev_close = close
+        if prev_close is None:
+            return NAN
+        
+        true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        if self.value is None:
+            self._seed.append(true_range)
+            if len(self._seed) < self.period:
+                return NAN
+            self.value = sum(self._seed) / self.period
+            self._seed = []
+        else:
+            self.value = (self.value * (self.period - 1) + true_range) / self.period
+        return self.value
+
+
+class OBVState:
+    """On-balance volume (TA-Lib OBV)."""
+    
+    def __init__(self):
+        self.prev_close: Optional[float] = None
+        self.value = 0.0
+    
+    def update(self, close: float, volume: float) -> float:
+        if self.prev_close is None:
+            self.value = volume
+        elif close > self.prev_close:
+            self.value += volume
+        elif close < self.prev_close:
+            self.value -= volume
+        self.prev_close = close
+        return self.value
+
+
+class CCIState:
+    """Commodity channel index (TA-Lib CCI)."""
+    
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.window = deque(maxlen=period)
+    
+    def update(self, high: float, low: float, close: float) -> float:
+        typical = (high + low + close) / 3
+        self.window.append(typical)
+        if len(self.window) < self.period:
+            return NAN
+        
+        average = sum(self.window) / self.period
+        mean_deviation = sum(abs(x - average) for x in self.window) / self.period
+        distance = typical - average
+        if distance != 0.0 and mean_deviation != 0.0:
+            return distance / (0.015 * mean_deviation)
+        return 0.0
+
+
+class IncrementalFeatureState:
+    """Running state for every FeatureEngineer feature.
+    
+    Feeding bars one at a time through update() yields the same values that
+    FeatureEngineer.process computes for those bars over the full history.
+    """
+    
+    def __init__(self, features: Optional[List[str]] = None):
+        """Initialize empty indicator state.
+        
+        Args:
+            features: Features to return (if None, all features)
+        """
+        self.columns = list(features) if features is not None else PRICE_FEATURES + INDICATOR_FEATURES
+        self.include_indicators = any(col in INDICATOR_FEATURES for col in self.columns)
+        self.first_close: Optional[float] = None
+        self.prev_close: Optional[float] = None
+        self.last_row: Optional[Dict[str, float]] = None
+        
+        self.volatility_5d = RollingStd(5)
+        self.volatility_20d = RollingStd(20)
+        
+        if self.include_indicators:
+            self.sma = {period: RollingMean(period) for period in (5, 20, 50, 200)}
+            self.ema = {period: ExponentialMean(period) for period in (5, 20)}
+            self.macd = MACDState(12, 26, 9)
+            self.rsi = RSIState(14)
+            self.bbands = BollingerState(20, 2.0)
+            self.stoch = StochasticState(5, 3, 3)
+            self.atr = ATRState(14)
+            self.obv = OBVState()
+            self.cci = CCIState(14)
+    
+    @property
+    def is_warm(self) -> bool:
+        """Whether every feature of the last bar had a value."""
+        return self.last_row is not None and not any(math.isnan(self.last_row[col]) for col in self.columns)
+    
+    def update(self, open_: float, high: float, low: float, close: float, volume: float) -> Dict[str, float]:
+        """Advance the state by one bar.
+        
+        Args:
+            open_: Open price
+            high: High price
+            low: Low price
+            close: Close price
+            volume: Volume
+        
+        Returns:
+            Dictionary of feature values for the bar (NaN while an indicator warms up)
+        """
+        row = {}
+        
+        if self.prev_close is None:
+            self.first_close = close
+            row['daily_return'] = NAN
+            row['log_return'] = NAN
+        else:
+            ratio = close / self.prev_close
+            row['daily_return'] = ratio - 1
+            row['log_return'] = math.log(ratio) if ratio > 0 else NAN
+        self.prev_close = close
+        
+        row['high_low_range'] = high - low
+        row['close_open_range'] = close - open_
+        row['normalized_price'] = close / self.first_close
+        row['volatility_5d'] = self.volatility_5d.update(row['daily_return'])
+        row['volatility_20d'] = self.volatility_20d.update(row['daily_return'])
+        
+        if self.include_indicators:
+            for period, sma in self.sma.items():
+                row[f'sma_{period}'] = sma.update(close)
+            for period, ema in self.ema.items():
+                row[f'ema_{period}'] = ema.update(close)
+            
+            row['macd'], row['macd_signal'], row['macd_hist'] = self.macd.update(close)
+            row['rsi_14'] = self.rsi.update(close)
+            row['bb_upper'], row['bb_middle'], row['bb_lower'] = self.bbands.update(close)
+            row['stoch_k'], row['stoch_d'] = self.stoch.update(high, low, close)
+            row['atr'] = self.atr.update(high, low, close)
+            row['obv'] = self.obv.update(close, volume)
+            row['cci'] = self.cci.update(high, low, close)
+            
+            row['price_sma_ratio_20'] = close / row['sma_20']
+            row['price_sma_ratio_50'] = close / row['sma_50']
+            row['sma_5_20_cross'] = int(row['sma_5'] > row['sma_20'])
+            row['sma_20_50_cross'] = int(row['sma_20'] > row['sma_50'])
+        
+        # Forward-fill gaps from the previous bar, as process() does
+        if self.last_row is not None:
+            for col, value in row.items():
+                if value != value:
+                    row[col] = self.last_row[col]
+        
+        self.last_row = row
+        return row
+    
+    def update_frame(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Advance the state over a frame of bars.
+        
+        Args:
+            data: DataFrame with open, high, low, close and volume columns
+        
+        Returns:
+            DataFrame with one row of features per input bar, indexed like data
+        """
+        arrays = [data[col].to_numpy(dtype=np.float64) for col in ('open', 'high', 'low', 'close', 'volume')]
+        rows = [self.update(*bar) for bar in zip(*(array.tolist() for array in arrays))]
+        
+        values = np.array([[row[col] for col in self.columns] for row in rows], dtype=np.float64).reshape(len(rows), len(self.columns))
+        return pd.DataFrame(values, index=data.index, columns=self.columns)
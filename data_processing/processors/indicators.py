@@ -0,0 +1,246 @@
+# Indicator Registry Module
+# This module declares the features FeatureEngineer can compute as a dependency graph
+
+import os
+import importlib
+import numpy as np
+import pandas as pd
+from types import ModuleType
+from typing import Callable, Dict, List, Optional, Sequence
+
+# Raw input columns every indicator graph starts from
+INPUT_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# Features in the order FeatureEngineer adds them
+PRICE_FEATURES = [
+    'daily_return', 'log_return', 'high_low_range', 'close_open_range',
+    'normalized_price', 'volatility_5d', 'volatility_20d'
+]
+INDICATOR_FEATURES = [
+    'sma_5', 'sma_20', 'sma_50', 'sma_200', 'ema_5', 'ema_20',
+    'macd', 'macd_signal', 'macd_hist', 'rsi_14',
+    'bb_upper', 'bb_middle', 'bb_lower', 'stoch_k', 'stoch_d',
+    'atr', 'obv', 'cci',
+    'price_sma_ratio_20', 'price_sma_ratio_50', 'sma_5_20_cross', 'sma_20_50_cross'
+]
+ALL_FEATURES = PRICE_FEATURES + INDICATOR_FEATURES
+
+# Indicator backends: TA-Lib (C extension) or the pure-NumPy implementation
+BACKENDS = {
+    'talib': 'talib',
+    'numpy': 'data_processing.processors.numpy_backend',
+}
+
+_backend_modules: Dict[str, ModuleType] = {}
+_auto_backend: Optional[str] = None
+
+
+def select_backend(name: Optional[str] = None) -> str:
+    """Resolve the name of the indicator backend to use.
+    
+    Args:
+        name: 'talib', 'numpy' or 'auto' (if None, the INDICATOR_BACKEND
+            environment variable, defaulting to 'auto'); 'auto' picks TA-Lib
+            when it is installed and NumPy otherwise
+    
+    Returns:
+        Backend name
+    """
+    global _auto_backend
+    name = (name or os.environ.get('INDICATOR_BACKEND') or 'auto').lower()
+    if name == 'auto':
+        if _auto_backend is None:
+            try:
+                get_backend('talib')
+                _auto_backend = 'talib'
+            except ImportError:
+                _auto_backend = 'numpy'
+        return _auto_backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown indicator backend: {name}")
+    return name
+
+
+def get_backend(name: Optional[str] = None) -> ModuleType:
+    """Get the module implementing the TA-Lib functions for a backend.
+    
+    Args:
+        name: Backend name (see select_backend)
+    
+    Returns:
+        Module exposing SMA, EMA, MACD, RSI, STDDEV, STOCH, ATR, OBV and CCI
+    """
+    if name not in BACKENDS:
+        name = select_backend(name)
+    if name not in _backend_modules:
+        _backend_modules[name] = importlib.import_module(BACKENDS[name])
+    return _backend_modules[name]
+
+
+class Indicator:
+    """A node of the indicator graph.
+    
+    A node reads the raw input columns and the outputs of the nodes it depends
+    on, and produces one or more named outputs. Its compute function receives
+    the indicator backend first, so the graph runs on TA-Lib or NumPy alike.
+    """
+    
+    def __init__(self, name: str, outputs: List[str], depends: List[str], compute: Callable):
+        """Initialize the indicator node.
+        
+        Args:
+            name: Node name
+            outputs: Names of the series the node produces
+            depends: Input columns and outputs of other nodes that the node reads
+            compute: Function called with the indicator backend and then the
+                dependency series in order, returning
+                one series per output (a single series for single-output nodes)
+        """
+        self.name = name
+        self.outputs = outputs
+        self.depends = depends
+        self.compute = compute
+
+
+# Registered nodes by name, and the node producing each output
+INDICATORS: Dict[str, Indicator] = {}
+PRODUCERS: Dict[str, str] = {}
+
+
+def register(name: str, outputs: List[str], depends: List[str]) -> Callable:
+    """Register a function as an indicator node.
+    
+    Args:
+        name: Node name
+        outputs: Names of the series the node produces
+        depends: Input columns and outputs of other nodes that the node reads
+    
+    Returns:
+        Decorator registering the function
+    """
+    def decorator(compute: Callable) -> Callable:
+        INDICATORS[name] = Indicator(name, outputs, depends, compute)
+        for output in outputs:
+            PRODUCERS[output] = name
+        return compute
+    return decorator
+
+
+# Price features
+register('daily_return', ['daily_return'], ['close'])(lambda ta, close: close.pct_change())
+register('log_return', ['log_return'], ['close'])(lambda ta, close: np.log(close / close.shift(1)))
+register('high_low_range', ['high_low_range'], ['high', 'low'])(lambda ta, high, low: high - low)
+register('close_open_range', ['close_open_range'], ['close', 'open'])(lambda ta, close, open_: close - open_)
+register('normalized_price', ['normalized_price'], ['close'])(
+    lambda ta, close: close / close.iloc[0] if len(close) > 0 else 1.0
+)
+for _window in (5, 20):
+    register(f'volatility_{_window}d', [f'volatility_{_window}d'], ['daily_return'])(
+        lambda ta, returns, window=_window: returns.rolling(window=window).std()
+    )
+
+# Moving averages
+for _period in (5, 20, 50, 200):
+    register(f'sma_{_period}', [f'sma_{_period}'], ['close'])(
+        lambda ta, close, period=_period: ta.SMA(close, timeperiod=period)
+    )
+for _period in (5, 20):
+    register(f'ema_{_period}', [f'ema_{_period}'], ['close'])(
+        lambda ta, close, period=_period: ta.EMA(close, timeperiod=period)
+    )
+
+
+@register('macd', ['macd', 'macd_signal', 'macd_hist'], ['close'])
+def _macd(ta, close):
+    return ta.MACD(close, fastperiod=12, slowperiod=26, signalperiod=9)
+
+
+register('rsi_14', ['rsi_14'], ['close'])(lambda ta, close: ta.RSI(close, timeperiod=14))
+
+
+@register('bbands', ['bb_upper', 'bb_middle', 'bb_lower'], ['close', 'sma_20'])
+def _bbands(ta, close, sma_20):
+    # The middle band is the 20-bar SMA, so it is shared with the sma_20 node
+    deviation = 2 * ta.STDDEV(close, timeperiod=20, nbdev=1)
+    return sma_20 + deviation, sma_20, sma_20 - deviation
+
+
+@register('stoch', ['stoch_k', 'stoch_d'], ['high', 'low', 'close'])
+def _stoch(ta, high, low, close):
+    return ta.STOCH(high, low, close, fastk_period=5, slowk_period=3, slowk_matype=0,
+                    slowd_period=3, slowd_matype=0)
+
+
+register('atr', ['atr'], ['high', 'low', 'close'])(
+    lambda ta, high, low, close: ta.ATR(high, low, close, timeperiod=14)
+)
+register('obv', ['obv'], ['close', 'volume'])(lambda ta, close, volume: ta.OBV(close, volume))
+register('cci', ['cci'], ['high', 'low', 'close'])(
+    lambda ta, high, low, close: ta.CCI(high, low, close, timeperiod=14)
+)
+
+# Features derived from other indicators
+for _period in (20, 50):
+    register(f'price_sma_ratio_{_period}', [f'price_sma_ratio_{_period}'], ['close', f'sma_{_period}'])(
+        lambda ta, close, sma: close / sma
+    )
+for _fast, _slow in ((5, 20), (20, 50)):
+    register(f'sma_{_fast}_{_slow}_cross', [f'sma_{_fast}_{_slow}_cross'], [f'sma_{_fast}', f'sma_{_slow}'])(
+        lambda ta, fast, slow: (fast > slow).astype(int)
+    )
+
+
+def resolve(features: Sequence[str]) -> List[str]:
+    """Find the nodes needed for a set of features, in dependency order.
+    
+    Args:
+        features: Names of the requested features
+    
+    Returns:
+        Node names ordered so that every node comes after its dependencies
+    """
+    order = []
+    visited = set()
+    
+    def visit(output: str) -> None:
+        if output in INPUT_COLUMNS:
+            return
+        if output not in PRODUCERS:
+            raise ValueError(f"Unknown feature: {output}")
+        name = PRODUCERS[output]
+        if name in visited:
+            return
+        visited.add(name)
+        for dependency in INDICATORS[name].depends:
+            visit(dependency)
+        order.append(name)
+    
+    for feature in features:
+        visit(feature)
+    return order
+
+
+def compute_features(data: pd.DataFrame, features: Sequence[str],
+                     backend: Optional[str] = None) -> Dict[str, pd.Series]:
+    """Compute a set of features, running each needed node once.
+    
+    Args:
+        data: DataFrame with OHLCV data
+        features: Names of the requested features
+        backend: Indicator backend (see select_backend)
+    
+    Returns:
+        Dictionary mapping each requested feature to its series, in request order
+    """
+    ta = get_backend(backend)
+    values = {col: data[col] for col in INPUT_COLUMNS if col in data.columns}
+    
+    for name in resolve(features):
+        indicator = INDICATORS[name]
+        result = indicator.compute(ta, *(values[dependency] for dependency in indicator.depends))
+        if len(indicator.outputs) == 1:
+            result = (result,)
+        for output, series in zip(indicator.outputs, result):
+            values[output] = series
+    
+    return {feature: values[feature] for feature in features}
@@ -0,0 +1,100 @@
+# NumPy Indicator Backend Module
+# This module implements the TA-Lib functions used by the indicator graph in pure NumPy
+
+import numpy as np
+import pandas as pd
+from typing import Callable, Tuple, Union
+
+from data_processing.processors import panel
+
+ArrayLike = Union[np.ndarray, pd.Series]
+
+
+def _column(values: ArrayLike) -> np.ndarray:
+    """Convert a 1-D input to a float (time x 1) column for the panel kernels."""
+    return np.ascontiguousarray(np.asarray(values, dtype=np.float64).reshape(-1, 1))
+
+
+def _wrap(template: ArrayLike, *columns: np.ndarray):
+    """Flatten kernel outputs, returning Series indexed like the input when it was a Series."""
+    outputs = tuple(column.ravel() for column in columns)
+    if isinstance(template, pd.Series):
+        outputs = tuple(pd.Series(output, index=template.index) for output in outputs)
+    return outputs if len(outputs) > 1 else outputs[0]
+
+
+def _apply(kernel: Callable, *inputs: ArrayLike, **params):
+    """Run a panel kernel on 1-D inputs."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result = kernel(*(_column(values) for values in inputs), **params)
+    if not isinstance(result, tuple):
+        result = (result,)
+    return _wrap(inputs[0], *result)
+
+
+def _check_matype(matype: int) -> None:
+    """Only simple moving averages are supported for TA-Lib's matype arguments."""
+    if matype != 0:
+        raise ValueError(f"Unsupported moving average type: {matype} (only 0, SMA, is supported)")
+
+
+def SMA(real: ArrayLike, timeperiod: int = 30) -> ArrayLike:
+    """Simple moving average."""
+    return _apply(panel.rolling_mean, real, window=timeperiod)
+
+
+def EMA(real: ArrayLike, timeperiod: int = 30) -> ArrayLike:
+    """Exponential moving average seeded with a simple average."""
+    return _apply(panel.ema, real, period=timeperiod)
+
+
+def STDDEV(real: ArrayLike, timeperiod: int = 5, nbdev: float = 1) -> ArrayLike:
+    """Population standard deviation scaled by nbdev."""
+    return _apply(lambda x: nbdev * panel.rolling_std(x, timeperiod, ddof=0), real)
+
+
+def MACD(real: ArrayLike, fastperiod: int = 12, slowperiod: int = 26, signalperiod: int = 9) -> Tuple[ArrayLike, ...]:
+    """MACD line, signal and histogram."""
+    return _apply(panel.macd, real, fast=fastperiod, slow=slowperiod, signal=signalperiod)
+
+
+def RSI(real: ArrayLike, timeperiod: int = 14) -> ArrayLike:
+    """Relative strength index with Wilder smoothing."""
+    return _apply(panel.rsi, real, period=timeperiod)
+
+
+def BBANDS(real: ArrayLike, timeperiod: int = 5, nbdevup: float = 2, nbdevdn: float = 2,
+           matype: int = 0) -> Tuple[ArrayLike, ...]:
+    """Bollinger bands around a simple average."""
+    _check_matype(matype)
+    
+    def kernel(x):
+        middle = panel.rolling_mean(x, timeperiod)
+        deviation = panel.rolling_std(x, timeperiod, ddof=0)
+        return middle + nbdevup * deviation, middle, middle - nbdevdn * deviation
+    
+    return _apply(kernel, real)
+
+
+def STOCH(high: ArrayLike, low: ArrayLike, close: ArrayLike, fastk_period: int = 5, slowk_period: int = 3,
+          slowk_matype: int = 0, slowd_period: int = 3, slowd_matype: int = 0) -> Tuple[ArrayLike, ...]:
+    """Slow stochastic oscillator."""
+    _check_matype(slowk_matype)
+    _check_matype(slowd_matype)
+    return _apply(panel.stoch, high, low, close, fastk_period=fastk_period,
+                  slowk_period=slowk_period, slowd_period=slowd_period)
+
+
+def ATR(high: ArrayLike, low: ArrayLike, close: ArrayLike, timeperiod: int = 14) -> ArrayLike:
+    """Average true range with Wilder smoothing."""
+    return _apply(panel.atr, high, low, close, period=timeperiod)
+
+
+def OBV(real: ArrayLike, volume: ArrayLike) -> ArrayLike:
+    """On-balance volume."""
+    return _apply(panel.obv, real, volume)
+
+
+def CCI(high: ArrayLike, low: ArrayLike, close: ArrayLike, timeperiod: int = 14) -> ArrayLike:
+    """Commodity channel index."""
+    return _apply(panel.cci, high, low, close, period=timeperiod)
@@ -0,0 +1,386 @@
+# Panel Feature Module
+# This module computes features for many symbols at once on (time x symbol) arrays
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+from data_processing.processors.indicators import INPUT_COLUMNS, INDICATORS, resolve
+
+# Every kernel takes and returns float arrays shaped (time, symbol). Symbols may
+# start late: leading NaNs are skipped per column, so each indicator warms up from
+# the symbol's first bar, as TA-Lib does for a single series. A NaN after the
+# first bar propagates like it does in TA-Lib.
+
+
+def first_valid(x: np.ndarray) -> np.ndarray:
+    """Get the row of the first non-NaN value of each column (len(x) if none)."""
+    valid = ~np.isnan(x)
+    return np.where(valid.any(axis=0), valid.argmax(axis=0), x.shape[0])
+
+
+def shift(x: np.ndarray, periods: int = 1) -> np.ndarray:
+    """Shift rows down, filling the top with NaN."""
+    out = np.full_like(x, np.nan)
+    if periods < len(x):
+        out[periods:] = x[:len(x) - periods]
+    return out
+
+
+def pct_change(x: np.ndarray, periods: int = 1) -> np.ndarray:
+    """Percentage change between rows."""
+    return x / shift(x, periods) - 1
+
+
+def log_return(x: np.ndarray) -> np.ndarray:
+    """Log return between consecutive rows."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.log(x / shift(x))
+
+
+def rolling_sum(x: np.ndarray, window: int) -> np.ndarray:
+    """Sum over a trailing window; NaN unless every value in the window is present."""
+    out = np.full_like(x, np.nan)
+    if window > len(x):
+        return out
+    
+    zero = np.zeros((1,) + x.shape[1:])
+    valid = ~np.isnan(x)
+    if valid.all():
+        totals = np.concatenate([zero, np.cumsum(x, axis=0)])
+        out[window - 1:] = totals[window:] - totals[:-window]
+        return out
+    
+    totals = np.concatenate([zero, np.cumsum(np.where(valid, x, 0.0), axis=0)])
+    counts = np.concatenate([zero, np.cumsum(valid, axis=0)])
+    
+    sums = totals[window:] - totals[:-window]
+    complete = (counts[window:] - counts[:-window]) == window
+    out[window - 1:] = np.where(complete, sums, np.nan)
+    return out
+
+
+def rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """Mean over a trailing window (TA-Lib SMA)."""
+    return rolling_sum(x, window) / window
+
+
+def rolling_std(x: np.ndarray, window: int, ddof: int = 1) -> np.ndarray:
+    """Standard deviation over a trailing window.
+    
+    ddof=1 matches pandas rolling().std(); ddof=0 matches TA-Lib STDDEV.
+    """
+    # Deviation is shift-invariant; centring on each column's first value keeps
+    # the running sums of squares small for high-priced instruments
+    start = first_valid(x)
+    anchor = x[np.minimum(start, len(x) - 1), np.arange(x.shape[1])] if len(x) else 0.0
+    centred = x - np.where(np.isnan(anchor), 0.0, anchor)
+    
+    sums = rolling_sum(centred, window)
+    squares = rolling_sum(centred * centred, window)
+    variance = (squares - sums * sums / window) / (window - ddof)
+    if ddof == 0:
+        # TA-Lib reports zero deviation for (numerically) non-positive variance
+        return np.where(variance < 1e-8, 0.0, np.sqrt(np.maximum(variance, 0.0)))
+    return np.sqrt(np.maximum(variance, 0.0))
+
+
+def rolling_max(x: np.ndarray, window: int) -> np.ndarray:
+    """Maximum over a trailing window."""
+    out = np.full_like(x, np.nan)
+    if window <= len(x):
+        out[window - 1:] = sliding_window_view(x, window, axis=0).max(axis=-1)
+    return out
+
+
+def rolling_min(x: np.ndarray, window: int) -> np.ndarray:
+    """Minimum over a trailing window."""
+    out = np.full_like(x, np.nan)
+    if window <= len(x):
+        out[window - 1:] = sliding_window_view(x, window, axis=0).min(axis=-1)
+    return out
+
+
+def _seed_schedule(start: np.ndarray, length: int) -> Dict[int, np.ndarray]:
+    """Group columns by the row at which their recursion is seeded."""
+    schedule = {}
+    for row in np.unique(start[start < length]):
+        schedule[int(row)] = np.flatnonzero(start == row)
+    return schedule
+
+
+def _column_recursion(seed: float, values: np.ndarray, step: Callable[[float, float], float]) -> List[float]:
+    """Run a recursion over a single column with Python floats.
+    
+    For one symbol, per-bar array operations cost far more than the arithmetic,
+    so the recursion runs on plain floats (with the same operation order).
+    """
+    out = [seed]
+    value = seed
+    for x in values.tolist():
+        value = step(value, x)
+        out.append(value)
+    return out
+
+
+def ema(x: np.ndarray, period: int, offset: int = 0) -> np.ndarray:
+    """Exponential moving average seeded with a simple average (TA-Lib EMA).
+    
+    Args:
+        x: Input array
+        period: EMA period
+        offset: Bars to skip after each column's first value before seeding
+    
+    Returns:
+        Array of EMA values
+    """
+    k = 2.0 / (period + 1)
+    seeds = rolling_mean(x, period)
+    schedule = _seed_schedule(first_valid(x) + offset + period - 1, len(x))
+    
+    out = np.full_like(x, np.nan)
+    if not schedule:
+        return out
+    if x.shape[1] == 1:
+        first = min(schedule)
+        out[first:, 0] = _column_recursion(seeds[first, 0], x[first + 1:, 0],
+                                           lambda value, x_t: value + (x_t - value) * k)
+        return out
+    
+    # The recursion runs over time with every symbol updated in one vector step
+    value = np.full(x.shape[1:], np.nan)
+    step = np.empty_like(value)
+    for t in range(min(schedule), len(x)):
+        np.subtract(x[t], value, out=step)
+        step *= k
+        value += step
+        columns = schedule.get(t)
+        if columns is not None:
+            value[columns] = seeds[t, columns]
+        out[t] = value
+    return out
+
+
+def wilder(x: np.ndarray, period: int, start: np.ndarray) -> np.ndarray:
+    """Wilder smoothing seeded with the simple average of the first period values.
+    
+    Args:
+        x: Input array
+        period: Smoothing period
+        start: Row of each column's first output (its seed)
+    
+    Returns:
+        Array of smoothed values
+    """
+    seeds = rolling_mean(x, period)
+    schedule = _seed_schedule(start, len(x))
+    
+    out = np.full_like(x, np.nan)
+    if not schedule:
+        return out
+    if x.shape[1] == 1:
+        first = min(schedule)
+        out[first:, 0] = _column_recursion(seeds[first, 0], x[first + 1:, 0],
+                                           lambda value, x_t: (value * (period - 1) + x_t) / period)
+        return out
+    
+    value = np.full(x.shape[1:], np.nan)
+    for t in range(min(schedule), len(x)):
+        value *= (period - 1)
+        value += x[t]
+        value /= period
+        columns = schedule.get(t)
+        if columns is not None:
+            value[columns] = seeds[t, columns]
+        out[t] = value
+    return out
+
+
+def macd(x: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9):
+    """MACD line, signal and histogram (TA-Lib MACD)."""
+    # TA-Lib seeds the fast EMA on the bars that end where the slow seed ends
+    line = ema(x, fast, offset=slow - fast) - ema(x, slow)
+    signal_line = ema(line, signal)
+    line = np.where(np.isnan(signal_line), np.nan, line)
+    return line, signal_line, line - signal_line
+
+
+def rsi(x: np.ndarray, period: int = 14) -> np.ndarray:
+    """Relative strength index with Wilder smoothing (TA-Lib RSI)."""
+    change = x - shift(x)
+    start = first_valid(x) + period
+    gain = wilder(np.where(change > 0, change, np.where(np.isnan(change), np.nan, 0.0)), period, start)
+    loss = wilder(np.where(change < 0, -change, np.where(np.isnan(change), np.nan, 0.0)), period, start)
+    
+    total = gain + loss
+    with np.errstate(invalid='ignore', divide='ignore'):
+        value = np.where(np.abs(total) < 1e-8, 0.0, 100.0 * (gain / total))
+    return np.where(np.isnan(total), np.nan, value)
+
+
+def bbands(x: np.ndarray, period: int = 20, nbdev: float = 2.0, middle: Optional[np.ndarray] = None):
+    """Bollinger bands around a simple average (TA-Lib BBANDS with SMA).
+    
+    Args:
+        x: Input array
+        period: Band period
+        nbdev: Number of standard deviations
+        middle: Precomputed simple moving average of the same period
+    
+    Returns:
+        Tuple of (upper, middle, lower) arrays
+    """
+    if middle is None:
+        middle = rolling_mean(x, period)
+    deviation = nbdev * rolling_std(x, period, ddof=0)
+    return middle + deviation, middle, middle - deviation
+
+
+def stoch(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+          fastk_period: int = 5, slowk_period: int = 3, slowd_period: int = 3):
+    """Slow stochastic oscillator with simple averages (TA-Lib STOCH)."""
+    lowest = rolling_min(low, fastk_period)
+    diff = (rolling_max(high, fastk_period) - lowest) / 100.0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        fastk = np.where(diff != 0.0, (close - lowest) / diff, 0.0)
+    fastk = np.where(np.isnan(diff), np.nan, fastk)
+    
+    slowk = rolling_mean(fastk, slowk_period)
+    slowd = rolling_mean(slowk, slowd_period)
+    return np.where(np.isnan(slowd), np.nan, slowk), slowd
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """True range; undefined on each column's first bar."""
+    prev_close = shift(close)
+    return np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Average true range with Wilder smoothing (TA-Lib ATR)."""
+    return wilder(true_range(high, low, close), period, first_valid(close) + period)
+
+
+def obv(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """On-balance volume (TA-Lib OBV)."""
+    rows = np.arange(len(close))[:, None]
+    start = first_valid(close)
+    flow = np.sign(np.nan_to_num(close - shift(close))) * volume
+    flow = np.where(rows == start, volume, np.where(rows > start, flow, 0.0))
+    return np.where(rows >= start, np.cumsum(flow, axis=0), np.nan)
+
+
+def cci(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Commodity channel index (TA-Lib CCI)."""
+    typical = (high + low + close) / 3
+    out = np.full_like(typical, np.nan)
+    if period > len(typical):
+        return out
+    
+    windows = sliding_window_view(typical, period, axis=0)
+    average = windows.sum(axis=-1) / period
+    mean_deviation = np.abs(windows - average[..., None]).sum(axis=-1) / period
+    distance = typical[period - 1:] - average
+    with np.errstate(invalid='ignore', divide='ignore'):
+        value = np.where((distance != 0.0) & (mean_deviation != 0.0), distance / (0.015 * mean_deviation), 0.0)
+    out[period - 1:] = np.where(np.isnan(average), np.nan, value)
+    return out
+
+
+def _normalized_price(close: np.ndarray) -> np.ndarray:
+    """Close relative to each symbol's first close."""
+    start = first_valid(close)
+    base = close[np.minimum(start, len(close) - 1), np.arange(close.shape[1])] if len(close) else 1.0
+    return close / base
+
+
+# Panel kernel of each indicator graph node, taking the node's dependencies in order
+PANEL_KERNELS: Dict[str, Callable] = {
+    'daily_return': pct_change,
+    'log_return': log_return,
+    'high_low_range': lambda high, low: high - low,
+    'close_open_range': lambda close, open_: close - open_,
+    'normalized_price': _normalized_price,
+    'volatility_5d': lambda returns: rolling_std(returns, 5),
+    'volatility_20d': lambda returns: rolling_std(returns, 20),
+    'sma_5': lambda close: rolling_mean(close, 5),
+    'sma_20': lambda close: rolling_mean(close, 20),
+    'sma_50': lambda close: rolling_mean(close, 50),
+    'sma_200': lambda close: rolling_mean(close, 200),
+    'ema_5': lambda close: ema(close, 5),
+    'ema_20': lambda close: ema(close, 20),
+    'macd': macd,
+    'rsi_14': rsi,
+    'bbands': lambda close, sma_20: bbands(close, 20, 2.0, middle=sma_20),
+    'stoch': stoch,
+    'atr': atr,
+    'obv': obv,
+    'cci': cci,
+    'price_sma_ratio_20': lambda close, sma: close / sma,
+    'price_sma_ratio_50': lambda close, sma: close / sma,
+    'sma_5_20_cross': lambda fast, slow: (fast > slow).astype(int),
+    'sma_20_50_cross': lambda fast, slow: (fast > slow).astype(int),
+}
+
+
+def compute_panel_features(fields: Dict[str, Union[np.ndarray, pd.DataFrame]],
+                           features: Sequence[str]) -> Dict[str, Union[np.ndarray, pd.DataFrame]]:
+    """Compute features for every symbol of a panel in single vectorized passes.
+    
+    Args:
+        fields: Dictionary mapping 'open', 'high', 'low', 'close' and 'volume'
+            to (time x symbol) arrays, or DataFrames indexed by time with one
+            column per symbol
+        features: Names of the requested features
+    
+    Returns:
+        Dictionary mapping each requested feature to a (time x symbol) array, or
+        a DataFrame shaped like the inputs when DataFrames were given. Values are
+        NaN until an indicator has enough bars for a symbol.
+    """
+    template = next((value for value in fields.values() if isinstance(value, pd.DataFrame)), None)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        values = {
+            # Row-major layout keeps each time step contiguous for the recursions
+            col: np.ascontiguousarray(np.asarray(fields[col], dtype=np.float64))
+            for col in INPUT_COLUMNS if col in fields
+        }
+        
+        for name in resolve(features):
+            indicator = INDICATORS[name]
+            result = PANEL_KERNELS[name](*(values[dependency] for dependency in indicator.depends))
+            if len(indicator.outputs) == 1:
+                result = (result,)
+            for output, array in zip(indicator.outputs, result):
+                values[output] = array
+    
+    if template is not None:
+        return {
+            feature: pd.DataFrame(values[feature], index=template.index, columns=template.columns)
+            for feature in features
+        }
+    return {feature: values[feature] for feature in features}
+
+
+def pivot_panel(data: pd.DataFrame,
+                date_column: Optional[str] = None,
+                columns: List[str] = INPUT_COLUMNS) -> Dict[str, pd.DataFrame]:
+    """Pivot a long frame with a symbol column into (time x symbol) fields.
+    
+    Accepts the frames returned by get_historical_data_many(..., as_panel=True).
+    
+    Args:
+        data: Long DataFrame with a symbol column, a date column and OHLCV columns
+        date_column: Name of the date column (if None, the first column named like a date)
+        columns: Fields to pivot
+    
+    Returns:
+        Dictionary mapping each field to a DataFrame indexed by date with one
+        column per symbol; missing bars are NaN
+    """
+    if date_column is None:
+        date_column = next(col for col in data.columns if str(col).lower() in ('date', 'datetime'))
+    
+    wide = data.pivot_table(index=date_column, columns='symbol', values=columns, aggfunc='last', observed=False)
+    return {col: wide[col].sort_index() for col in columns if col in wide.columns.get_level_values(0)}
@@ -0,0 +1,140 @@
+# Parallel Feature Module
+# This module computes features for many symbols in a process pool
+
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, Optional, Tuple
+
+from data_processing.processors.feature_engineering import FeatureEngineer
+
+# Feature engineer of the current pool worker, built once by the initializer
+_worker_engineer: Optional[FeatureEngineer] = None
+
+
+def _init_worker(config: Dict[str, Any]) -> None:
+    """Build the worker's feature engineer from the parent's settings."""
+    global _worker_engineer
+    _worker_engineer = FeatureEngineer(**config)
+
+
+def _process_symbol(data: pd.DataFrame) -> Dict[str, Any]:
+    """Compute features in a worker and place the numeric block in shared memory.
+    
+    Only the array's name, shape and labels travel back through the pool's
+    pipe; the values are written once into a shared memory segment that the
+    parent copies and unlinks.
+    
+    Args:
+        data: DataFrame with OHLCV data
+    
+    Returns:
+        Description of the result for _collect()
+    """
+    df = _worker_engineer.process(data)
+    numeric = [col for col in df.columns if pd.api.types.is_numeric_dtype(df[col])]
+    values = np.asfortranarray(df[numeric].to_numpy(dtype=np.float64))
+    
+    result = {
+        'index': df.index,
+        'columns': list(df.columns),
+        'numeric': numeric,
+        'shape': values.shape,
+        'other': df.drop(columns=numeric) if len(numeric) < len(df.columns) else None,
+        'shm_name': None,
+        'values': None,
+    }
+    if values.nbytes == 0:
+        result['values'] = values
+        return result
+    
+    shm = shared_memory.SharedMemory(create=True, size=values.nbytes)
+    try:
+        np.ndarray(values.shape, dtype=np.float64, buffer=shm.buf, order='F')[...] = values
+        result['shm_name'] = shm.name
+    except Exception:
+        shm.close()
+        shm.unlink()
+        raise
+    shm.close()
+    
+    # The parent unlinks the segment, so this worker's resource tracker must not
+    # remove it (or warn about it) when the worker exits
+    resource_tracker.unregister(shm._name, 'shared_memory')
+    return result
+
+
+def _collect(result: Dict[str, Any]) -> pd.DataFrame:
+    """Rebuild a worker's feature frame, releasing its shared memory segment."""
+    if result['shm_name'] is None:
+        values = result['values']
+    else:
+        shm = shared_memory.SharedMemory(name=result['shm_name'])
+        try:
+            view = np.ndarray(result['shape'], dtype=np.float64, buffer=shm.buf, order='F')
+            values = view.copy(order='F')
+            del view
+        finally:
+            shm.close()
+            shm.unlink()
+    
+    df = pd.DataFrame(values, index=result['index'], columns=result['numeric'], copy=False)
+    if result['other'] is not None:
+        df = pd.concat([result['other'], df], axis=1)[result['columns']]
+    return df
+
+
+def process_many(feature_engineer: FeatureEngineer,
+                 data_by_symbol: Dict[str, pd.DataFrame],
+                 max_workers: Optional[int] = None) -> Tuple[Dict[str, pd.DataFrame], Dict[str, Exception]]:
+    """Run FeatureEngineer.process for many symbols across processes.
+    
+    Each worker builds its own feature engineer with the same settings and
+    returns its numeric feature block through shared memory rather than as
+    a pickled DataFrame. A failure for one symbol does not affect the others.
+    
+    Args:
+        feature_engineer: Feature engineer whose settings the workers use
+        data_by_symbol: Dictionary mapping each symbol to its OHLCV DataFrame
+        max_workers: Number of worker processes (if None, one per CPU); with a
+            single worker or symbol the features are computed in this process
+    
+    Returns:
+        Tuple of (results, errors) where results maps each successful symbol to
+        its processed DataFrame and errors maps each failed symbol to the
+        exception it raised
+    """
+    results = {}
+    errors = {}
+    
+    max_workers = max(1, min(max_workers or os.cpu_count() or 1, len(data_by_symbol)))
+    if max_workers == 1:
+        for symbol, data in data_by_symbol.items():
+            try:
+                results[symbol] = feature_engineer.process(data)
+            except Exception as e:
+                errors[symbol] = e
+        return results, errors
+    
+    config = {
+        'include_indicators': feature_engineer.include_indicators,
+        'features': feature_engineer.features,
+        'backend': feature_engineer.backend,
+    }
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(config,)) as executor:
+        futures = {
+            executor.submit(_process_symbol, data): symbol
+            for symbol, data in data_by_symbol.items()
+        }
+        for future in as_completed(futures):
+            symbol = futures[future]
+            try:
+                results[symbol] = _collect(future.result())
+            except Exception as e:
+                errors[symbol] = e
+    
+    # Keep the caller's symbol order
+    results = {symbol: results[symbol] for symbol in data_by_symbol if symbol in results}
+    return results, errors
@@ -0,0 +1,186 @@
+# Preprocessing Pipeline Module
+# This module saves and restores the preprocessing a model was trained with
+
+import os
+import json
+import time
+import pandas as pd
+from typing import Any, Dict, List, Optional
+
+from data_processing.processors.feature_engineering import FeatureEngineer, DataNormalizer
+from data_processing.processors.indicators import get_backend
+
+# Bump when the artifact layout changes; load() rejects newer artifacts
+ARTIFACT_VERSION = 1
+
+# Name of the artifact file saved next to model checkpoints
+PIPELINE_FILENAME = 'preprocessing.json'
+
+
+def pipeline_path(model_path: str) -> str:
+    """Get the path of the preprocessing artifact for a model.
+    
+    Args:
+        model_path: Model checkpoint file or the directory holding it
+    
+    Returns:
+        Path of the artifact in the checkpoint's directory
+    """
+    directory = model_path if os.path.isdir(model_path) else os.path.dirname(model_path)
+    return os.path.join(directory, PIPELINE_FILENAME)
+
+
+class PreprocessingPipeline:
+    """Feature engineering and normalization fitted for one model.
+    
+    The pipeline records the FeatureEngineer settings, the column layout the
+    model was trained on and the fitted DataNormalizer statistics, so that
+    inference applies exactly the training transforms without refitting.
+    """
+    
+    def __init__(self,
+                 feature_engineer: FeatureEngineer,
+                 normalizer: Optional[DataNormalizer] = None,
+                 metadata: Optional[Dict[str, Any]] = None):
+        """Initialize the pipeline.
+        
+        Args:
+            feature_engineer: Feature engineer producing the model's features
+            normalizer: Normalizer applied after feature engineering (if None,
+                features are used unscaled)
+            metadata: Extra information saved with the artifact (symbol, interval, ...)
+        """
+        self.feature_engineer = feature_engineer
+        self.normalizer = normalizer
+        self.metadata = metadata or {}
+        self.columns: Optional[List[str]] = None
+    
+    def fit(self, processed_data: pd.DataFrame) -> None:
+        """Fit the pipeline to feature-engineered training data.
+        
+        Args:
+            processed_data: Output of feature_engineer.process() for the training rows
+        """
+        self.columns = list(processed_data.columns)
+        if self.normalizer is not None:
+            self.normalizer.fit(processed_data)
+    
+    def transform_features(self, processed_data: pd.DataFrame) -> pd.DataFrame:
+        """Apply the fitted column layout and normalization to feature-engineered data.
+        
+        Args:
+            processed_data: Output of feature_engineer.process()
+        
+        Returns:
+            Model input DataFrame
+        """
+        if self.columns is None:
+            raise ValueError("Pipeline has not been fitted. Call fit() first.")
+        
+        missing = [col for col in self.columns if col not in processed_data.columns]
+        if missing:
+            raise ValueError(f"Columns {missing} used in training not found in data")
+        
+        df = processed_data[self.columns]
+        if self.normalizer is not None:
+            df = self.normalizer.transform(df)
+        return df
+    
+    def transform(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Turn raw market data into model input.
+        
+        Args:
+            data: DataFrame with OHLCV data
+        
+        Returns:
+            Model input DataFrame
+        """
+        return self.transform_features(self.feature_engineer.process(data))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Export the pipeline as plain Python values.
+        
+        Returns:
+            Dictionary accepted by from_dict()
+        """
+        if self.columns is None:
+            raise ValueError("Pipeline has not been fitted. Call fit() first.")
+        
+        return {
+            'version': ARTIFACT_VERSION,
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'metadata': self.metadata,
+            'feature_engineer': {
+                'include_indicators': self.feature_engineer.include_indicators,
+                'features': self.feature_engineer.features,
+                'backend': self.feature_engineer.backend,
+            },
+            'columns': self.columns,
+            'normalizer': self.normalizer.to_dict() if self.normalizer is not None else None,
+        }
+    
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> 'PreprocessingPipeline':
+        """Rebuild a fitted pipeline from to_dict() output.
+        
+        Args:
+            state: Dictionary from to_dict()
+        
+        Returns:
+            Fitted PreprocessingPipeline
+        """
+        version = state.get('version')
+        if not isinstance(version, int) or version > ARTIFACT_VERSION:
+            raise ValueError(f"Unsupported preprocessing artifact version: {version}")
+        
+        config = state['feature_engineer']
+        backend = config.get('backend')
+        try:
+            get_backend(backend)
+        except ImportError:
+            # The backends produce the same values, so fall back to the one available here
+            print(f"Indicator backend {backend} is not available, using numpy")
+            backend = 'numpy'
+        
+        feature_engineer = FeatureEngineer(include_indicators=config['include_indicators'],
+                                           features=config['features'], backend=backend)
+        normalizer = DataNormalizer.from_dict(state['normalizer']) if state.get('normalizer') else None
+        
+        pipeline = cls(feature_engineer, normalizer, metadata=state.get('metadata'))
+        pipeline.columns = list(state['columns'])
+        return pipeline
+    
+    def save(self, path: str) -> str:
+        """Save the pipeline as a JSON artifact.
+        
+        Args:
+            path: File path, or a model directory to save PIPELINE_FILENAME in
+        
+        Returns:
+            Path of the saved artifact
+        """
+        if os.path.isdir(path):
+            path = os.path.join(path, PIPELINE_FILENAME)
+        
+        # Write then rename, so readers never see a partial artifact
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+        return path
+    
+    @classmethod
+    def load(cls, path: str) -> 'PreprocessingPipeline':
+        """Load a pipeline saved with save().
+        
+        Args:
+            path: Artifact path, or a model directory containing PIPELINE_FILENAME
+        
+        Returns:
+            Fitted PreprocessingPipeline
+        """
+        if os.path.isdir(path):
+            path = os.path.join(path, PIPELINE_FILENAME)
+        
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
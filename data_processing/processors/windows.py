@@ -0,0 +1,62 @@
+# Window Features Module
+# This module builds lag matrices and rolling windows as strided views over arrays
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import List, Optional
+
+
+def rolling_windows(values: np.ndarray, window: int) -> np.ndarray:
+    """Get every trailing window over the rows of an array, without copying.
+    
+    Args:
+        values: Array with time along the first axis
+        window: Number of rows per window
+    
+    Returns:
+        Read-only view shaped (len(values) - window + 1, window, ...) whose entry
+        i holds rows i to i + window - 1; for a C-contiguous input each window
+        is itself contiguous, so flattening one does not copy
+    """
+    view = sliding_window_view(values, window, axis=0)
+    return np.moveaxis(view, -1, 1) if values.ndim > 1 else view
+
+
+def lag_matrix(values: np.ndarray, lags: int) -> np.ndarray:
+    """Get the previous lags values of each row as a strided view.
+    
+    Only the input is copied once (with lags leading NaNs), however many lags
+    are requested.
+    
+    Args:
+        values: Array with time along the first axis
+        lags: Number of lags
+    
+    Returns:
+        Read-only view shaped (len(values), lags, ...) where entry [t, i - 1]
+        holds values[t - i], or NaN before the start of the data
+    """
+    values = np.asarray(values, dtype=np.float64)
+    padded = np.concatenate([np.full((lags,) + values.shape[1:], np.nan), values])
+    # Window t covers values[t - lags] .. values[t]; reversed, it lists lag 1 first
+    windows = sliding_window_view(padded, lags + 1, axis=0)[..., lags - 1::-1]
+    return np.moveaxis(windows, -1, 1) if values.ndim > 1 else windows
+
+
+def lag_frame(data: pd.DataFrame, lags: int, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Build lag features for columns of a DataFrame in a single allocation.
+    
+    Args:
+        data: Input DataFrame
+        lags: Number of lags
+        columns: Columns to lag (if None, all columns)
+    
+    Returns:
+        DataFrame indexed like data with columns '{column}_lag{i}', ordered by
+        lag and then by column (as when shifting each column in turn)
+    """
+    columns = list(data.columns) if columns is None else columns
+    lagged = lag_matrix(data[columns].to_numpy(dtype=np.float64), lags)
+    names = [f"{column}_lag{lag}" for lag in range(1, lags + 1) for column in columns]
+    return pd.DataFrame(lagged.reshape(len(data), lags * len(columns)), index=data.index, columns=names)
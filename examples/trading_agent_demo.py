@@ -43,19 +43,21 @@ def run_demo():
     # Get data connector
     data_connector = get_data_connector(source='yahoo')
     
-    # Fetch and process data for each symbol
+    # Fetch historical data for all symbols concurrently
+    raw_data_by_symbol, errors = data_connector.get_historical_data_many(
+        symbols=symbols,
+        start_date=start_date,
+        end_date=end_date,
+        interval='1d'
+    )
+    for symbol, error in errors.items():
+        print(f"Failed to fetch data for {symbol}: {error}")
+    
+    # Process data for each symbol
     processed_data = {}
-    for symbol in symbols:
+    for symbol, raw_data in raw_data_by_symbol.items():
         print(f"Processing {symbol}...")
         
-        # Fetch historical data
-        raw_data = data_connector.get_historical_data(
-            symbol=symbol,
-            start_date=start_date,
-            end_date=end_date,
-            interval='1d'
-        )
-        
         # Process features
         feature_engineer = FeatureEngineer(include_indicators=True)
         data = feature_engineer.process(raw_data)
@@ -29,6 +29,7 @@ from trading_agent.training.trainer import TradingAgentTrainer, run_training_pip
 from trading_agent.utils.metrics import PerformanceMetrics, RiskManagement, PortfolioAnalytics
 from data_processing.connectors.market_data import get_data_connector
 from data_processing.processors.feature_engineering import FeatureEngineer, DataNormalizer
+from data_processing.processors.pipeline import PreprocessingPipeline, pipeline_path
 from dashboard.components.performance_dashboard import PerformanceDashboard, TradeAnalyzer
 from dashboard.components.trade_monitor import TradeMonitor, AlertSystem
 from ai_integration.gemini_integration import GeminiIntegration
@@ -49,6 +50,10 @@ def parse_arguments():
     train_parser.add_argument("--end-date", default=None, help="End date (YYYY-MM-DD)")
     train_parser.add_argument("--algorithm", default="ppo", choices=["ppo", "a2c", "dqn"], help="RL algorithm")
     train_parser.add_argument("--timesteps", type=int, default=100000, help="Training timesteps")
+    train_parser.add_argument("--data-source", default="yahoo", choices=["yahoo", "alpha_vantage", "local"], help="Market data source")
+    train_parser.add_argument("--data-dir", default="./data/market_cache", help="Data directory for the local data source")
+    train_parser.add_argument("--features", nargs="+", default=None, help="Features to compute (default: all)")
+    train_parser.add_argument("--portfolio", action="store_true", help="Train one agent allocating across all symbols")
     
     # Backtest command
     backtest_parser = subparsers.add_parser("backtest", help="Backtest a trained model")
@@ -56,6 +61,9 @@ def parse_arguments():
     backtest_parser.add_argument("--symbol", default="AAPL", help="Symbol to backtest")
     backtest_parser.add_argument("--start-date", default=None, help="Start date (YYYY-MM-DD)")
     backtest_parser.add_argument("--end-date", default=None, help="End date (YYYY-MM-DD)")
+    backtest_parser.add_argument("--data-source", default="yahoo", choices=["yahoo", "alpha_vantage", "local"], help="Market data source")
+    backtest_parser.add_argument("--data-dir", default="./data/market_cache", help="Data directory for the local data source")
+    backtest_parser.add_argument("--features", nargs="+", default=None, help="Features the model was trained on (default: all)")
     
     # Dashboard command
     dashboard_parser = subparsers.add_parser("dashboard", help="Run the dashboard")
@@ -99,6 +107,13 @@ def parse_arguments():
     return parser.parse_args()
 
 
+def get_data_source_options(args):
+    """Get the data connector arguments for the selected data source."""
+    if args.data_source == "local":
+        return {"data_dir": args.data_dir}
+    return {}
+
+
 def run_training(args):
     """Run the training pipeline."""
     print("\n===== AI Trading Assistant - Training =====\n")
@@ -122,8 +137,12 @@ def run_training(args):
         symbols=args.symbols,
         start_date=args.start_date,
         end_date=args.end_date,
+        data_source=args.data_source,
         algorithm=args.algorithm,
-        total_timesteps=args.timesteps
+        total_timesteps=args.timesteps,
+        data_source_options=get_data_source_options(args),
+        features=args.features,
+        portfolio=args.portfolio
     )
     
     print("\n===== Training Complete =====\n")
@@ -149,7 +168,7 @@ def run_backtest(args):
     print("\nPreparing data...")
     
     # Get data
-    data_connector = get_data_connector(source="yahoo")
+    data_connector = get_data_connector(source=args.data_source, **get_data_source_options(args))
     raw_data = data_connector.get_historical_data(
         symbol=args.symbol,
         start_date=args.start_date,
@@ -157,13 +176,22 @@ def run_backtest(args):
         interval="1d"
     )
     
-    # Process features
-    feature_engineer = FeatureEngineer(include_indicators=True)
-    processed_data = feature_engineer.process(raw_data)
-    
-    # Normalize data
-    normalizer = DataNormalizer(method="minmax")
-    normalized_data = normalizer.fit_transform(processed_data)
+    # Reuse the preprocessing the model was trained with when it was saved alongside it
+    artifact_path = pipeline_path(args.model_path)
+    if os.path.exists(artifact_path):
+        print(f"Loading preprocessing pipeline from {artifact_path}")
+        pipeline = PreprocessingPipeline.load(artifact_path)
+        normalized_data = pipeline.transform(raw_data)
+    else:
+        print("No preprocessing pipeline found next to the model, fitting one on the backtest data")
+        
+        # Process features
+        feature_engineer = FeatureEngineer(include_indicators=True, features=args.features)
+        processed_data = feature_engineer.process(raw_data)
+        
+        # Normalize data
+        normalizer = DataNormalizer(method="minmax")
+        normalized_data = normalizer.fit_transform(processed_data)
     
     print(f"Processed {len(normalized_data)} data points with {normalized_data.shape[1]} features")
     
@@ -195,7 +223,9 @@ def run_backtest(args):
         symbols=[args.symbol],
         start_date=args.start_date,
         end_date=args.end_date,
-        data_source="yahoo"
+        data_source=args.data_source,
+        data_source_options=get_data_source_options(args),
+        features=args.features
     )
     trainer.agent = agent
     trainer.test_env = env
@@ -0,0 +1,72 @@
+# Indicator Backend Tests
+# This module checks that the NumPy indicator backend matches TA-Lib
+
+import numpy as np
+import pytest
+
+pytest.importorskip('talib')
+
+from data_processing.processors.backend_benchmark import datasets
+from data_processing.processors.indicators import ALL_FEATURES, compute_features, get_backend
+
+# Functions of the backend interface with the arguments the indicator graph uses
+PARITY_CASES = {
+    'SMA': (['close'], {'timeperiod': 20}),
+    'SMA_200': (['close'], {'timeperiod': 200}),
+    'EMA': (['close'], {'timeperiod': 20}),
+    'STDDEV': (['close'], {'timeperiod': 20, 'nbdev': 1}),
+    'MACD': (['close'], {'fastperiod': 12, 'slowperiod': 26, 'signalperiod': 9}),
+    'RSI': (['close'], {'timeperiod': 14}),
+    'BBANDS': (['close'], {'timeperiod': 20, 'nbdevup': 2, 'nbdevdn': 2, 'matype': 0}),
+    'STOCH': (['high', 'low', 'close'], {'fastk_period': 5, 'slowk_period': 3, 'slowk_matype': 0,
+                                         'slowd_period': 3, 'slowd_matype': 0}),
+    'ATR': (['high', 'low', 'close'], {'timeperiod': 14}),
+    'OBV': (['close', 'volume'], {}),
+    'CCI': (['high', 'low', 'close'], {'timeperiod': 14}),
+}
+
+# The backends differ only in summation order
+RTOL = 1e-8
+ATOL = 1e-8
+
+DATASETS = datasets()
+
+
+def _outputs(result):
+    """Normalize a backend result to a list of arrays."""
+    if not isinstance(result, tuple):
+        result = (result,)
+    return [np.asarray(output, dtype=np.float64) for output in result]
+
+
+def _assert_match(expected, actual):
+    """Assert two outputs agree, including where they are NaN."""
+    assert expected.shape == actual.shape
+    np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected))
+    np.testing.assert_allclose(actual, expected, rtol=RTOL, atol=ATOL, equal_nan=True)
+
+
+@pytest.mark.parametrize('dataset', DATASETS)
+@pytest.mark.parametrize('case', PARITY_CASES)
+def test_backend_function_matches_talib(dataset, case):
+    data = DATASETS[dataset]
+    inputs, params = PARITY_CASES[case]
+    function = case.split('_')[0]
+    args = [data[col] for col in inputs]
+    
+    expected = _outputs(getattr(get_backend('talib'), function)(*args, **params))
+    actual = _outputs(getattr(get_backend('numpy'), function)(*args, **params))
+    
+    assert len(actual) == len(expected)
+    for e, a in zip(expected, actual):
+        _assert_match(e, a)
+
+
+@pytest.mark.parametrize('dataset', DATASETS)
+def test_features_match_talib(dataset):
+    data = DATASETS[dataset]
+    expected = compute_features(data, ALL_FEATURES, backend='talib')
+    actual = compute_features(data, ALL_FEATURES, backend='numpy')
+    
+    for feature in ALL_FEATURES:
+        _assert_match(expected[feature].to_numpy(dtype=np.float64), actual[feature].to_numpy(dtype=np.float64))
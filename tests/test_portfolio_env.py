@@ -0,0 +1,40 @@
+# Portfolio Environment Tests
+# This module checks how the portfolio environment aligns its assets
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('gym')
+
+from trading_agent.environments.portfolio_env import PortfolioTradingEnvironment
+
+
+def _bars(dates, start_price):
+    """Numeric bars indexed by date, with a price that rises by 1 each bar."""
+    close = start_price + np.arange(len(dates), dtype=float)
+    return pd.DataFrame({'close': close, 'volume': np.ones(len(dates))},
+                        index=pd.DatetimeIndex(dates, name='Date'))
+
+
+def test_assets_are_aligned_by_date():
+    crypto = _bars(pd.date_range('2023-01-01', '2023-03-31', freq='D'), 100.0)
+    stock = _bars(pd.bdate_range('2023-01-01', '2023-03-31'), 50.0)
+    
+    env = PortfolioTradingEnvironment({'BTC-USD': crypto, 'AAPL': stock}, window_size=5)
+    
+    assert isinstance(env.index, pd.DatetimeIndex)
+    assert env.index.equals(stock.index)
+    np.testing.assert_array_equal(env._close[:, 0], crypto.loc[stock.index, 'close'])
+    np.testing.assert_array_equal(env._close[:, 1], stock['close'])
+
+
+def test_non_numeric_columns_are_not_features():
+    dates = pd.bdate_range('2023-01-01', periods=40)
+    data = _bars(dates, 100.0)
+    data['exchange'] = 'NASDAQ'
+    
+    env = PortfolioTradingEnvironment({'AAPL': data}, window_size=5)
+    
+    assert env.columns == ['close', 'volume']
+    assert np.isfinite(env.reset()).all()
@@ -0,0 +1,45 @@
+# Trading Environment Tests
+# This module checks the observations built by the trading environments
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('gym')
+
+from data_processing.processors.feature_engineering import DataNormalizer
+from trading_agent.environments.trading_env import TradingEnvironment
+
+
+def _yahoo_frame(n=120):
+    """OHLCV bars shaped like the Yahoo connector's output, with a Date column."""
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    return pd.DataFrame({
+        'Date': pd.date_range('2020-01-02', periods=n, freq='D'),
+        'open': close * (1 + rng.normal(0, 0.002, n)),
+        'high': close * 1.01,
+        'low': close * 0.99,
+        'close': close,
+        'volume': rng.integers(1_000_000, 5_000_000, n).astype(float),
+    })
+
+
+def test_date_column_is_not_observed():
+    data = _yahoo_frame()
+    normalizer = DataNormalizer(method='minmax')
+    normalizer.fit(data)
+    normalized = normalizer.transform(data)
+    assert 'Date' in normalized.columns
+    
+    env = TradingEnvironment(normalized, window_size=10)
+    assert 'Date' not in env.feature_columns
+    
+    obs = env.reset()
+    window_width = env.window_size * len(env.feature_columns)
+    done = False
+    while not done:
+        assert np.isfinite(obs).all()
+        assert np.abs(obs[:window_width]).max() <= 10
+        obs, _, done, _ = env.step(0)
+    assert np.isfinite(obs).all()
@@ -0,0 +1,297 @@
+# Batched Trading Environment Module
+# This module simulates many trading episodes in lockstep as a stable-baselines3 VecEnv
+
+import numpy as np
+import pandas as pd
+# stable-baselines3 2.x vectorized environments are built on gymnasium spaces
+from gymnasium import spaces
+from numpy.lib.stride_tricks import sliding_window_view
+from stable_baselines3.common.vec_env.base_vec_env import VecEnv
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+
+def _per_env(value: Union[float, Sequence[float]], num_envs: int, name: str) -> np.ndarray:
+    """Broadcast a scalar or per-environment setting to an array."""
+    array = np.asarray(value, dtype=np.float64)
+    if array.ndim == 0:
+        return np.full(num_envs, float(array))
+    if array.shape != (num_envs,):
+        raise ValueError(f"{name} must be a scalar or have one value per environment ({num_envs})")
+    return array.copy()
+
+
+class BatchedTradingEnvironment(VecEnv):
+    """Many TradingEnvironment episodes simulated together with array operations.
+    
+    Every environment follows the TradingEnvironment rules (all-in buys and
+    sells, proportional fees, liquidation at the end of the data) and
+    produces the same observations and rewards, but all of them advance in a
+    single vectorized step instead of a Python loop over environments.
+    Environments can differ in their data (e.g. one symbol each), start
+    offset, initial balance and fee. Finished episodes are reset
+    automatically, as stable-baselines3 expects from a VecEnv.
+    """
+    
+    def __init__(self,
+                 data: Union[pd.DataFrame, Sequence[pd.DataFrame]],
+                 num_envs: Optional[int] = None,
+                 initial_balance: Union[float, Sequence[float]] = 10000.0,
+                 transaction_fee_percent: Union[float, Sequence[float]] = 0.001,
+                 reward_scaling: float = 0.01,
+                 window_size: int = 20,
+                 start_offsets: Optional[Sequence[int]] = None):
+        """Initialize the batched environment.
+        
+        Args:
+            data: DataFrame shared by every environment, or one DataFrame per
+                environment (all with the same columns, including 'close'); as in
+                TradingEnvironment, only numeric columns are observed
+            num_envs: Number of environments (if None, one per DataFrame, or 1)
+            initial_balance: Starting balance, for all or for each environment
+            transaction_fee_percent: Fee rate, for all or for each environment
+            reward_scaling: Scaling factor for rewards
+            window_size: Number of past observations to include in state
+            start_offsets: Bars skipped at the start of each environment's
+                episodes (if None, every episode starts at the first bar)
+        """
+        frames = [data] if isinstance(data, pd.DataFrame) else list(data)
+        if num_envs is None:
+            num_envs = len(frames)
+        if len(frames) == 1:
+            frames = frames * num_envs
+        if len(frames) != num_envs:
+            raise ValueError(f"Expected 1 or {num_envs} DataFrames, got {len(frames)}")
+        self.feature_columns = list(frames[0].select_dtypes(include=['number', 'bool']).columns)
+        if any(list(frame.select_dtypes(include=['number', 'bool']).columns) != self.feature_columns
+               for frame in frames):
+            raise ValueError("All DataFrames must have the same columns")
+        
+        self.window_size = window_size
+        self.reward_scaling = reward_scaling
+        self.initial_balance = _per_env(initial_balance, num_envs, 'initial_balance')
+        self.transaction_fee_percent = _per_env(transaction_fee_percent, num_envs, 'transaction_fee_percent')
+        self.start_offsets = np.zeros(num_envs, dtype=np.int64) if start_offsets is None \
+            else np.asarray(start_offsets, dtype=np.int64).reshape(num_envs)
+        
+        # Each distinct frame is stored once, padded to the longest frame; every
+        # environment points at its frame's row
+        unique = {}
+        self._data_ids = np.array([unique.setdefault(id(frame), len(unique)) for frame in frames])
+        distinct = list({id(frame): frame for frame in frames}.values())
+        self._lengths = np.array([len(frame) for frame in distinct])
+        if np.any(self.start_offsets < 0) or np.any(self.window_size + self.start_offsets >= self._lengths[self._data_ids] - 1):
+            raise ValueError("Each environment needs more than window_size + start_offset + 1 bars")
+        
+        width = len(self.feature_columns)
+        self._values = np.full((len(distinct), self._lengths.max(), width), np.nan, dtype=np.float32)
+        self._close = np.full((len(distinct), self._lengths.max()), np.nan)
+        for i, frame in enumerate(distinct):
+            self._values[i, :len(frame)] = frame[self.feature_columns].to_numpy(dtype=np.float32)
+            self._close[i, :len(frame)] = frame['close'].to_numpy(dtype=np.float64)
+        
+        # Windows [row, start] are views, gathered for all environments at once
+        self._windows = np.moveaxis(sliding_window_view(self._values, window_size, axis=1), -1, 2)
+        self._window_width = window_size * width
+        
+        # Actions: 0 = Hold, 1 = Buy, 2 = Sell; observations as in TradingEnvironment
+        self.num_envs = num_envs
+        self.render_mode = None
+        observation_space = spaces.Box(low=-np.inf, high=np.inf, shape=(self._window_width + 3,), dtype=np.float32)
+        super().__init__(num_envs, observation_space, spaces.Discrete(3))
+        
+        self._actions = np.zeros(num_envs, dtype=np.int64)
+        self._reset_state(np.ones(num_envs, dtype=bool))
+    
+    def _reset_state(self, mask: np.ndarray) -> None:
+        """Reset the account state of the environments selected by mask."""
+        if not hasattr(self, 'current_step'):
+            self.current_step = np.zeros(self.num_envs, dtype=np.int64)
+            self.balance = np.zeros(self.num_envs)
+            self.holdings = np.zeros(self.num_envs)
+            self.total_reward = np.zeros(self.num_envs)
+            self._total_cost = np.zeros(self.num_envs)
+            self._total_revenue = np.zeros(self.num_envs)
+        
+        self.current_step[mask] = self.window_size + self.start_offsets[mask]
+        self.balance[mask] = self.initial_balance[mask]
+        self.holdings[mask] = 0.0
+        self.total_reward[mask] = 0.0
+        self._total_cost[mask] = 0.0
+        self._total_revenue[mask] = 0.0
+    
+    def _reset_env(self, index: int) -> np.ndarray:
+        """Reset one environment and return its observation."""
+        mask = np.zeros(self.num_envs, dtype=bool)
+        mask[index] = True
+        self._reset_state(mask)
+        return self._observe()[index]
+    
+    def _render_env(self, index: int, mode: str = 'human') -> None:
+        """Print the state of one environment, like TradingEnvironment.render."""
+        if mode != 'human':
+            raise NotImplementedError(f"Render mode {mode} not supported")
+        
+        step = self.current_step[index]
+        current_price = self._close[self._data_ids[index], step]
+        portfolio_value = self.balance[index] + (self.holdings[index] * current_price)
+        
+        print(f"Env: {index}")
+        print(f"Step: {step}")
+        print(f"Price: ${current_price:.2f}")
+        print(f"Balance: ${self.balance[index]:.2f}")
+        print(f"Holdings: {self.holdings[index]:.6f}")
+        print(f"Portfolio Value: ${portfolio_value:.2f}")
+        print(f"Total Reward: {self.total_reward[index]:.4f}")
+        print("---")
+    
+    def _observe(self) -> np.ndarray:
+        """Build the observations of every environment from its current state."""
+        rows = self._data_ids
+        obs = np.empty((self.num_envs, self._window_width + 3), dtype=np.float32)
+        obs[:, :self._window_width] = self._windows[rows, self.current_step - self.window_size].reshape(self.num_envs, -1)
+        
+        current_price = self._close[rows, self.current_step]
+        obs[:, -3] = self.balance
+        obs[:, -2] = self.holdings
+        obs[:, -1] = self.holdings * current_price - self._total_cost + self._total_revenue
+        return obs
+    
+    def reset(self) -> np.ndarray:
+        """Reset every environment.
+        
+        Returns:
+            Observations, one row per environment
+        """
+        self._reset_state(np.ones(self.num_envs, dtype=bool))
+        return self._observe()
+    
+    def step_async(self, actions: np.ndarray) -> None:
+        """Store the actions for the next step_wait() call."""
+        self._actions = np.asarray(actions).reshape(self.num_envs)
+    
+    def step_wait(self):
+        """Advance every environment by one step.
+        
+        Returns:
+            Tuple of (observations, rewards, dones, infos); environments whose
+            episode ended are reset, with their last observation stored in
+            info['terminal_observation']
+        """
+        rows = self._data_ids
+        actions = self._actions
+        fee_rate = self.transaction_fee_percent
+        current_price = self._close[rows, self.current_step]
+        
+        # Buy with the whole balance
+        buy = (actions == 1) & (self.balance > 0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            shares = np.where(buy, self.balance / (current_price * (1 + fee_rate)), 0.0)
+        cost = shares * current_price
+        self.balance = np.where(buy, self.balance - (cost + cost * fee_rate), self.balance)
+        self.holdings = np.where(buy, self.holdings + shares, self.holdings)
+        self._total_cost = np.where(buy, self._total_cost + cost, self._total_cost)
+        
+        # Sell all holdings
+        sell = (actions == 2) & (self.holdings > 0)
+        revenue = np.where(sell, self.holdings * current_price, 0.0)
+        self.balance = np.where(sell, self.balance + (revenue - revenue * fee_rate), self.balance)
+        self.holdings = np.where(sell, 0.0, self.holdings)
+        self._total_revenue = np.where(sell, self._total_revenue + revenue, self._total_revenue)
+        
+        # Reward is the change in portfolio value
+        portfolio_value = self.balance + (self.holdings * current_price)
+        prev_portfolio_value = self.balance + (self.holdings * self._close[rows, self.current_step - 1])
+        rewards = ((portfolio_value / prev_portfolio_value) - 1) * self.reward_scaling
+        
+        self.current_step += 1
+        self.total_reward += rewards
+        
+        # Episodes end on the last bar, selling any holdings at its price
+        dones = self.current_step >= self._lengths[rows] - 1
+        liquidate = dones & (self.holdings > 0)
+        if liquidate.any():
+            final_revenue = self.holdings * self._close[rows, self.current_step]
+            self.balance = np.where(liquidate, self.balance + (final_revenue - final_revenue * fee_rate), self.balance)
+            self.holdings = np.where(liquidate, 0.0, self.holdings)
+        
+        infos: List[Dict[str, Any]] = [
+            {
+                'portfolio_value': portfolio_value[i],
+                'balance': self.balance[i],
+                'holdings': self.holdings[i],
+                'current_price': current_price[i],
+            }
+            for i in range(self.num_envs)
+        ]
+        for i in np.flatnonzero(buy):
+            infos[i]['trade'] = 'buy'
+        for i in np.flatnonzero(sell):
+            infos[i]['trade'] = 'sell'
+        
+        obs = self._observe()
+        if dones.any():
+            for i in np.flatnonzero(dones):
+                infos[i]['terminal_observation'] = obs[i].copy()
+            self._reset_state(dones)
+            obs[dones] = self._observe()[dones]
+        
+        return obs, rewards.astype(np.float32), dones, infos
+    
+    def close(self) -> None:
+        """Clean up resources."""
+        pass
+    
+    def seed(self, seed: Optional[int] = None) -> List[None]:
+        """Seed the environments (the simulation is deterministic)."""
+        return [None for _ in range(self.num_envs)]
+    
+    def _indices(self, indices) -> List[int]:
+        """Convert VecEnv indices (None, an int or a sequence) to a list."""
+        if indices is None:
+            return list(range(self.num_envs))
+        if isinstance(indices, int):
+            return [indices]
+        return list(indices)
+    
+    def get_attr(self, attr_name: str, indices=None) -> List[Any]:
+        """Get an attribute for each environment (per-environment arrays are split)."""
+        value = getattr(self, attr_name)
+        if isinstance(value, np.ndarray) and value.shape[:1] == (self.num_envs,):
+            return [value[i] for i in self._indices(indices)]
+        return [value for _ in self._indices(indices)]
+    
+    def set_attr(self, attr_name: str, value: Any, indices=None) -> None:
+        """Set an attribute for the selected environments."""
+        current = getattr(self, attr_name, None)
+        if isinstance(current, np.ndarray) and current.shape[:1] == (self.num_envs,):
+            current[self._indices(indices)] = value
+        else:
+            setattr(self, attr_name, value)
+    
+    def env_method(self, method_name: str, *method_args, indices=None, **method_kwargs) -> List[Any]:
+        """Call a TradingEnvironment method on each selected environment.
+        
+        'reset' resets only the selected environments and returns their
+        observations, 'render' prints their state, and 'seed' and 'close' do
+        nothing (the simulation is deterministic and holds no resources).
+        
+        Args:
+            method_name: Name of the method
+            indices: Environments to call it on (if None, all of them)
+            
+        Returns:
+            List of the method's results, one per selected environment
+        """
+        methods = {
+            'reset': self._reset_env,
+            'render': self._render_env,
+            'seed': lambda index, seed=None: None,
+            'close': lambda index: None,
+        }
+        if method_name not in methods:
+            raise NotImplementedError(f"{type(self).__name__} does not support env_method('{method_name}')")
+        return [methods[method_name](i, *method_args, **method_kwargs) for i in self._indices(indices)]
+    
+    def env_is_wrapped(self, wrapper_class, indices=None) -> List[bool]:
+        """The environments are never wrapped individually."""
+        return [False for _ in self._indices(indices)]
@@ -0,0 +1,215 @@
+# Portfolio Environment Module
+# This module implements a Gym-compatible environment allocating across many assets
+
+import gym
+import numpy as np
+import pandas as pd
+from gym import spaces
+from typing import Dict, List, Optional
+
+from data_processing.processors.windows import rolling_windows
+
+class PortfolioTradingEnvironment(gym.Env):
+    """A portfolio allocation environment for reinforcement learning agents.
+    
+    Market data for all assets is held in one (time x assets x features)
+    tensor. At each step the agent chooses target portfolio weights for cash
+    and every asset; the portfolio is rebalanced to them, paying the fee on
+    the traded value, and then marked to the next prices. Accounting and
+    observations are array operations over the asset axis, so more assets
+    make the arrays wider rather than adding Python work.
+    """
+    
+    metadata = {'render.modes': ['human']}
+    
+    def __init__(self,
+                 data: Dict[str, pd.DataFrame],
+                 initial_balance: float = 10000.0,
+                 transaction_fee_percent: float = 0.001,
+                 reward_scaling: float = 0.01,
+                 window_size: int = 20,
+                 columns: Optional[List[str]] = None):
+        """Initialize the portfolio environment.
+        
+        Args:
+            data: Dictionary mapping each symbol to a DataFrame of OHLCV data and
+                features, indexed by timestamp; only timestamps present for every
+                symbol are used
+            initial_balance: Starting cash
+            transaction_fee_percent: Fee applied to the traded value as a percentage
+            reward_scaling: Scaling factor for rewards
+            window_size: Number of past observations to include in state
+            columns: Columns used as features (if None, the numeric columns of the
+                first symbol, which must include 'close')
+        """
+        super(PortfolioTradingEnvironment, self).__init__()
+        
+        if not data:
+            raise ValueError("At least one symbol is required")
+        
+        self.symbols = list(data)
+        self.initial_balance = initial_balance
+        self.transaction_fee_percent = transaction_fee_percent
+        self.reward_scaling = reward_scaling
+        self.window_size = window_size
+        self.columns = list(columns) if columns is not None \
+            else list(data[self.symbols[0]].select_dtypes(include=['number', 'bool']).columns)
+        
+        # Align every symbol on the timestamps they share
+        index = data[self.symbols[0]].index
+        for symbol in self.symbols[1:]:
+            index = index.intersection(data[symbol].index)
+        self.index = index
+        
+        missing = {symbol: [col for col in self.columns + ['close'] if col not in df.columns]
+                   for symbol, df in data.items()}
+        missing = {symbol: cols for symbol, cols in missing.items() if cols}
+        if missing:
+            raise ValueError(f"Columns missing for symbols: {missing}")
+        if len(index) <= window_size + 1:
+            raise ValueError(f"Need more than {window_size + 1} common timestamps, got {len(index)}")
+        
+        # (time x assets x features) tensor; observation windows are views over it
+        self._values = np.stack([data[symbol].loc[index, self.columns].to_numpy(dtype=np.float32)
+                                 for symbol in self.symbols], axis=1)
+        self._windows = rolling_windows(self._values, window_size)
+        self._close = np.stack([data[symbol].loc[index, 'close'].to_numpy(dtype=np.float64)
+                                for symbol in self.symbols], axis=1)
+        
+        n_assets = len(self.symbols)
+        
+        # Actions: target weights for cash followed by each asset (normalized to sum to 1)
+        self.action_space = spaces.Box(low=0.0, high=1.0, shape=(n_assets + 1,), dtype=np.float32)
+        
+        # Observation space: window of features for every asset + current weights
+        self._window_width = window_size * n_assets * len(self.columns)
+        obs_shape = self._window_width + n_assets + 1
+        self.observation_space = spaces.Box(
+            low=-np.inf, high=np.inf, shape=(obs_shape,), dtype=np.float32
+        )
+        
+        # Observations are written into this buffer rather than allocated per step
+        self._obs = np.empty(obs_shape, dtype=np.float32)
+        
+        # Initialize state variables
+        self.reset()
+    
+    def reset(self):
+        """Reset the environment to initial state."""
+        self.current_step = self.window_size
+        self.balance = float(self.initial_balance)
+        self.holdings = np.zeros(len(self.symbols))
+        self.total_reward = 0
+        self.total_fees = 0.0
+        self.done = False
+        
+        return self._get_observation()
+    
+    def _target_weights(self, action) -> np.ndarray:
+        """Turn an action into weights for cash and each asset summing to 1."""
+        weights = np.clip(np.asarray(action, dtype=np.float64).reshape(-1), 0.0, None)
+        total = weights.sum()
+        if not np.isfinite(total) or total <= 0:
+            # No usable allocation: hold everything in cash
+            weights = np.zeros(len(self.symbols) + 1)
+            weights[0] = 1.0
+            return weights
+        return weights / total
+    
+    def step(self, action):
+        """Take a step in the environment based on the action.
+        
+        Args:
+            action: Target weights for cash and each asset
+        
+        Returns:
+            observation, reward, done, info
+        """
+        if self.done:
+            return self._get_observation().copy(), 0, True, {}
+        
+        weights = self._target_weights(action)
+        prices = self._close[self.current_step]
+        
+        # Rebalance at the current prices, paying the fee on the traded value
+        positions = self.holdings * prices
+        portfolio_value = self.balance + positions.sum()
+        turnover = np.abs(weights[1:] * portfolio_value - positions).sum()
+        fee = turnover * self.transaction_fee_percent
+        net_value = portfolio_value - fee
+        
+        self.holdings = weights[1:] * net_value / prices
+        self.balance = weights[0] * net_value
+        self.total_fees += fee
+        
+        # Move to the next prices; reward is the change in portfolio value
+        self.current_step += 1
+        current_prices = self._close[self.current_step]
+        new_value = self.balance + self.holdings @ current_prices
+        reward = ((new_value / portfolio_value) - 1) * self.reward_scaling
+        self.total_reward += reward
+        
+        # Check if episode is done
+        if self.current_step >= len(self.index) - 1:
+            self.done = True
+            
+            # Sell all holdings at the end
+            revenue = self.holdings @ current_prices
+            final_fee = revenue * self.transaction_fee_percent
+            self.balance += revenue - final_fee
+            self.holdings = np.zeros(len(self.symbols))
+            self.total_fees += final_fee
+        
+        info = {
+            'portfolio_value': new_value,
+            'balance': self.balance,
+            'holdings': self.holdings.copy(),
+            'current_price': current_prices.copy(),
+            'weights': weights,
+            'turnover': turnover,
+            'fee': fee,
+        }
+        
+        # The final observation is copied, since wrappers keep it as the
+        # terminal observation while the buffer is reused by reset()
+        obs = self._get_observation()
+        return (obs.copy() if self.done else obs), reward, self.done, info
+    
+    def _get_observation(self):
+        """Construct the observation from current state.
+        
+        The returned array is a buffer reused by every call, so callers that
+        keep observations across steps must copy them (step() returns a copy
+        once the episode is done).
+        """
+        # Copy the window of features for all assets (a contiguous view) into the buffer
+        self._obs[:self._window_width] = self._windows[self.current_step - self.window_size].ravel()
+        
+        # Current weights of cash and each asset
+        positions = self.holdings * self._close[self.current_step]
+        portfolio_value = self.balance + positions.sum()
+        self._obs[self._window_width] = self.balance / portfolio_value
+        self._obs[self._window_width + 1:] = positions / portfolio_value
+        
+        return self._obs
+    
+    def render(self, mode='human'):
+        """Render the environment."""
+        if mode != 'human':
+            raise NotImplementedError(f"Render mode {mode} not supported")
+        
+        positions = self.holdings * self._close[self.current_step]
+        portfolio_value = self.balance + positions.sum()
+        
+        print(f"Step: {self.current_step}")
+        print(f"Balance: ${self.balance:.2f}")
+        for symbol, value in zip(self.symbols, positions):
+            print(f"{symbol}: ${value:.2f}")
+        print(f"Portfolio Value: ${portfolio_value:.2f}")
+        print(f"Total Fees: ${self.total_fees:.2f}")
+        print(f"Total Reward: {self.total_reward:.4f}")
+        print("---")
+    
+    def close(self):
+        """Clean up resources."""
+        pass
@@ -7,6 +7,8 @@ import pandas as pd
 from gym import spaces
 from typing import Dict, List, Tuple, Optional
 
+from data_processing.processors.windows import rolling_windows
+
 class TradingEnvironment(gym.Env):
     """A trading environment for reinforcement learning agents.
     
@@ -39,6 +41,16 @@ class TradingEnvironment(gym.Env):
         self.reward_scaling = reward_scaling
         self.window_size = window_size
         
+        # Data is converted to arrays once; observation windows are views over
+        # them, so a step costs O(window) whatever the frame or trade history size.
+        # Values are stored in the observation dtype so windows copy straight in.
+        # Only numeric columns are observed: a date column would otherwise enter
+        # the observations as raw epoch nanoseconds
+        self.feature_columns = list(data.select_dtypes(include=['number', 'bool']).columns)
+        self._values = data[self.feature_columns].to_numpy(dtype=np.float32)
+        self._windows = rolling_windows(self._values, window_size)
+        self._close = data['close'].to_numpy(dtype=np.float64)
+        
         # Define action and observation spaces
         # Actions: 0 = Hold, 1 = Buy, 2 = Sell
         self.action_space = spaces.Discrete(3)
@@ -46,7 +58,7 @@ class TradingEnvironment(gym.Env):
         # Observation space: price data + account info
         # Each price data point includes OHLCV + technical indicators
         # Account info includes current balance, holdings, and unrealized PnL
-        features_per_timestep = data.shape[1]  # OHLCV + any technical indicators
+        features_per_timestep = len(self.feature_columns)  # OHLCV + any technical indicators
         account_features = 3  # balance, holdings, unrealized PnL
         
         obs_shape = (window_size * features_per_timestep) + account_features
@@ -54,6 +66,10 @@ class TradingEnvironment(gym.Env):
             low=-np.inf, high=np.inf, shape=(obs_shape,), dtype=np.float32
         )
         
+        # Observations are written into this buffer rather than allocated per step
+        self._obs = np.empty(obs_shape, dtype=np.float32)
+        self._window_width = window_size * features_per_timestep
+        
         # Initialize state variables
         self.reset()
     
@@ -64,6 +80,10 @@ class TradingEnvironment(gym.Env):
         self.holdings = 0
         self.trades = []
         self.total_reward = 0
+        
+        # Running totals of buy costs and sell revenues in self.trades
+        self._total_cost = 0.0
+        self._total_revenue = 0.0
         self.done = False
         
         return self._get_observation()
@@ -78,10 +98,10 @@ class TradingEnvironment(gym.Env):
             observation, reward, done, info
         """
         if self.done:
-            return self._get_observation(), 0, True, {}
+            return self._get_observation().copy(), 0, True, {}
         
         # Get current price
-        current_price = self.data.iloc[self.current_step]['close']
+        current_price = self._close[self.current_step]
         
         # Execute action
         reward = 0
@@ -98,6 +118,7 @@ class TradingEnvironment(gym.Env):
                 fee = cost * self.transaction_fee_percent
                 self.balance -= (cost + fee)
                 self.holdings += shares_to_buy
+                self._total_cost += cost
                 
                 # Record trade
                 self.trades.append({
@@ -121,6 +142,7 @@ class TradingEnvironment(gym.Env):
                 fee = revenue * self.transaction_fee_percent
                 self.balance += (revenue - fee)
                 self.holdings = 0
+                self._total_revenue += revenue
                 
                 # Record trade
                 self.trades.append({
@@ -136,7 +158,7 @@ class TradingEnvironment(gym.Env):
         
         # Calculate portfolio value and reward
         portfolio_value = self.balance + (self.holdings * current_price)
-        prev_portfolio_value = self.balance + (self.holdings * self.data.iloc[self.current_step-1]['close'])
+        prev_portfolio_value = self.balance + (self.holdings * self._close[self.current_step-1])
         
         # Reward is change in portfolio value
         reward = ((portfolio_value / prev_portfolio_value) - 1) * self.reward_scaling
@@ -151,7 +173,7 @@ class TradingEnvironment(gym.Env):
             
             # Sell all holdings at the end
             if self.holdings > 0:
-                final_price = self.data.iloc[self.current_step]['close']
+                final_price = self._close[self.current_step]
                 revenue = self.holdings * final_price
                 fee = revenue * self.transaction_fee_percent
                 self.balance += (revenue - fee)
@@ -163,33 +185,38 @@ class TradingEnvironment(gym.Env):
         info['holdings'] = self.holdings
         info['current_price'] = current_price
         
-        return self._get_observation(), reward, self.done, info
+        # The final observation is copied, since wrappers keep it as the
+        # terminal observation while the buffer is reused by reset()
+        obs = self._get_observation()
+        return (obs.copy() if self.done else obs), reward, self.done, info
     
     def _get_observation(self):
-        """Construct the observation from current state."""
-        # Get window of price data
-        obs_window = self.data.iloc[self.current_step - self.window_size:self.current_step]
-        price_obs = obs_window.values.flatten()
+        """Construct the observation from current state.
         
-        # Get account state
-        current_price = self.data.iloc[self.current_step]['close']
-        holdings_value = self.holdings * current_price
-        unrealized_pnl = holdings_value - sum([t['cost'] for t in self.trades if t['type'] == 'buy']) \
-                         + sum([t['revenue'] for t in self.trades if t['type'] == 'sell'])
+        The returned array is a buffer reused by every call, so callers that
+        keep observations across steps must copy them (step() returns a copy
+        once the episode is done).
+        """
+        # Copy the window of price data (a contiguous view) into the buffer
+        self._obs[:self._window_width] = self._windows[self.current_step - self.window_size].ravel()
         
-        account_obs = np.array([self.balance, self.holdings, unrealized_pnl])
+        # Write account state
+        current_price = self._close[self.current_step]
+        holdings_value = self.holdings * current_price
+        unrealized_pnl = holdings_value - self._total_cost + self._total_revenue
         
-        # Combine observations
-        obs = np.concatenate([price_obs, account_obs])
+        self._obs[-3] = self.balance
+        self._obs[-2] = self.holdings
+        self._obs[-1] = unrealized_pnl
         
-        return obs.astype(np.float32)
+        return self._obs
     
     def render(self, mode='human'):
         """Render the environment."""
         if mode != 'human':
             raise NotImplementedError(f"Render mode {mode} not supported")
         
-        current_price = self.data.iloc[self.current_step]['close']
+        current_price = self._close[self.current_step]
         portfolio_value = self.balance + (self.holdings * current_price)
         
         print(f"Step: {self.current_step}")
@@ -27,7 +27,8 @@ class TradingAgent:
         """Initialize the trading agent.
         
         Args:
-            env: The trading environment
+            env: The trading environment (a TradingEnvironment, or a VecEnv such
+                as BatchedTradingEnvironment to train on many episodes at once)
             algorithm: RL algorithm to use ('ppo', 'a2c', or 'dqn')
             policy: Policy network architecture
             model_params: Parameters for the RL algorithm
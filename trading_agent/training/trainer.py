@@ -12,9 +12,48 @@ from datetime import datetime
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
 from trading_agent.environments.trading_env import TradingEnvironment
+from trading_agent.environments.batched_env import BatchedTradingEnvironment
+from trading_agent.environments.portfolio_env import PortfolioTradingEnvironment
 from trading_agent.models.agent import TradingAgent, TrainingCallback
+from trading_agent.utils.backtest import backtest_actions
 from data_processing.connectors.market_data import get_data_connector
 from data_processing.processors.feature_engineering import FeatureEngineer, DataNormalizer
+from data_processing.processors.parallel import process_many
+from data_processing.processors.pipeline import PreprocessingPipeline
+
+
+# Intervals whose bars are stamped with a calendar date
+DAILY_INTERVALS = ('1d', '5d', '1wk', '1mo', '3mo', 'daily', 'weekly', 'monthly')
+
+
+def _index_by_date(data: pd.DataFrame, daily: bool) -> pd.DataFrame:
+    """Move a connector's date column into the index.
+    
+    Bars are then aligned across symbols by timestamp, and the date is not
+    treated as a feature.
+    
+    Args:
+        data: DataFrame with a 'date' or 'datetime' column
+        daily: Whether bars are daily or coarser; their timestamps are reduced
+            to the local calendar date, so exchanges in different time zones
+            line up (intraday timestamps are converted to UTC instead)
+    
+    Returns:
+        DataFrame indexed by a naive DatetimeIndex named after the date column
+    """
+    date_column = next((col for col in data.columns if str(col).lower() in ('date', 'datetime')), None)
+    if date_column is None:
+        return data
+    
+    index = pd.DatetimeIndex(pd.to_datetime(data[date_column]))
+    if index.tz is not None:
+        index = index.tz_localize(None) if daily else index.tz_convert('UTC').tz_localize(None)
+    if daily:
+        index = index.normalize()
+    
+    data = data.drop(columns=[date_column])
+    data.index = index.rename(date_column)
+    return data
 
 class TradingAgentTrainer:
     """Training pipeline for the trading agent.
@@ -28,13 +67,17 @@ class TradingAgentTrainer:
                  start_date: str,
                  end_date: str,
                  data_source: str = 'yahoo',
+                 data_source_options: Optional[Dict[str, Any]] = None,
                  interval: str = '1d',
                  test_ratio: float = 0.2,
                  include_indicators: bool = True,
+                 features: Optional[List[str]] = None,
+                 feature_workers: Optional[int] = None,
                  normalize_data: bool = True,
                  initial_balance: float = 10000.0,
                  transaction_fee_percent: float = 0.001,
                  window_size: int = 20,
+                 n_envs: int = 1,
                  algorithm: str = 'ppo',
                  model_params: Dict[str, Any] = None):
         """Initialize the trainer.
@@ -43,14 +86,21 @@ class TradingAgentTrainer:
             symbols: List of ticker symbols to train on
             start_date: Start date for historical data (YYYY-MM-DD)
             end_date: End date for historical data (YYYY-MM-DD)
-            data_source: Source for market data ('yahoo' or 'alpha_vantage')
+            data_source: Source for market data ('yahoo', 'alpha_vantage' or 'local')
+            data_source_options: Additional arguments for the data connector
+                (e.g. {'data_dir': './data/market_cache'} for the 'local' source)
             interval: Data interval ('1d', '1h', etc.)
             test_ratio: Ratio of data to use for testing
             include_indicators: Whether to include technical indicators
+            features: Features to compute (if None, all features selected by include_indicators)
+            feature_workers: Processes computing features when training on several
+                symbols (if None, one per CPU)
             normalize_data: Whether to normalize the data
             initial_balance: Initial account balance for the environment
             transaction_fee_percent: Transaction fee percentage
             window_size: Number of past observations to include in state
+            n_envs: Training episodes simulated in lockstep (with more than one,
+                episodes start at staggered points of the training data)
             algorithm: RL algorithm to use ('ppo', 'a2c', or 'dqn')
             model_params: Parameters for the RL algorithm
         """
@@ -61,19 +111,22 @@ class TradingAgentTrainer:
         self.interval = interval
         self.test_ratio = test_ratio
         self.include_indicators = include_indicators
+        self.features = features
+        self.feature_workers = feature_workers
         self.normalize_data = normalize_data
         self.initial_balance = initial_balance
         self.transaction_fee_percent = transaction_fee_percent
         self.window_size = window_size
+        self.n_envs = n_envs
         self.algorithm = algorithm
         self.model_params = model_params or {}
         
         # Initialize components
-        self.data_connector = get_data_connector(source=data_source)
-        self.feature_engineer = FeatureEngineer(include_indicators=include_indicators)
-        self.normalizer = DataNormalizer(method='minmax') if normalize_data else None
+        self.data_connector = get_data_connector(source=data_source, **(data_source_options or {}))
+        self.feature_engineer = FeatureEngineer(include_indicators=include_indicators, features=features)
         
         # Placeholders for data and environments
+        self.pipelines: Dict[str, PreprocessingPipeline] = {}
         self.data = {}
         self.train_data = {}
         self.test_data = {}
@@ -82,30 +135,49 @@ class TradingAgentTrainer:
         self.agent = None
     
     def prepare_data(self) -> None:
-        """Prepare data for training and testing."""
-        for symbol in self.symbols:
-            print(f"Fetching data for {symbol}...")
-            # Get historical data
-            raw_data = self.data_connector.get_historical_data(
-                symbol=symbol,
-                start_date=self.start_date,
-                end_date=self.end_date,
-                interval=self.interval
-            )
-            
-            # Process features
-            processed_data = self.feature_engineer.process(raw_data)
-            
-            # Normalize if requested
-            if self.normalize_data and self.normalizer:
-                processed_data = self.normalizer.fit_transform(processed_data)
+        """Prepare data for training and testing.
+        
+        Each symbol gets its own preprocessing pipeline, with the normalizer
+        fitted on the training rows only and reused for the test rows.
+        Symbols whose data cannot be fetched are reported and skipped.
+        """
+        print(f"Fetching data for {', '.join(self.symbols)}...")
+        raw_data_by_symbol, errors = self.data_connector.get_historical_data_many(
+            symbols=self.symbols,
+            start_date=self.start_date,
+            end_date=self.end_date,
+            interval=self.interval
+        )
+        
+        for symbol, error in errors.items():
+            print(f"Failed to fetch data for {symbol}: {error}")
+        
+        # Process features for every symbol in parallel
+        processed_by_symbol, errors = process_many(self.feature_engineer, raw_data_by_symbol,
+                                                   max_workers=self.feature_workers)
+        
+        for symbol, error in errors.items():
+            print(f"Failed to compute features for {symbol}: {error}")
+        
+        for symbol, processed_data in processed_by_symbol.items():
+            processed_data = _index_by_date(processed_data, daily=self.interval in DAILY_INTERVALS)
             
             # Split into train and test sets
             split_idx = int(len(processed_data) * (1 - self.test_ratio))
+            
+            # Fit the preprocessing on the training rows (normalizing if requested)
+            pipeline = PreprocessingPipeline(
+                self.feature_engineer,
+                DataNormalizer(method='minmax') if self.normalize_data else None,
+                metadata={'symbol': symbol, 'interval': self.interval, 'data_source': self.data_source}
+            )
+            pipeline.fit(processed_data.iloc[:split_idx])
+            processed_data = pipeline.transform_features(processed_data)
             train_data = processed_data.iloc[:split_idx].copy()
             test_data = processed_data.iloc[split_idx:].copy()
             
             # Store data
+            self.pipelines[symbol] = pipeline
             self.data[symbol] = processed_data
             self.train_data[symbol] = train_data
             self.test_data[symbol] = test_data
@@ -122,22 +194,66 @@ class TradingAgentTrainer:
             raise ValueError(f"Data for {symbol} not prepared. Call prepare_data() first.")
         
         # Create training environment
-        self.train_env = TradingEnvironment(
-            data=self.train_data[symbol],
+        if self.n_envs > 1:
+            # Stagger episode starts over the first half of the training data
+            max_offset = (len(self.train_data[symbol]) - self.window_size - 2) // 2
+            self.train_env = BatchedTradingEnvironment(
+                data=self.train_data[symbol],
+                num_envs=self.n_envs,
+                initial_balance=self.initial_balance,
+                transaction_fee_percent=self.transaction_fee_percent,
+                window_size=self.window_size,
+                start_offsets=np.linspace(0, max(max_offset, 0), self.n_envs).astype(int)
+            )
+        else:
+            self.train_env = TradingEnvironment(
+                data=self.train_data[symbol],
+                initial_balance=self.initial_balance,
+                transaction_fee_percent=self.transaction_fee_percent,
+                window_size=self.window_size
+            )
+        
+        # Create testing environment
+        self.test_env = TradingEnvironment(
+            data=self.test_data[symbol],
+            initial_balance=self.initial_balance,
+            transaction_fee_percent=self.transaction_fee_percent,
+            window_size=self.window_size
+        )
+        
+        print(f"Environments set up for {symbol}")
+    
+    def setup_portfolio_environments(self) -> None:
+        """Set up training and testing environments allocating across all prepared symbols.
+        
+        A single agent trained on these environments replaces one agent per
+        symbol. Its actions are continuous weights, so use 'ppo' or 'a2c'.
+        """
+        if not self.train_data:
+            raise ValueError("No data prepared. Call prepare_data() first.")
+        
+        # Symbols are aligned on their timestamps, not on row numbers
+        for symbol, data in {**self.train_data, **self.test_data}.items():
+            if not isinstance(data.index, pd.DatetimeIndex):
+                raise ValueError(f"Data for {symbol} is not indexed by date")
+        
+        # Create training environment
+        self.train_env = PortfolioTradingEnvironment(
+            data=self.train_data,
             initial_balance=self.initial_balance,
             transaction_fee_percent=self.transaction_fee_percent,
             window_size=self.window_size
         )
         
         # Create testing environment
-        self.test_env = TradingEnvironment(
-            data=self.test_data[symbol],
+        self.test_env = PortfolioTradingEnvironment(
+            data=self.test_data,
             initial_balance=self.initial_balance,
             transaction_fee_percent=self.transaction_fee_percent,
             window_size=self.window_size
         )
         
-        print(f"Environments set up for {symbol}")
+        print(f"Portfolio environments set up for {', '.join(self.train_env.symbols)}")
     
     def train_agent(self, 
                     symbol: str, 
@@ -148,6 +264,9 @@ class TradingAgentTrainer:
                     save_dir: str = './models/') -> None:
         """Train the agent on a symbol.
         
+        The symbol's preprocessing pipeline is saved next to its checkpoints
+        (see PreprocessingPipeline.load).
+        
         Args:
             symbol: Ticker symbol to train on
             total_timesteps: Total number of timesteps to train for
@@ -170,14 +289,28 @@ class TradingAgentTrainer:
         
         # Train the agent
         print(f"Training agent on {symbol} for {total_timesteps} timesteps...")
+        symbol_dir = os.path.join(save_dir, symbol)
         self.agent.train(
             total_timesteps=total_timesteps,
             eval_freq=eval_freq,
             save_freq=save_freq,
             log_dir=log_dir,
-            save_dir=os.path.join(save_dir, symbol)
+            save_dir=symbol_dir
         )
         
+        # Save the preprocessing the model was trained with (for a portfolio
+        # agent, each symbol's pipeline goes in a subdirectory named after it)
+        if isinstance(self.train_env, PortfolioTradingEnvironment):
+            pipeline_dirs = {name: os.path.join(symbol_dir, name) for name in self.train_env.symbols}
+        else:
+            pipeline_dirs = {symbol: symbol_dir}
+        for name, pipeline_dir in pipeline_dirs.items():
+            if name in self.pipelines:
+                os.makedirs(pipeline_dir, exist_ok=True)
+                self.pipelines[name].metadata['algorithm'] = self.algorithm
+                artifact_path = self.pipelines[name].save(pipeline_dir)
+                print(f"Preprocessing pipeline saved to {artifact_path}")
+        
         # Evaluate on test data
         self.evaluate_agent()
     
@@ -250,7 +383,43 @@ class TradingAgentTrainer:
         
         # Convert to DataFrame
         results_df = pd.DataFrame(results)
+        self._summarize_backtest(results_df)
+        
+        return results_df
+    
+    def backtest_actions(self, actions: np.ndarray) -> pd.DataFrame:
+        """Backtest precomputed actions on the test data without stepping the environment.
         
+        The actions (e.g. batch predictions of a model whose inputs do not
+        depend on the account state) are evaluated in one vectorized pass with
+        the test environment's fee and all-in trading rules.
+        
+        Args:
+            actions: One action (0 = Hold, 1 = Buy, 2 = Sell) per step of the
+                test environment, i.e. len(test data) - window_size - 1 of them
+            
+        Returns:
+            DataFrame with backtest results, as returned by backtest()
+        """
+        if self.test_env is None:
+            raise ValueError("Test environment not initialized")
+        if isinstance(self.test_env, PortfolioTradingEnvironment):
+            raise ValueError("Precomputed actions can only be backtested on a single-symbol environment")
+        
+        results_df, _ = backtest_actions(
+            self.test_env.data['close'],
+            actions,
+            initial_balance=self.test_env.initial_balance,
+            transaction_fee_percent=self.test_env.transaction_fee_percent,
+            reward_scaling=self.test_env.reward_scaling,
+            start=self.test_env.window_size
+        )
+        self._summarize_backtest(results_df)
+        
+        return results_df
+    
+    def _summarize_backtest(self, results_df: pd.DataFrame) -> None:
+        """Add return and drawdown columns to backtest results and print a summary."""
         # Calculate performance metrics
         initial_value = self.initial_balance
         final_value = results_df['portfolio_value'].iloc[-1]
@@ -279,8 +448,6 @@ class TradingAgentTrainer:
         print(f"Annualized Return: {annualized_return:.2%}")
         print(f"Sharpe Ratio: {sharpe_ratio:.2f}")
         print(f"Maximum Drawdown: {max_drawdown:.2%}")
-        
-        return results_df
     
     def plot_backtest_results(self, results_df: pd.DataFrame, save_path: Optional[str] = None) -> None:
         """Plot backtest results.
@@ -299,20 +466,28 @@ class TradingAgentTrainer:
         ax1.legend()
         ax1.grid(True)
         
-        # Plot price with buy/sell markers
-        ax2.plot(results_df['step'], results_df['price'], label='Price', color='gray')
+        # Plot price with buy/sell markers (portfolio backtests record one price
+        # per asset, plotted relative to the first step)
+        prices = np.stack(results_df['price'].to_numpy())
+        if prices.ndim > 1:
+            ax2.plot(results_df['step'], prices / prices[0], label=getattr(self.test_env, 'symbols', None))
+            ax2.set_ylabel('Relative Price')
+        else:
+            ax2.plot(results_df['step'], results_df['price'], label='Price', color='gray')
+            ax2.set_ylabel('Price ($)')
+        
+        trades = results_df.get('trade', pd.Series(index=results_df.index, dtype=object))
         
         # Add buy markers
-        buy_points = results_df[results_df['trade'] == 'buy']
+        buy_points = results_df[trades == 'buy']
         if not buy_points.empty:
             ax2.scatter(buy_points['step'], buy_points['price'], color='green', marker='^', s=100, label='Buy')
         
         # Add sell markers
-        sell_points = results_df[results_df['trade'] == 'sell']
+        sell_points = results_df[trades == 'sell']
         if not sell_points.empty:
             ax2.scatter(sell_points['step'], sell_points['price'], color='red', marker='v', s=100, label='Sell')
         
-        ax2.set_ylabel('Price ($)')
         ax2.legend()
         ax2.grid(True)
         
@@ -339,16 +514,23 @@ def run_training_pipeline(symbols: List[str],
                          end_date: str,
                          data_source: str = 'yahoo',
                          algorithm: str = 'ppo',
-                         total_timesteps: int = 100000) -> TradingAgentTrainer:
+                         total_timesteps: int = 100000,
+                         data_source_options: Optional[Dict[str, Any]] = None,
+                         features: Optional[List[str]] = None,
+                         portfolio: bool = False) -> TradingAgentTrainer:
     """Run the complete training pipeline.
     
     Args:
         symbols: List of ticker symbols to train on
         start_date: Start date for historical data (YYYY-MM-DD)
         end_date: End date for historical data (YYYY-MM-DD)
-        data_source: Source for market data ('yahoo' or 'alpha_vantage')
+        data_source: Source for market data ('yahoo', 'alpha_vantage' or 'local')
         algorithm: RL algorithm to use ('ppo', 'a2c', or 'dqn')
         total_timesteps: Total number of timesteps to train for
+        data_source_options: Additional arguments for the data connector
+        features: Features to compute (if None, all features)
+        portfolio: Train one agent allocating across all symbols instead of
+            one agent per symbol (requires 'ppo' or 'a2c')
         
     Returns:
         Trained TradingAgentTrainer instance
@@ -368,14 +550,32 @@ def run_training_pipeline(symbols: List[str],
         start_date=start_date,
         end_date=end_date,
         data_source=data_source,
+        data_source_options=data_source_options,
+        features=features,
         algorithm=algorithm
     )
     
     # Prepare data
     trainer.prepare_data()
     
-    # Train on each symbol
-    for symbol in symbols:
+    # Train a single agent across every symbol that was prepared successfully
+    if portfolio:
+        print(f"\nTraining portfolio agent on {', '.join(trainer.train_data)}...")
+        trainer.setup_portfolio_environments()
+        trainer.train_agent(
+            symbol='portfolio',
+            total_timesteps=total_timesteps,
+            log_dir=log_dir,
+            save_dir=model_dir
+        )
+        
+        results_df = trainer.backtest()
+        plot_path = os.path.join(model_dir, "portfolio_backtest_results.png")
+        trainer.plot_backtest_results(results_df, save_path=plot_path)
+        return trainer
+    
+    # Train on each symbol that was prepared successfully
+    for symbol in trainer.train_data:
         print(f"\nTraining on {symbol}...")
         trainer.setup_environments(symbol)
         trainer.train_agent(
@@ -0,0 +1,166 @@
+# Vectorized Backtest Module
+# This module backtests precomputed trading actions in a single array pass
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Tuple, Union
+
+# Codes of the 'trade' array returned by simulate_actions()
+NO_TRADE, BUY, SELL = -1, 0, 1
+
+
+def simulate_actions(prices: Union[np.ndarray, pd.Series],
+                     actions: Union[np.ndarray, pd.Series],
+                     initial_balance: float = 10000.0,
+                     transaction_fee_percent: float = 0.001,
+                     reward_scaling: float = 0.01,
+                     start: int = 1) -> Dict[str, np.ndarray]:
+    """Simulate an array of actions with the rules of TradingEnvironment.step.
+    
+    Actions are 0 = Hold, 1 = Buy with the whole balance, 2 = Sell all
+    holdings, with the fee charged on each trade's value; holdings left at
+    the last price are sold, as when the environment runs out of data. Since
+    trades are all-in, the position after each step is simply the last buy
+    or sell carried forward, so the whole episode is computed with array
+    operations instead of one step at a time. Values match stepping the
+    environment up to floating-point rounding. The environment can keep a
+    rounding residue of cash after a buy, which a later buy action while
+    long spends as an extra, negligible 'buy' trade; here the residue is
+    zero and such actions do nothing.
+    
+    Args:
+        prices: Close prices of the whole series
+        actions: One action per step, step i trading at prices[start + i];
+            there must be len(prices) - start - 1 of them
+        initial_balance: Starting account balance
+        transaction_fee_percent: Fee applied to transactions as a percentage
+        reward_scaling: Scaling factor for rewards
+        start: Index of the first price traded (the environment's window_size)
+    
+    Returns:
+        Dictionary of per-step arrays: step, price, action, reward, balance,
+        holdings and portfolio_value as reported by the environment's step(),
+        trade (NO_TRADE, BUY or SELL), shares traded, fee (including the final
+        sale) and drawdown
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    actions = np.asarray(actions).reshape(-1)
+    n = len(actions)
+    if start < 1 or n != len(prices) - start - 1:
+        raise ValueError(f"Expected {len(prices) - start - 1} actions for {len(prices)} prices "
+                         f"starting at {start}, got {n}")
+    
+    fee_rate = transaction_fee_percent
+    price = prices[start:start + n]
+    prev_price = prices[start - 1:start - 1 + n]
+    
+    # Position after each step: the last buy or sell carried forward (buying
+    # while long or selling while flat changes nothing)
+    signal = np.where(actions == 1, 1, np.where(actions == 2, 0, -1))
+    last = np.where(signal >= 0, np.arange(n), -1)
+    np.maximum.accumulate(last, out=last)
+    long = (last >= 0) & (signal[last] == 1)
+    prev_long = np.zeros_like(long)
+    prev_long[1:] = long[:-1]
+    buys = long & ~prev_long
+    sells = prev_long & ~long
+    buy_idx = np.flatnonzero(buys)
+    sell_idx = np.flatnonzero(sells)
+    
+    # Cash compounds by every completed round trip; each buy spends it all
+    growth = (price[sell_idx] * (1 - fee_rate)) / (price[buy_idx[:len(sell_idx)]] * (1 + fee_rate))
+    cash = initial_balance * np.concatenate([[1.0], np.cumprod(growth)])
+    shares = cash[:len(buy_idx)] / (price[buy_idx] * (1 + fee_rate))
+    
+    # Shares of the latest buy at every step; index -1 (no buy yet) picks the trailing zero
+    position_shares = np.append(shares, 0.0)[np.cumsum(buys) - 1]
+    holdings = np.where(long, position_shares, 0.0)
+    balance = np.where(long, 0.0, cash[np.cumsum(sells)])
+    
+    trade = np.full(n, NO_TRADE, dtype=np.int8)
+    trade[buy_idx] = BUY
+    trade[sell_idx] = SELL
+    traded_shares = np.where(trade != NO_TRADE, position_shares, 0.0)
+    fee = traded_shares * price * fee_rate
+    
+    # Reward is the change in portfolio value
+    portfolio_value = balance + holdings * price
+    prev_portfolio_value = balance + holdings * prev_price
+    reward = ((portfolio_value / prev_portfolio_value) - 1) * reward_scaling
+    
+    # Sell all holdings at the end
+    if n and long[-1]:
+        revenue = holdings[-1] * prices[start + n]
+        balance[-1] = revenue - revenue * fee_rate
+        holdings[-1] = 0.0
+        fee[-1] += revenue * fee_rate
+    
+    return {
+        'step': np.arange(start + 1, start + n + 1),
+        'price': price,
+        'action': actions,
+        'reward': reward,
+        'balance': balance,
+        'holdings': holdings,
+        'portfolio_value': portfolio_value,
+        'trade': trade,
+        'shares': traded_shares,
+        'fee': fee,
+        'drawdown': (portfolio_value / np.maximum.accumulate(portfolio_value)) - 1,
+    }
+
+
+def backtest_actions(prices: Union[np.ndarray, pd.Series],
+                     actions: Union[np.ndarray, pd.Series],
+                     initial_balance: float = 10000.0,
+                     transaction_fee_percent: float = 0.001,
+                     reward_scaling: float = 0.01,
+                     start: int = 1) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Backtest an array of actions, returning DataFrames.
+    
+    Args:
+        prices: Close prices of the whole series
+        actions: One action per step (see simulate_actions)
+        initial_balance: Starting account balance
+        transaction_fee_percent: Fee applied to transactions as a percentage
+        reward_scaling: Scaling factor for rewards
+        start: Index of the first price traded (the environment's window_size)
+    
+    Returns:
+        Tuple of (results, trades): results has one row per step with the
+        columns recorded by TradingAgentTrainer.backtest (step, price, action,
+        reward, balance, holdings, portfolio_value, trade) plus fee and
+        drawdown; trades has one row per executed buy or sell, like
+        TradingEnvironment.trades
+    """
+    sim = simulate_actions(prices, actions, initial_balance, transaction_fee_percent,
+                           reward_scaling, start)
+    
+    # Trade markers as a categorical, so no per-row strings are built
+    trade = pd.Categorical.from_codes(sim['trade'], categories=['buy', 'sell'])
+    results = pd.DataFrame({
+        'step': sim['step'],
+        'price': sim['price'],
+        'action': sim['action'],
+        'reward': sim['reward'],
+        'balance': sim['balance'],
+        'holdings': sim['holdings'],
+        'portfolio_value': sim['portfolio_value'],
+        'trade': trade,
+        'fee': sim['fee'],
+        'drawdown': sim['drawdown'],
+    })
+    
+    # Trades are recorded at the step they execute (before the step advances)
+    executed = sim['trade'] != NO_TRADE
+    value = sim['shares'][executed] * sim['price'][executed]
+    trades = pd.DataFrame({
+        'step': sim['step'][executed] - 1,
+        'type': trade[executed],
+        'price': sim['price'][executed],
+        'shares': sim['shares'][executed],
+        'value': value,
+        'fee': value * transaction_fee_percent,
+    })
+    
+    return results, trades